@@ -0,0 +1,102 @@
+# Compara una tabla común (HEAP) con una agrupada por clave primaria (ORGANIZATION=CLUSTERED):
+# las filas llegan desordenadas, la mayoría en una carga masiva y el resto insertadas de a una, y
+# luego se consultan rangos de clave primaria al azar contando los sectores leídos
+#
+# Uso: python benchmarks/clustering.py [--rows N] [--late 0.1] [--queries N] [--span 50]
+
+import argparse
+import csv
+import json
+import os
+import random
+import sys
+import tempfile
+from typing import Any, Dict, List
+
+# Agregar el directorio src al path para importar módulos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import DEFAULT_SCHEMA, geometry_for
+from benchmarks.data_generator import DataGenerator, load_schema
+from data_management.data_validator import DataValidator
+from engine.database import Database
+
+def _write_schema(schema_path: str, organization: str, workdir: str) -> str:
+    # Copia del esquema con la organización pedida
+    with open(schema_path, 'r', encoding='utf-8') as f:
+        sql = f.read().strip().rstrip(';')
+    path = os.path.join(workdir, f"schema_{organization.lower()}.txt")
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(f"{sql} ORGANIZATION={organization};\n")
+    return path
+
+def measure(schema_path: str, csv_path: str, late_rows: List[Dict[str, str]], rows: int, queries: int,
+            span: int, organization: str, seed: int, workdir: str) -> Dict[str, Any]:
+    schema = load_schema(schema_path)
+    geometry = geometry_for(rows, schema['record_size'], headroom=3.0)
+    db = Database(geometry, os.path.join(workdir, f"{organization.lower()}.bin"), record_cache_bytes=0)
+    db.load_schema(schema_path)
+    table = schema['table_name']
+    primary_key = schema['primary_key']
+    db.load_csv(table, csv_path)
+    for record in DataValidator().validate_data(late_rows, schema):
+        db.insert(table, record)
+
+    rng = random.Random(seed)
+    sectors = []
+    for _ in range(queries):
+        low = rng.randint(1, max(1, rows - span))
+        result = db.query(f"SELECT * FROM {table} WHERE {primary_key} BETWEEN {low} AND {low + span - 1}")
+        sectors.append(result.sectors_read)
+    result = {
+        'organization': organization,
+        'rows': rows,
+        'late_inserts': len(late_rows),
+        'range_rows': span,
+        'avg_sectors_per_range': sum(sectors) / len(sectors),
+        'avg_sectors_per_row': sum(sectors) / (len(sectors) * span)
+    }
+    clustering = db.status()['tables'][0].get('clustering')
+    if clustering:
+        result['pages'] = clustering['pages']
+        result['splits'] = clustering['splits']
+    return result
+
+def run(schema_path: str, rows: int, late: float, queries: int, span: int, seed: int) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    generated = list(DataGenerator(load_schema(schema_path), seed=seed).rows(rows))
+    rng.shuffle(generated)
+    late_count = int(rows * late)
+    bulk, late_rows = generated[late_count:], generated[:late_count]
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, 'rows.csv')
+        with open(csv_path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=list(generated[0]))
+            writer.writeheader()
+            writer.writerows(bulk)
+        return [measure(_write_schema(schema_path, organization, tmp), csv_path, late_rows, rows,
+                        queries, span, organization, seed, tmp)
+                for organization in ('HEAP', 'CLUSTERED')]
+
+def main():
+    parser = argparse.ArgumentParser(description="Sectores leídos por rangos de clave primaria: tabla común frente a agrupada")
+    parser.add_argument('--schema', default=DEFAULT_SCHEMA)
+    parser.add_argument('--rows', type=int, default=5000)
+    parser.add_argument('--late', type=float, default=0.1, help="Fracción de filas insertadas después de la carga")
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--span', type=int, default=50, help="Claves por rango")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--json', action='store_true', help="Imprime el resultado en JSON")
+    args = parser.parse_args()
+
+    results = run(args.schema, args.rows, args.late, args.queries, args.span, args.seed)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'Organización':<14}{'Sectores/rango':>16}{'Sectores/fila':>15}{'Páginas':>9}{'Divisiones':>12}")
+    for r in results:
+        print(f"{r['organization']:<14}{r['avg_sectors_per_range']:>16.1f}{r['avg_sectors_per_row']:>15.2f}"
+              f"{r.get('pages', '-'):>9}{r.get('splits', '-'):>12}")
+
+if __name__ == "__main__":
+    main()
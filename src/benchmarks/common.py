@@ -0,0 +1,55 @@
+# Utilidades compartidas por los scripts de medición
+
+import math
+import os
+from typing import Any, Dict, List
+
+from data_management.csv_loader import CSVLoader
+from data_management.data_validator import DataValidator
+from storage.disk import DiskGeometry
+from storage.sector_manager import FRAGMENT_HEADER_SIZE, EMPTY_HEADER
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'data')
+DEFAULT_SCHEMA = os.path.join(DATA_DIR, 'struct_table.txt')
+DEFAULT_CSV = os.path.join(DATA_DIR, 'a.csv')
+
+def load_rows(csv_path: str, schema: Dict[str, Any], rows: int) -> List[Dict[str, Any]]:
+    # Carga y valida el CSV y lo repite hasta tener `rows` registros.
+    # Las copias reciben claves primarias nuevas si la clave es entera
+    validated = DataValidator().validate_data(CSVLoader().load_csv(csv_path), schema)
+    if not validated:
+        raise ValueError("El CSV no tiene registros válidos")
+    primary_key = schema['primary_key']
+    pk_field = next(f for f in schema['fields'] if f['name'] == primary_key)
+    integer_pk = pk_field['type'] in ('INTEGER', 'INT', 'BIGINT', 'SMALLINT')
+    result = []
+    for i in range(rows):
+        record = dict(validated[i % len(validated)])
+        if integer_pk:
+            record[primary_key] = i + 1
+        result.append(record)
+    return result
+
+def geometry_for(rows: int, record_size: int, sector_size: int = 512,
+                 sectors_per_track: int = 64, platters: int = 1, headroom: float = 1.5) -> DiskGeometry:
+    # Geometría con espacio suficiente para `rows` registros (más margen)
+    bytes_needed = rows * (record_size + FRAGMENT_HEADER_SIZE) * headroom
+    sectors_needed = max(1, math.ceil(bytes_needed / sector_size))
+    tracks = max(1, math.ceil(sectors_needed / (platters * 2 * sectors_per_track)))
+    return DiskGeometry(platters=platters, tracks=tracks, sectors=sectors_per_track, sector_size=sector_size)
+
+def sectors_with_data(sector_manager) -> int:
+    # Cuenta los sectores de una tabla que contienen al menos un fragmento
+    used = 0
+    for start, count in sector_manager._scan_ranges(0, None):
+        data = sector_manager.disk.read_sectors(start, count)
+        size = sector_manager.disk.sector_size
+        used += sum(1 for i in range(count) if data[i * size:i * size + FRAGMENT_HEADER_SIZE] != EMPTY_HEADER)
+    return used
+
+def percentile(values: List[float], p: float) -> float:
+    # Percentil por rango más cercano (p entre 0 y 100)
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(0, min(len(ordered) - 1, math.ceil(p / 100 * len(ordered)) - 1))]
@@ -0,0 +1,91 @@
+# Mide la compresión por extents (COMPRESSION=ZLIB/LZMA) frente a la tabla sin comprimir:
+# razón de compresión, sectores físicos y latencia de lectura en frío y con caché
+#
+# Uso: python benchmarks/compression.py [--schema archivo.txt] [--csv datos.csv] [--rows N] [--lookups N]
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from typing import Any, Dict
+
+# Agregar el directorio src al path para importar módulos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import DEFAULT_CSV, DEFAULT_SCHEMA, geometry_for, load_rows, sectors_with_data
+from data_management.schema_parser import SchemaParser
+from storage.catalog import Catalog
+from storage.disk import Disk
+from storage.serialization import create_serializer
+from storage.table_scan import TableScan
+
+def _avg_read_ms(manager, addresses, cold: bool) -> float:
+    start = time.perf_counter()
+    for address in addresses:
+        if cold and hasattr(manager, 'clear_cache'):
+            manager.clear_cache()
+        manager.read_record(*address)
+    return 1000 * (time.perf_counter() - start) / len(addresses)
+
+def measure_table(catalog: Catalog, schema: Dict[str, Any], records: list, lookups: int) -> Dict[str, Any]:
+    entry = catalog.create_table(schema, extent_sectors=64)
+    manager = catalog.get_sector_manager(entry.name)
+    serializer = create_serializer(schema)
+    addresses = [manager.write_record(serializer.serialize_record(r, schema)) for r in records]
+    manager.flush()
+
+    sample = random.Random(42).choices(addresses, k=lookups)
+    result = {
+        'compression': schema['compression'],
+        'physical_sectors': entry.allocated_sectors if entry.compression else sectors_with_data(manager),
+        'cold_read_ms': _avg_read_ms(manager, sample, cold=True),
+        'hot_read_ms': _avg_read_ms(manager, sample, cold=False)
+    }
+    start = time.perf_counter()
+    scanned = sum(1 for _ in TableScan(manager, schema, serializer).scan())
+    result['scan_rows_per_sec'] = scanned / (time.perf_counter() - start)
+    if entry.compression:
+        result['compression_ratio'] = manager.get_compression_stats()['compression_ratio']
+    return result
+
+def run(schema_path: str, csv_path: str, rows: int, lookups: int, sector_size: int) -> Dict[str, Any]:
+    with open(schema_path, 'r', encoding='utf-8') as f:
+        sql = f.read().strip().rstrip(';')
+    base_schema = SchemaParser().parse_create_table(sql)
+    records = load_rows(csv_path, base_schema, rows)
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        geometry = geometry_for(rows * 3, base_schema['record_size'], sector_size)
+        catalog = Catalog(Disk(geometry, os.path.join(tmp, 'compression.bin')))
+        for compression in ('NONE', 'ZLIB', 'LZMA'):
+            schema = SchemaParser().parse_create_table(f"{sql} COMPRESSION={compression}")
+            schema['table_name'] = f"{schema['table_name']}_{compression.lower()}"
+            results[compression] = measure_table(catalog, schema, records, lookups)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara tablas sin comprimir y con extents comprimidos")
+    parser.add_argument('--schema', default=DEFAULT_SCHEMA)
+    parser.add_argument('--csv', default=DEFAULT_CSV)
+    parser.add_argument('--rows', type=int, default=5000)
+    parser.add_argument('--lookups', type=int, default=500)
+    parser.add_argument('--sector-size', type=int, default=512)
+    parser.add_argument('--json', action='store_true', help="Imprime el resultado en JSON")
+    args = parser.parse_args()
+
+    results = run(args.schema, args.csv, args.rows, args.lookups, args.sector_size)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'Modo':<8}{'Razón':>8}{'Sectores':>10}{'Lectura fría ms':>17}{'Con caché ms':>14}{'Recorrido/s':>13}")
+    for compression, r in results.items():
+        ratio = f"{r['compression_ratio']:.2f}x" if r.get('compression_ratio') else "1.00x"
+        print(f"{compression:<8}{ratio:>8}{r['physical_sectors']:>10,}{r['cold_read_ms']:>17.3f}"
+              f"{r['hot_read_ms']:>14.3f}{r['scan_rows_per_sec']:>13,.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+# Genera CSV sintéticos a partir de un esquema CREATE TABLE, de forma reproducible (semilla fija).
+# Los textos salen de un vocabulario con distribución sesgada para que las búsquedas por
+# campos secundarios encuentren varias filas, como en datos reales
+#
+# Uso: python benchmarks/data_generator.py salida.csv [--schema archivo.txt] [--rows N] [--seed S]
+
+import argparse
+import csv
+import datetime
+import os
+import random
+import sys
+from itertools import accumulate
+from typing import Any, Dict, Iterator, List, Optional
+
+# Agregar el directorio src al path para importar módulos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import DEFAULT_SCHEMA
+from data_management.schema_parser import SchemaParser
+
+WORDS = ('alpha', 'bravo', 'charlie', 'delta', 'echo', 'foxtrot', 'golf', 'hotel', 'india',
+         'juliet', 'kilo', 'lima', 'mike', 'november', 'oscar', 'papa', 'quebec', 'romeo',
+         'sierra', 'tango', 'uniform', 'victor', 'whiskey', 'xray', 'yankee', 'zulu')
+INTEGER_RANGES = {'TINYINT': (0, 127), 'SMALLINT': (0, 32767), 'INTEGER': (0, 1_000_000),
+                  'INT': (0, 1_000_000), 'BIGINT': (0, 10_000_000_000)}
+START_DATE = datetime.datetime(2020, 1, 1)
+
+class DataGenerator:
+    # Produce filas como texto (tal como vendrían de un CSV) para un esquema dado
+
+    def __init__(self, schema: Dict[str, Any], seed: int = 42, distinct_strings: Optional[int] = None,
+                 skew: float = 1.0, null_ratio: float = 0.0):
+        self.schema = schema
+        self.seed = seed
+        self.distinct_strings = distinct_strings
+        self.skew = skew
+        self.null_ratio = null_ratio
+
+    def rows(self, count: int) -> Iterator[Dict[str, str]]:
+        rng = random.Random(self.seed)
+        distinct = self.distinct_strings or max(10, count // 10)
+        vocabulary = {f['name']: self._vocabulary(rng, f['size'], distinct)
+                      for f in self.schema['fields'] if f['type'] in ('CHAR', 'VARCHAR', 'TEXT')}
+        # Pesos acumulados tipo Zipf: el valor de rango k aparece con frecuencia 1/(k+1)^skew
+        weights = list(accumulate(1 / (k + 1) ** self.skew for k in range(distinct)))
+        primary_key = self.schema['primary_key']
+        for i in range(count):
+            row = {}
+            for table_field in self.schema['fields']:
+                name = table_field['name']
+                if name == primary_key:
+                    row[name] = self._key_value(table_field, i)
+                elif table_field['nullable'] and rng.random() < self.null_ratio:
+                    row[name] = ''
+                elif name in vocabulary:
+                    row[name] = rng.choices(vocabulary[name], cum_weights=weights)[0]
+                else:
+                    row[name] = self._random_value(rng, table_field)
+            yield row
+
+    def write_csv(self, path: str, count: int) -> str:
+        # Escribe `count` filas con encabezado y retorna la ruta
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=[field['name'] for field in self.schema['fields']])
+            writer.writeheader()
+            writer.writerows(self.rows(count))
+        return path
+
+    def _vocabulary(self, rng: random.Random, size: int, distinct: int) -> List[str]:
+        values = []
+        for i in range(distinct):
+            text = f"{rng.choice(WORDS)} {rng.choice(WORDS)} {i}"
+            values.append(text[-size:] if len(text) > size else text)
+        return values
+
+    def _key_value(self, table_field: Dict[str, Any], i: int) -> str:
+        if table_field['type'] in ('CHAR', 'VARCHAR', 'TEXT'):
+            return f"k{i:0{max(1, table_field['size'] - 1)}d}"[-table_field['size']:]
+        return str(i + 1)
+
+    def _random_value(self, rng: random.Random, table_field: Dict[str, Any]) -> str:
+        field_type = table_field['type']
+        if field_type in INTEGER_RANGES:
+            return str(rng.randint(*INTEGER_RANGES[field_type]))
+        if field_type in ('DECIMAL', 'FLOAT', 'DOUBLE'):
+            return f"{rng.uniform(0, 1000):.2f}"
+        if field_type == 'DATE':
+            return (START_DATE + datetime.timedelta(days=rng.randrange(3650))).strftime('%Y-%m-%d')
+        if field_type == 'DATETIME':
+            moment = START_DATE + datetime.timedelta(seconds=rng.randrange(3650 * 86400))
+            return moment.strftime('%Y-%m-%d %H:%M:%S')
+        if field_type in ('BOOLEAN', 'BOOL'):
+            return rng.choice(('true', 'false'))
+        return rng.choice(WORDS)
+
+def load_schema(schema_path: str) -> Dict[str, Any]:
+    # Primera tabla del archivo de esquema
+    return SchemaParser().parse_schema_file_tables(schema_path)[0]
+
+def main():
+    parser = argparse.ArgumentParser(description="Genera un CSV sintético a partir de un esquema CREATE TABLE")
+    parser.add_argument('output')
+    parser.add_argument('--schema', default=DEFAULT_SCHEMA)
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--distinct', type=int, default=None, help="Valores distintos por campo de texto")
+    parser.add_argument('--skew', type=float, default=1.0, help="Sesgo Zipf de los textos (0 = uniforme)")
+    parser.add_argument('--null-ratio', type=float, default=0.0)
+    args = parser.parse_args()
+
+    generator = DataGenerator(load_schema(args.schema), args.seed, args.distinct, args.skew, args.null_ratio)
+    generator.write_csv(args.output, args.rows)
+    print(f"{args.rows:,} filas escritas en {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+# Compara el recorrido simulado del cabezal con los dos órdenes de sectores lógicos (por plato y
+# por cilindro) durante una carga secuencial, un recorrido completo y búsquedas al azar
+#
+# Uso: python benchmarks/lba_layout.py [--rows N] [--platters 4] [--lookups N]
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+from typing import Any, Dict, List
+
+# Agregar el directorio src al path para importar módulos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import DEFAULT_SCHEMA, geometry_for
+from benchmarks.data_generator import DataGenerator, load_schema
+from engine.database import Database
+from storage.disk import DiskGeometry, LBA_MAPPINGS
+
+def _head(db: Database) -> Dict[str, int]:
+    counters = db.io_stats()['counters']
+    return {'head_moves': counters['head_moves'], 'seek_distance': counters['seek_distance']}
+
+def measure(schema_path: str, csv_path: str, rows: int, lookups: int, platters: int,
+            lba_mapping: str, seed: int, workdir: str) -> Dict[str, Any]:
+    schema = load_schema(schema_path)
+    base = geometry_for(rows, schema['record_size'], sectors_per_track=16, platters=platters, headroom=2.0)
+    geometry = DiskGeometry(base.platters, base.tracks, base.sectors, base.sector_size, lba_mapping)
+    db = Database(geometry, os.path.join(workdir, f"lba_{lba_mapping}.bin"), record_cache_bytes=0)
+    db.load_schema(schema_path)
+    table = schema['table_name']
+    result = {'lba_mapping': lba_mapping, 'cylinders': geometry.tracks, 'platters': geometry.platters}
+
+    db.reset_io_stats()
+    db.load_csv(table, csv_path)
+    result['ingest'] = _head(db)
+
+    db.reset_io_stats()
+    sum(1 for _ in db.scan(table))
+    result['scan'] = _head(db)
+
+    rng = random.Random(seed)
+    db.reset_io_stats()
+    for _ in range(lookups):
+        db.search(table, schema['primary_key'], rng.randint(1, rows))
+    result['random_lookups'] = _head(db)
+    return result
+
+def run(schema_path: str, rows: int, lookups: int, platters: int, seed: int) -> List[Dict[str, Any]]:
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = DataGenerator(load_schema(schema_path), seed=seed).write_csv(os.path.join(tmp, 'rows.csv'), rows)
+        return [measure(schema_path, csv_path, rows, lookups, platters, mapping, seed, tmp)
+                for mapping in LBA_MAPPINGS]
+
+def main():
+    parser = argparse.ArgumentParser(description="Recorrido del cabezal con orden por plato y por cilindro")
+    parser.add_argument('--schema', default=DEFAULT_SCHEMA)
+    parser.add_argument('--rows', type=int, default=5000)
+    parser.add_argument('--platters', type=int, default=4)
+    parser.add_argument('--lookups', type=int, default=500)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--json', action='store_true', help="Imprime el resultado en JSON")
+    args = parser.parse_args()
+
+    results = run(args.schema, args.rows, args.lookups, args.platters, args.seed)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'Orden':<10}{'Fase':<16}{'Movimientos':>12}{'Distancia':>11}")
+    for r in results:
+        for phase in ('ingest', 'scan', 'random_lookups'):
+            print(f"{r['lba_mapping']:<10}{phase:<16}{r[phase]['head_moves']:>12,}{r[phase]['seek_distance']:>11,}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+# Mide cuánto recorrido de cabezal ahorra leer de la réplica más cercana en volúmenes espejados
+# (RAID-1) bajo búsquedas puntuales al azar, frente a un disco único que atendiera todo
+#
+# Uso: python benchmarks/mirroring.py [--rows N] [--lookups N] [--replicas 2 3]
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+from typing import Any, Dict, List
+
+# Agregar el directorio src al path para importar módulos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import DEFAULT_SCHEMA, geometry_for
+from benchmarks.data_generator import DataGenerator, load_schema
+from engine.database import Database
+
+def measure(schema_path: str, csv_path: str, rows: int, lookups: int, replicas: int,
+            seed: int, workdir: str) -> Dict[str, Any]:
+    schema = load_schema(schema_path)
+    geometry = geometry_for(rows, schema['record_size'], sectors_per_track=16, headroom=2.0)
+    db = Database(geometry, os.path.join(workdir, f"mirrored_{replicas}.bin"),
+                  record_cache_bytes=0, mirrors=replicas)
+    db.load_schema(schema_path)
+    table = schema['table_name']
+    db.load_csv(table, csv_path)
+
+    rng = random.Random(seed)
+    before = db.disk.mirror_report()
+    for _ in range(lookups):
+        db.search(table, schema['primary_key'], rng.randint(1, rows))
+    after = db.disk.mirror_report()
+    balanced = after['read_seek_distance'] - before['read_seek_distance']
+    single = after['single_disk_read_seek_distance'] - before['single_disk_read_seek_distance']
+    return {
+        'replicas': replicas,
+        'tracks': geometry.tracks,
+        'lookups': lookups,
+        'seek_per_lookup': balanced / lookups,
+        'single_disk_seek_per_lookup': single / lookups,
+        'seek_saved_ratio': (single - balanced) / single if single else None,
+        'reads_per_replica': [a - b for a, b in zip(after['reads_per_replica'], before['reads_per_replica'])]
+    }
+
+def run(schema_path: str, rows: int, lookups: int, replica_counts: List[int], seed: int) -> List[Dict[str, Any]]:
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = DataGenerator(load_schema(schema_path), seed=seed).write_csv(os.path.join(tmp, 'rows.csv'), rows)
+        return [measure(schema_path, csv_path, rows, lookups, replicas, seed, tmp) for replicas in replica_counts]
+
+def main():
+    parser = argparse.ArgumentParser(description="Ahorro de búsqueda de cabezal en volúmenes espejados")
+    parser.add_argument('--schema', default=DEFAULT_SCHEMA)
+    parser.add_argument('--rows', type=int, default=5000)
+    parser.add_argument('--lookups', type=int, default=1000)
+    parser.add_argument('--replicas', type=int, nargs='+', default=[2, 3])
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--json', action='store_true', help="Imprime el resultado en JSON")
+    args = parser.parse_args()
+
+    results = run(args.schema, args.rows, args.lookups, args.replicas, args.seed)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'Réplicas':>9}{'Pistas':>8}{'Búsqueda/lectura':>18}{'Disco único':>13}{'Ahorro':>9}  Lecturas por réplica")
+    for r in results:
+        saved = f"{r['seek_saved_ratio']:.1%}" if r['seek_saved_ratio'] is not None else "-"
+        print(f"{r['replicas']:>9}{r['tracks']:>8}{r['seek_per_lookup']:>18.2f}"
+              f"{r['single_disk_seek_per_lookup']:>13.2f}{saved:>9}  "
+              f"{', '.join(str(n) for n in r['reads_per_replica'])}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+# Mide la lectura anticipada: operaciones de E/S y tiempo de búsquedas por clave en orden, de un
+# recorrido completo y de rangos de clave primaria en una tabla agrupada, sin lectura anticipada y
+# con la ventana pedida. Con sectores chicos los registros se parten en cadenas de fragmentos
+#
+# Uso: python benchmarks/read_ahead.py [--rows N] [--window 8] [--sector-size 128]
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List
+
+# Agregar el directorio src al path para importar módulos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.clustering import _write_schema
+from benchmarks.common import DEFAULT_SCHEMA, geometry_for
+from benchmarks.data_generator import DataGenerator, load_schema
+from engine.database import Database
+
+PHASES = ('ordered_lookups', 'scan', 'clustered_ranges')
+
+def _phase(db: Database, work: Callable[[], None]) -> Dict[str, Any]:
+    db.reset_io_stats()
+    started = time.perf_counter()
+    work()
+    elapsed = time.perf_counter() - started
+    counters = db.io_stats()['counters']
+    return {'read_ops': counters['read_ops'], 'sectors_read': counters['sectors_read'],
+            'readahead_hits': counters['readahead_hits'], 'seconds': elapsed}
+
+def measure(schema_path: str, csv_path: str, rows: int, window: int, sector_size: int,
+            queries: int, span: int, seed: int, workdir: str) -> Dict[str, Any]:
+    schema = load_schema(schema_path)
+    table = schema['table_name']
+    primary_key = schema['primary_key']
+    geometry = geometry_for(rows, schema['record_size'], sector_size=sector_size, headroom=3.0)
+    result: Dict[str, Any] = {'window': window}
+
+    db = Database(geometry, os.path.join(workdir, f"heap_{window}.bin"), record_cache_bytes=0, read_ahead=window)
+    db.load_schema(schema_path)
+    db.load_csv(table, csv_path)
+    result['ordered_lookups'] = _phase(db, lambda: [db.search(table, primary_key, key) for key in range(1, rows + 1)])
+    result['scan'] = _phase(db, lambda: sum(1 for _ in db.scan(table)))
+
+    clustered_path = _write_schema(schema_path, 'CLUSTERED', workdir)
+    db = Database(geometry, os.path.join(workdir, f"clustered_{window}.bin"), record_cache_bytes=0, read_ahead=window)
+    db.load_schema(clustered_path)
+    db.load_csv(table, csv_path)
+    rng = random.Random(seed)
+    lows = [rng.randint(1, max(1, rows - span)) for _ in range(queries)]
+    result['clustered_ranges'] = _phase(db, lambda: [
+        db.query(f"SELECT * FROM {table} WHERE {primary_key} BETWEEN {low} AND {low + span - 1}") for low in lows])
+    return result
+
+def run(schema_path: str, rows: int, window: int, sector_size: int, queries: int, span: int,
+        seed: int) -> List[Dict[str, Any]]:
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = DataGenerator(load_schema(schema_path), seed=seed).write_csv(os.path.join(tmp, 'rows.csv'), rows)
+        return [measure(schema_path, csv_path, rows, w, sector_size, queries, span, seed, tmp)
+                for w in (0, window)]
+
+def main():
+    parser = argparse.ArgumentParser(description="Operaciones de E/S con y sin lectura anticipada")
+    parser.add_argument('--schema', default=DEFAULT_SCHEMA)
+    parser.add_argument('--rows', type=int, default=3000)
+    parser.add_argument('--window', type=int, default=8, help="Ventana inicial en sectores")
+    parser.add_argument('--sector-size', type=int, default=128)
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--span', type=int, default=200, help="Claves por rango")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--json', action='store_true', help="Imprime el resultado en JSON")
+    args = parser.parse_args()
+
+    results = run(args.schema, args.rows, args.window, args.sector_size, args.queries, args.span, args.seed)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'Ventana':<9}{'Fase':<18}{'Lecturas':>10}{'Sectores':>10}{'Aciertos':>10}{'Segundos':>10}")
+    for r in results:
+        for phase in PHASES:
+            p = r[phase]
+            print(f"{r['window']:<9}{phase:<18}{p['read_ops']:>10,}{p['sectors_read']:>10,}"
+                  f"{p['readahead_hits']:>10,}{p['seconds']:>10.2f}")
+
+if __name__ == "__main__":
+    main()
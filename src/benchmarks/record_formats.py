@@ -0,0 +1,96 @@
+# Compara el formato de registro fijo con el formato variable (ROW_FORMAT=VARIABLE):
+# espacio en disco y velocidad de recorrido sobre datos reales del CSV
+#
+# Uso: python benchmarks/record_formats.py [--schema archivo.txt] [--csv datos.csv] [--rows N]
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from typing import Any, Dict
+
+# Agregar el directorio src al path para importar módulos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import DEFAULT_CSV, DEFAULT_SCHEMA, geometry_for, load_rows, sectors_with_data
+from data_management.schema_parser import SchemaParser
+from storage.catalog import Catalog
+from storage.disk import Disk
+from storage.serialization import create_serializer
+from storage.table_scan import TableScan
+
+def measure_format(catalog: Catalog, schema: Dict[str, Any], records: list) -> Dict[str, Any]:
+    # Escribe los registros en una tabla con el formato del esquema y mide espacio y recorrido
+    entry = catalog.create_table(schema, extent_sectors=64)
+    manager = catalog.get_sector_manager(entry.name)
+    serializer = create_serializer(schema)
+
+    payload_bytes = 0
+    start = time.perf_counter()
+    for record in records:
+        data = serializer.serialize_record(record, schema)
+        payload_bytes += len(data)
+        manager.write_record(data)
+    write_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    scanned = sum(1 for _ in TableScan(manager, schema, serializer).scan())
+    scan_seconds = time.perf_counter() - start
+
+    return {
+        'row_format': schema['row_format'],
+        'rows': len(records),
+        'avg_record_bytes': payload_bytes / len(records),
+        'payload_bytes': payload_bytes,
+        'sectors_used': sectors_with_data(manager),
+        'write_rows_per_sec': len(records) / write_seconds if write_seconds else None,
+        'scan_rows_per_sec': scanned / scan_seconds if scan_seconds else None
+    }
+
+def run(schema_path: str, csv_path: str, rows: int, sector_size: int) -> Dict[str, Any]:
+    with open(schema_path, 'r', encoding='utf-8') as f:
+        sql = f.read().strip().rstrip(';')
+    base_schema = SchemaParser().parse_create_table(sql)
+    records = load_rows(csv_path, base_schema, rows)
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        geometry = geometry_for(rows * 2, base_schema['record_size'] + 16, sector_size)
+        catalog = Catalog(Disk(geometry, os.path.join(tmp, 'formats.bin')))
+        for row_format in ('FIXED', 'VARIABLE'):
+            schema = SchemaParser().parse_create_table(f"{sql} ROW_FORMAT={row_format}")
+            schema['table_name'] = f"{schema['table_name']}_{row_format.lower()}"
+            results[row_format] = measure_format(catalog, schema, records)
+    fixed, variable = results['FIXED'], results['VARIABLE']
+    results['space_saving'] = 1 - variable['payload_bytes'] / fixed['payload_bytes']
+    results['sector_saving'] = 1 - variable['sectors_used'] / fixed['sectors_used']
+    if fixed['scan_rows_per_sec'] and variable['scan_rows_per_sec']:
+        results['scan_speedup'] = variable['scan_rows_per_sec'] / fixed['scan_rows_per_sec']
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara los formatos de registro FIXED y VARIABLE")
+    parser.add_argument('--schema', default=DEFAULT_SCHEMA)
+    parser.add_argument('--csv', default=DEFAULT_CSV)
+    parser.add_argument('--rows', type=int, default=5000)
+    parser.add_argument('--sector-size', type=int, default=512)
+    parser.add_argument('--json', action='store_true', help="Imprime el resultado en JSON")
+    args = parser.parse_args()
+
+    results = run(args.schema, args.csv, args.rows, args.sector_size)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'Formato':<10}{'Bytes/reg':>12}{'Sectores':>12}{'Escritura/s':>14}{'Recorrido/s':>14}")
+    for row_format in ('FIXED', 'VARIABLE'):
+        r = results[row_format]
+        print(f"{row_format:<10}{r['avg_record_bytes']:>12.1f}{r['sectors_used']:>12,}"
+              f"{r['write_rows_per_sec']:>14,.0f}{r['scan_rows_per_sec']:>14,.0f}")
+    print(f"\nAhorro de espacio: {results['space_saving']:.1%} de bytes, {results['sector_saving']:.1%} de sectores")
+    if 'scan_speedup' in results:
+        print(f"Recorrido con formato variable: {results['scan_speedup']:.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# Mide carga y recorrido de una tabla sobre volúmenes en franjas (RAID-0) con distinta cantidad
+# de discos miembro: registros por segundo y operaciones de E/S por miembro
+#
+# Uso: python benchmarks/striping.py [--rows N] [--members 1 2 4] [--stripe-unit 8]
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List
+
+# Agregar el directorio src al path para importar módulos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import DEFAULT_SCHEMA, geometry_for
+from benchmarks.data_generator import DataGenerator, load_schema
+from engine.database import Database
+from storage.volume import DEFAULT_STRIPE_UNIT
+
+def measure(schema_path: str, csv_path: str, rows: int, members: int, stripe_unit: int, workdir: str) -> Dict[str, Any]:
+    schema = load_schema(schema_path)
+    # La geometría es la de cada miembro: la capacidad total es la misma para todos los casos
+    geometry = geometry_for(max(1, rows // members), schema['record_size'], headroom=2.0)
+    db = Database(geometry, os.path.join(workdir, f"striped_{members}.bin"),
+                  stripes=members, stripe_unit=stripe_unit)
+    db.load_schema(schema_path)
+    table = schema['table_name']
+
+    start = time.perf_counter()
+    db.load_csv(table, csv_path)
+    load_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    scanned = sum(1 for _ in db.scan(table))
+    scan_seconds = time.perf_counter() - start
+
+    status = db.status()
+    return {
+        'members': members,
+        'stripe_unit': stripe_unit,
+        'load_rows_per_sec': rows / load_seconds,
+        'scan_rows_per_sec': scanned / scan_seconds,
+        'member_read_ops': [m['read_ops'] for m in status.get('members', [])] or [db.disk.stats.counters['read_ops']]
+    }
+
+def run(schema_path: str, rows: int, member_counts: List[int], stripe_unit: int, seed: int) -> List[Dict[str, Any]]:
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = DataGenerator(load_schema(schema_path), seed=seed).write_csv(os.path.join(tmp, 'rows.csv'), rows)
+        return [measure(schema_path, csv_path, rows, members, stripe_unit, tmp) for members in member_counts]
+
+def main():
+    parser = argparse.ArgumentParser(description="Carga y recorrido sobre volúmenes en franjas")
+    parser.add_argument('--schema', default=DEFAULT_SCHEMA)
+    parser.add_argument('--rows', type=int, default=5000)
+    parser.add_argument('--members', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--stripe-unit', type=int, default=DEFAULT_STRIPE_UNIT)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--json', action='store_true', help="Imprime el resultado en JSON")
+    args = parser.parse_args()
+
+    results = run(args.schema, args.rows, args.members, args.stripe_unit, args.seed)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'Discos':>7}{'Carga/s':>12}{'Recorrido/s':>14}  Lecturas por miembro")
+    for r in results:
+        print(f"{r['members']:>7}{r['load_rows_per_sec']:>12,.0f}{r['scan_rows_per_sec']:>14,.0f}  "
+              f"{', '.join(str(ops) for ops in r['member_read_ops'])}")
+
+if __name__ == "__main__":
+    main()
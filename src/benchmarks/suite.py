@@ -0,0 +1,194 @@
+# Suite de rendimiento reproducible: genera datos sintéticos desde el esquema y mide carga,
+# búsquedas por clave primaria (p50/p99), búsquedas por campo secundario y recorrido completo
+# para varias geometrías de disco y tamaños de tabla. Estas fases corren sin caché de registros,
+# con claves distintas, para medir el acceso al disco; las búsquedas con caché se miden aparte.
+# El resultado se guarda en JSON y se puede comparar contra una corrida anterior
+#
+# Uso: python benchmarks/suite.py [--sizes 1000 5000] [--geometries small default large]
+#                                 [--output resultado.json] [--baseline anterior.json]
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+# Agregar el directorio src al path para importar módulos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import DEFAULT_SCHEMA, geometry_for, percentile
+from benchmarks.data_generator import DataGenerator, load_schema
+from engine.database import Database
+
+# nombre -> (bytes por sector, sectores por pista, platos)
+GEOMETRIES = {
+    'small': (64, 32, 2),
+    'default': (512, 64, 1),
+    'large': (4096, 16, 1)
+}
+DEFAULT_SIZES = (1000, 5000)
+DEFAULT_TOLERANCE = 0.10
+# Métricas en las que un valor menor es mejor; en las demás un valor mayor es mejor
+LOWER_IS_BETTER = ('point_lookup_p50_ms', 'point_lookup_p99_ms', 'secondary_lookup_p50_ms',
+                   'sectors_per_point_lookup', 'cached_point_lookup_p50_ms')
+
+def _timed_lookups(db: Database, table: str, field_name: str, values: List[Any]) -> List[float]:
+    latencies = []
+    for value in values:
+        start = time.perf_counter()
+        db.search(table, field_name, value)
+        latencies.append(1000 * (time.perf_counter() - start))
+    return latencies
+
+def measure(schema: Dict[str, Any], sql: str, geometry_name: str, rows: int, lookups: int, seed: int,
+            workdir: str) -> Dict[str, Any]:
+    sector_size, sectors_per_track, platters = GEOMETRIES[geometry_name]
+    generator = DataGenerator(schema, seed=seed)
+    csv_path = generator.write_csv(os.path.join(workdir, f"data_{rows}.csv"), rows)
+    geometry = geometry_for(rows, schema['record_size'], sector_size, sectors_per_track, platters, headroom=2.0)
+    path = os.path.join(workdir, f"{geometry_name}_{rows}.bin")
+    db = Database(geometry, path, record_cache_bytes=0)
+    db.create_tables(sql)
+    table = schema['table_name']
+
+    start = time.perf_counter()
+    written = db.load_csv(table, csv_path)
+    ingest_seconds = time.perf_counter() - start
+
+    rng = random.Random(seed)
+    primary_key = schema['primary_key']
+    sample = list(generator.rows(rows))
+    # Sin reposición mientras alcancen las filas, para no repetir claves
+    drawn = rng.sample(sample, lookups) if lookups <= len(sample) else rng.choices(sample, k=lookups)
+    keys = [db.parse_value(table, primary_key, row[primary_key]) for row in drawn]
+    reads_before = db.disk.sectors_read
+    point = _timed_lookups(db, table, primary_key, keys)
+    sectors_per_lookup = (db.disk.sectors_read - reads_before) / len(keys)
+
+    secondary_field = next((f['name'] for f in schema['fields']
+                            if f['name'] != primary_key and f['type'] in ('CHAR', 'VARCHAR', 'TEXT')),
+                           next(f['name'] for f in schema['fields'] if f['name'] != primary_key))
+    drawn = rng.sample(sample, lookups) if lookups <= len(sample) else rng.choices(sample, k=lookups)
+    values = [db.parse_value(table, secondary_field, row[secondary_field]) for row in drawn]
+    secondary = _timed_lookups(db, table, secondary_field, values)
+
+    start = time.perf_counter()
+    scanned = sum(1 for _ in db.scan(table))
+    scan_seconds = time.perf_counter() - start
+
+    # Las mismas búsquedas con la caché de registros predeterminada, después de una pasada que la llena
+    db.save()
+    cached_db = Database.open(path)
+    _timed_lookups(cached_db, table, primary_key, keys)
+    cached_db.record_cache.reset_stats()
+    cached = _timed_lookups(cached_db, table, primary_key, keys)
+
+    return {
+        'geometry': geometry_name,
+        'sector_size': sector_size,
+        'rows': written,
+        'ingest_rows_per_sec': written / ingest_seconds,
+        'point_lookup_p50_ms': percentile(point, 50),
+        'point_lookup_p99_ms': percentile(point, 99),
+        'sectors_per_point_lookup': sectors_per_lookup,
+        'secondary_field': secondary_field,
+        'secondary_lookups_per_sec': len(secondary) / (sum(secondary) / 1000),
+        'secondary_lookup_p50_ms': percentile(secondary, 50),
+        'scan_rows_per_sec': scanned / scan_seconds,
+        'cached_point_lookup_p50_ms': percentile(cached, 50),
+        'record_cache_hit_rate': cached_db.record_cache.stats()['hit_rate']
+    }
+
+def run(schema_path: str, sizes: List[int], geometries: List[str], lookups: int, seed: int) -> Dict[str, Any]:
+    schema = load_schema(schema_path)
+    with open(schema_path, 'r', encoding='utf-8') as f:
+        sql = f.read()
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for geometry_name in geometries:
+            for rows in sizes:
+                results.append(measure(schema, sql, geometry_name, rows, lookups, seed, workdir))
+    return {
+        'meta': {
+            'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'schema': os.path.basename(schema_path),
+            'seed': seed,
+            'lookups': lookups
+        },
+        'results': results
+    }
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[Dict[str, Any]]:
+    # Cambio relativo de cada métrica frente a la corrida base; marca las regresiones
+    previous = {(r['geometry'], r['rows']): r for r in baseline.get('results', [])}
+    changes = []
+    for result in current['results']:
+        base = previous.get((result['geometry'], result['rows']))
+        if base is None:
+            continue
+        for metric, value in result.items():
+            old = base.get(metric)
+            if not isinstance(value, (int, float)) or not isinstance(old, (int, float)) \
+                    or metric in ('rows', 'sector_size') or not old:
+                continue
+            change = (value - old) / old
+            worse = change > tolerance if metric in LOWER_IS_BETTER else change < -tolerance
+            changes.append({'geometry': result['geometry'], 'rows': result['rows'], 'metric': metric,
+                            'baseline': old, 'current': value, 'change': change, 'regression': worse})
+    return changes
+
+def print_report(report: Dict[str, Any], changes: Optional[List[Dict[str, Any]]]):
+    print(f"{'Geometría':<10}{'Filas':>8}{'Carga/s':>10}{'PK p50 ms':>11}{'PK p99 ms':>11}"
+          f"{'Sect/PK':>9}{'Sec/s':>9}{'Recorrido/s':>13}{'PK caché ms':>13}")
+    for r in report['results']:
+        print(f"{r['geometry']:<10}{r['rows']:>8,}{r['ingest_rows_per_sec']:>10,.0f}"
+              f"{r['point_lookup_p50_ms']:>11.3f}{r['point_lookup_p99_ms']:>11.3f}"
+              f"{r['sectors_per_point_lookup']:>9.2f}{r['secondary_lookups_per_sec']:>9,.0f}"
+              f"{r['scan_rows_per_sec']:>13,.0f}{r['cached_point_lookup_p50_ms']:>13.3f}")
+    if changes is None:
+        return
+    print("\nComparación con la corrida base:")
+    for c in changes:
+        mark = "  REGRESIÓN" if c['regression'] else ""
+        print(f"  {c['geometry']:<8}{c['rows']:>7,} {c['metric']:<28}{c['change']:>+8.1%}{mark}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Suite de rendimiento del simulador")
+    parser.add_argument('--schema', default=DEFAULT_SCHEMA)
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES))
+    parser.add_argument('--geometries', nargs='+', choices=sorted(GEOMETRIES), default=list(GEOMETRIES))
+    parser.add_argument('--lookups', type=int, default=500)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help="Archivo JSON donde guardar el resultado")
+    parser.add_argument('--baseline', help="Resultado JSON anterior con el que comparar")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help="Cambio relativo tolerado antes de marcar una regresión")
+    parser.add_argument('--json', action='store_true', help="Imprime el resultado en JSON")
+    args = parser.parse_args()
+
+    report = run(args.schema, args.sizes, args.geometries, args.lookups, args.seed)
+    changes = None
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            changes = compare(report, json.load(f), args.tolerance)
+        report['comparison'] = changes
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report, changes)
+    if changes and any(c['regression'] for c in changes):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
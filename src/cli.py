@@ -0,0 +1,253 @@
+# Interfaz de línea de comandos del simulador (sin tkinter), pensada para procesos por lotes
+#
+# Ejemplos:
+#   python cli.py schema ../data/struct_table.txt
+#   python cli.py load PRODUCTO ../data/a.csv
+#   python cli.py load PRODUCTO ../data/a.csv --defer-indexes
+#   python cli.py search PRODUCTO item "deadpool dvd"
+#   python cli.py scan PRODUCTO --where "cost > 5" --where "item PREFIX d"
+#   python cli.py query "EXPLAIN SELECT item, cost FROM PRODUCTO WHERE cost > 5 ORDER BY cost LIMIT 3"
+#   python cli.py status --json
+#   python cli.py --disk viejo.bin migrate nuevo.bin --target-tracks 4096
+#   python cli.py export PRODUCTO productos.csv --where "index BETWEEN 1 1000"
+#   python cli.py export PRODUCTO productos.col --format columnar
+
+import argparse
+import json
+import os
+import sys
+from typing import Any, Dict, List
+
+# Agregar el directorio src al path para importar módulos
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from diagnostics.profiling import PROFILE_MODES, profile_call
+from diagnostics.tracing import disable_tracing, enable_tracing
+from engine.database import Database, DEFAULT_DISK_FILE
+from engine.export import EXPORT_FORMATS, export_table
+from engine.migration import migrate_database
+from storage.disk import DiskGeometry, LBA_MAPPINGS, PLATTER_MAJOR, read_geometry
+from storage.table_scan import Predicate, STRING_TYPES
+from storage.volume import DEFAULT_STRIPE_UNIT, member_filename
+
+DEFAULT_GEOMETRY = DiskGeometry(platters=2, tracks=4, sectors=8, sector_size=64, lba_mapping=PLATTER_MAJOR)
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Simulador de disco - línea de comandos")
+    parser.add_argument('--disk', default=DEFAULT_DISK_FILE, help="Archivo del disco virtual")
+    # Sin valores, la geometría de un disco existente sale de su superbloque
+    parser.add_argument('--platters', type=int, default=None)
+    parser.add_argument('--tracks', type=int, default=None)
+    parser.add_argument('--sectors', type=int, default=None)
+    parser.add_argument('--sector-size', type=int, default=None)
+    parser.add_argument('--lba', choices=LBA_MAPPINGS, default=None,
+                        help="Orden de los sectores lógicos: por plato o por cilindro")
+    parser.add_argument('--stripes', type=int, default=1,
+                        help="Discos miembro de un volumen en franjas (la geometría es la de cada uno)")
+    parser.add_argument('--stripe-unit', type=int, default=DEFAULT_STRIPE_UNIT, help="Sectores por franja")
+    parser.add_argument('--mirrors', type=int, default=1, help="Réplicas de un volumen espejado")
+    parser.add_argument('--read-ahead', type=int, default=0,
+                        help="Ventana inicial de lectura anticipada en sectores (0 la desactiva)")
+    parser.add_argument('--json', action='store_true', help="Salida en formato JSON")
+    parser.add_argument('--io-stats', action='store_true',
+                        help="Agrega los contadores de E/S y las latencias del comando")
+    parser.add_argument('--trace', action='store_true',
+                        help="Muestra en stderr el tiempo de cada tramo (parseo, validación, escritura...)")
+    parser.add_argument('--trace-output', help="Guarda los tramos como pilas colapsadas (flamegraph)")
+    parser.add_argument('--profile', choices=PROFILE_MODES, help="Perfila el comando")
+    parser.add_argument('--profile-output', help="Guarda el perfil como pilas colapsadas (flamegraph)")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    commands.add_parser('tables', help="Lista las tablas del catálogo")
+    commands.add_parser('status', help="Muestra el estado del disco")
+
+    schema = commands.add_parser('schema', help="Registra las tablas de un archivo CREATE TABLE")
+    schema.add_argument('file')
+
+    load = commands.add_parser('load', help="Carga un CSV en una tabla")
+    load.add_argument('table')
+    load.add_argument('csv')
+    load.add_argument('--defer-indexes', action='store_true',
+                      help="Construye los índices secundarios al final, en bloque")
+    load.add_argument('--index-workers', type=int, default=None,
+                      help="Procesos para construir los índices diferidos (por defecto, según las CPUs)")
+
+    search = commands.add_parser('search', help="Busca registros por igualdad en un campo")
+    search.add_argument('table')
+    search.add_argument('field')
+    search.add_argument('value')
+
+    scan = commands.add_parser('scan', help="Recorre la tabla filtrando por condiciones")
+    scan.add_argument('table')
+    scan.add_argument('--where', action='append', default=[],
+                      help="Condición 'campo op valor' (op: =, <, >, <=, >=, PREFIX) o 'campo BETWEEN a b'")
+    scan.add_argument('--limit', type=int, default=None)
+
+    query = commands.add_parser('query', help="Ejecuta un SELECT (con EXPLAIN muestra el plan)")
+    query.add_argument('sql')
+
+    migrate = commands.add_parser('migrate', help="Copia el disco a uno nuevo con el formato de fragmentos actual")
+    migrate.add_argument('target', help="Archivo del disco nuevo")
+    migrate.add_argument('--target-platters', type=int, default=None, help="Platos del disco nuevo")
+    migrate.add_argument('--target-tracks', type=int, default=None, help="Pistas por superficie del disco nuevo")
+    migrate.add_argument('--target-sectors', type=int, default=None, help="Sectores por pista del disco nuevo")
+
+    export = commands.add_parser('export', help="Exporta la tabla en orden físico a CSV o a un archivo columnar")
+    export.add_argument('table')
+    export.add_argument('output', help="Archivo de salida")
+    export.add_argument('--format', choices=EXPORT_FORMATS, default='csv')
+    export.add_argument('--where', action='append', default=[],
+                        help="Condición 'campo op valor' (op: =, <, >, <=, >=, PREFIX) o 'campo BETWEEN a b'")
+    return parser
+
+def resolve_geometry(args) -> DiskGeometry:
+    # Los valores no indicados salen del superbloque del disco (del primer miembro en un volumen)
+    # o, si el disco es nuevo, de la geometría predeterminada
+    filename = member_filename(args.disk, 0) if args.stripes > 1 or args.mirrors > 1 else args.disk
+    try:
+        saved = read_geometry(filename)
+    except ValueError:
+        saved = DEFAULT_GEOMETRY
+    return DiskGeometry(args.platters or saved.platters, args.tracks or saved.tracks, args.sectors or saved.sectors,
+                        args.sector_size or saved.sector_size, args.lba or saved.lba_mapping)
+
+def parse_condition(db: Database, table: str, condition: str) -> Predicate:
+    # Convierte 'campo op valor' en un predicado con el valor del tipo del campo
+    parts = condition.split(None, 2)
+    if len(parts) < 3:
+        raise ValueError(f"Condición inválida: {condition}")
+    field_name, operator, rest = parts
+    field = next((f for f in db.get_schema(table)['fields'] if f['name'] == field_name), None)
+    if field is None:
+        raise ValueError(f"Campo desconocido: {field_name}")
+    ignore_case = field['type'] in STRING_TYPES
+    if operator.upper() == 'BETWEEN':
+        bounds = rest.replace(' AND ', ' ').replace(' and ', ' ').split()
+        if len(bounds) != 2:
+            raise ValueError(f"BETWEEN requiere dos valores: {condition}")
+        low, high = (db.parse_value(table, field_name, b) for b in bounds)
+        return Predicate(field_name, 'BETWEEN', low, high, ignore_case=ignore_case)
+    return Predicate(field_name, operator, db.parse_value(table, field_name, rest.strip().strip('"\'')),
+                     ignore_case=ignore_case)
+
+def run_command(db: Database, args) -> Any:
+    if args.command == 'tables':
+        return db.table_names()
+    if args.command == 'status':
+        return db.status()
+    if args.command == 'schema':
+        return {'tables': db.load_schema(args.file)}
+    if args.command == 'load':
+        progress = None if args.json else print
+        records_written = db.load_csv(args.table, args.csv, progress, defer_indexes=args.defer_indexes,
+                                      index_workers=args.index_workers)
+        return {'table': args.table, 'records_written': records_written}
+    if args.command == 'search':
+        return db.search(args.table, args.field, db.parse_value(args.table, args.field, args.value))
+    if args.command == 'scan':
+        predicates = [parse_condition(db, args.table, condition) for condition in args.where]
+        rows: List[Dict[str, Any]] = []
+        for address, record in db.scan(args.table, predicates):
+            rows.append({'address': address, 'record': record})
+            if args.limit is not None and len(rows) >= args.limit:
+                break
+        return {'results': rows}
+    if args.command == 'query':
+        result = db.query(args.sql)
+        response: Dict[str, Any] = {'columns': result.columns, 'rows': result.rows}
+        if result.plan.statement.explain:
+            response['explain'] = db.explain(result)
+        return response
+    if args.command == 'migrate':
+        geometry = db.disk.geometry
+        target_geometry = DiskGeometry(args.target_platters or geometry.platters, args.target_tracks or geometry.tracks,
+                                       args.target_sectors or geometry.sectors, geometry.sector_size,
+                                       geometry.lba_mapping)
+        return migrate_database(db, args.target, target_geometry, None if args.json else print)
+    if args.command == 'export':
+        predicates = [parse_condition(db, args.table, condition) for condition in args.where]
+        return export_table(db, args.table, args.output, args.format, predicates, progress=None if args.json else print)
+    raise ValueError(f"Comando desconocido: {args.command}")
+
+def print_result(result: Any):
+    # Salida legible para las respuestas más comunes
+    if isinstance(result, list):
+        for item in result:
+            print(item)
+    elif isinstance(result, dict) and 'rows' in result:
+        if 'explain' in result:
+            print(result['explain'])
+            print()
+        print("\t".join(result['columns']))
+        for row in result['rows']:
+            print("\t".join(str(row[column]) for column in result['columns']))
+        print(f"{len(result['rows'])} registro(s)")
+    elif isinstance(result, dict) and 'results' in result:
+        if 'method' in result:
+            print(f"Método: {'índice' if result['method'] == 'index' else 'recorrido completo'}")
+        for match in result['results']:
+            print(f"({match['address'][0]}, {match['address'][1]}) {match['record']}")
+        print(f"{len(result['results'])} registro(s)")
+    elif isinstance(result, dict):
+        for key, value in result.items():
+            print(f"{key}: {value}")
+    else:
+        print(result)
+
+def print_io_stats(stats: Dict[str, Any]):
+    print("\nEntrada/salida:")
+    for name, value in stats['counters'].items():
+        print(f"  {name}: {value}")
+    for operation, latency in stats['latency'].items():
+        print(f"  {operation}: {latency['count']} ops, p50 {latency['p50_ms']:.3f} ms, "
+              f"p99 {latency['p99_ms']:.3f} ms, máx {latency['max_ms']:.3f} ms")
+
+def report_trace(tracer, show: bool, output: str = None):
+    # Resumen de tramos en stderr para no mezclarlo con la salida del comando
+    if output:
+        tracer.write_collapsed(output)
+    if show:
+        print(f"\n{'Tramo':<16}{'Llamadas':>10}{'Total ms':>12}{'Propio ms':>12}", file=sys.stderr)
+        for name, info in tracer.summary().items():
+            print(f"{name:<16}{info['count']:>10}{info['total_ms']:>12.2f}{info['self_ms']:>12.2f}", file=sys.stderr)
+
+def report_profile(profile, output: str = None):
+    if output:
+        profile.write_collapsed(output)
+    unit = "µs" if profile.mode == 'deterministic' else "muestras"
+    print(f"\nPerfil ({profile.mode}, {profile.elapsed * 1000:.1f} ms):", file=sys.stderr)
+    for entry in profile.top():
+        print(f"  {entry['share']:>6.1%} {int(entry['weight']):>10} {unit}  {entry['function']}", file=sys.stderr)
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        db = Database(resolve_geometry(args), args.disk, stripes=args.stripes, stripe_unit=args.stripe_unit,
+                      mirrors=args.mirrors, read_ahead=args.read_ahead)
+        db.reset_io_stats()
+        if args.trace or args.trace_output:
+            enable_tracing()
+        if args.profile:
+            profile = profile_call(run_command, db, args, mode=args.profile)
+            result = profile.value
+            report_profile(profile, args.profile_output)
+        else:
+            result = run_command(db, args)
+        tracer = disable_tracing()
+        if tracer is not None:
+            report_trace(tracer, args.trace, args.trace_output)
+        if args.io_stats:
+            result = {'result': result, 'io_stats': db.io_stats()}
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    if args.json:
+        print(json.dumps(result, indent=2, default=str))
+    elif args.io_stats:
+        print_result(result['result'])
+        print_io_stats(result['io_stats'])
+    else:
+        print_result(result)
+
+if __name__ == "__main__":
+    main()
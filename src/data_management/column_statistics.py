@@ -0,0 +1,221 @@
+# Estadísticas de columna mantenidas durante la carga: cantidad de nulos, mínimo y máximo,
+# estimación de valores distintos (HyperLogLog), valores más comunes (Space-Saving) y un
+# histograma de igual profundidad calculado sobre una muestra de reservorio
+
+import hashlib
+import math
+import random
+from bisect import bisect_right
+from typing import Any, Dict, List, Optional, Tuple
+
+HLL_PRECISION = 10        # 2^10 registros: error típico de ~3%
+MCV_SIZE = 10             # Valores más comunes que se reportan
+MCV_COUNTERS = 2 * MCV_SIZE
+RESERVOIR_SIZE = 1024     # Valores muestreados para el histograma
+HISTOGRAM_BUCKETS = 10
+
+class DistinctSketch:
+    # HyperLogLog: estima la cantidad de valores distintos con memoria constante
+
+    def __init__(self, precision: int = HLL_PRECISION):
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+
+    def add(self, value: Any):
+        digest = hashlib.blake2b(repr(value).encode('utf-8'), digest_size=8).digest()
+        h = int.from_bytes(digest, 'big')
+        width = 64 - self.precision
+        index = h >> width
+        rest = h & ((1 << width) - 1)
+        rank = width - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def estimate(self) -> int:
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            # Corrección para cardinalidades pequeñas (conteo lineal)
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+class ColumnStatistics:
+    # Estadísticas incrementales de una columna. Los textos se registran en minúsculas, igual
+    # que las claves de los índices y los valores de los predicados
+
+    def __init__(self, name: str, seed: int = 0):
+        self.name = name
+        self.count = 0
+        self.null_count = 0
+        self.min: Any = None
+        self.max: Any = None
+        self.sketch = DistinctSketch()
+        self.counters: Dict[Any, List[int]] = {}  # valor -> [conteo, error máximo]
+        self.sample: List[Any] = []
+        self._sorted_sample: Optional[List[Any]] = None  # Muestra ordenada, hasta que cambie la muestra
+        self._rng = random.Random(seed)
+
+    def __getstate__(self):
+        # La muestra ordenada se rehace al leer el catálogo
+        state = dict(self.__dict__)
+        state.pop('_sorted_sample', None)
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]):
+        self.__dict__.update(state)
+        self._sorted_sample = None
+
+    def add(self, value: Any):
+        self.count += 1
+        if value is None or value == "":
+            self.null_count += 1
+            return
+        if isinstance(value, str):
+            value = value.lower()
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+        self.sketch.add(value)
+        self._count_value(value)
+        self._sample_value(value)
+
+    def _count_value(self, value: Any):
+        # Space-Saving: con el espacio lleno, el valor reemplaza al contador mínimo
+        counter = self.counters.get(value)
+        if counter is not None:
+            counter[0] += 1
+        elif len(self.counters) < MCV_COUNTERS:
+            self.counters[value] = [1, 0]
+        else:
+            victim = min(self.counters, key=lambda v: self.counters[v][0])
+            smallest = self.counters.pop(victim)[0]
+            self.counters[value] = [smallest + 1, smallest]
+
+    def _sample_value(self, value: Any):
+        seen = self.count - self.null_count
+        if len(self.sample) < RESERVOIR_SIZE:
+            self.sample.append(value)
+            self._sorted_sample = None
+        else:
+            slot = self._rng.randrange(seen)
+            if slot < RESERVOIR_SIZE:
+                self.sample[slot] = value
+                self._sorted_sample = None
+
+    def sorted_sample(self) -> List[Any]:
+        # La muestra ordenada se calcula una vez y se reutiliza mientras la muestra no cambie
+        if self._sorted_sample is None:
+            self._sorted_sample = sorted(self.sample)
+        return self._sorted_sample
+
+    # ----------------------- Resúmenes -----------------------
+    @property
+    def non_null(self) -> int:
+        return self.count - self.null_count
+
+    def distinct(self) -> int:
+        return min(self.sketch.estimate(), self.non_null)
+
+    def most_common(self, limit: int = MCV_SIZE) -> List[Tuple[Any, int]]:
+        # Valores más frecuentes con su conteo garantizado (conteo menos error)
+        ranked = sorted(((v, c[0] - c[1]) for v, c in self.counters.items()), key=lambda item: -item[1])
+        return [(value, count) for value, count in ranked[:limit] if count > 1]
+
+    def histogram(self, buckets: int = HISTOGRAM_BUCKETS) -> List[Any]:
+        # Límites de un histograma de igual profundidad: cada cubeta tiene la misma cantidad de filas
+        ordered = self.sorted_sample()
+        if not ordered:
+            return []
+        buckets = min(buckets, len(ordered))
+        return [ordered[round(i * (len(ordered) - 1) / buckets)] for i in range(buckets + 1)]
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            'count': self.count,
+            'nulls': self.null_count,
+            'distinct': self.distinct(),
+            'min': self.min,
+            'max': self.max,
+            'most_common': self.most_common(),
+            'histogram': self.histogram()
+        }
+
+    # ----------------------- Selectividad -----------------------
+    def selectivity(self, operator: str, value: Any, upper: Any = None) -> Optional[float]:
+        # Fracción estimada de filas que cumplen 'campo operador valor'; None si no hay datos
+        if self.count == 0:
+            return None
+        if isinstance(value, str):
+            value = value.lower()
+        if isinstance(upper, str):
+            upper = upper.lower()
+        try:
+            if operator == '=':
+                fraction = self._equal_fraction(value)
+            elif operator == '<':
+                fraction = self._below(value)
+            elif operator == '<=':
+                fraction = self._below(value) + self._equal_fraction(value)
+            elif operator == '>':
+                fraction = 1 - self._below(value) - self._equal_fraction(value)
+            elif operator == '>=':
+                fraction = 1 - self._below(value)
+            elif operator == 'BETWEEN':
+                fraction = self._below(upper) + self._equal_fraction(upper) - self._below(value)
+            elif operator == 'PREFIX':
+                fraction = self._below(str(value) + '\U0010ffff') - self._below(str(value))
+            else:
+                return None
+        except TypeError:
+            # Valor de otro tipo que la columna
+            return None
+        return max(0.0, min(1.0, fraction)) * self.non_null / self.count
+
+    def _equal_fraction(self, value: Any) -> float:
+        # Fracción de valores no nulos iguales a `value`
+        if self.non_null == 0 or self.min is None or value < self.min or value > self.max:
+            return 0.0
+        common = dict(self.most_common(MCV_COUNTERS))
+        if value in common:
+            return common[value] / self.non_null
+        remaining_rows = self.non_null - sum(common.values())
+        remaining_values = max(1, self.distinct() - len(common))
+        return max(0, remaining_rows) / remaining_values / self.non_null
+
+    def _below(self, value: Any) -> float:
+        # Fracción de valores no nulos menores que `value`, interpolando dentro de la cubeta
+        bounds = self.histogram()
+        if not bounds or value <= bounds[0]:
+            return 0.0
+        if value > bounds[-1]:
+            return 1.0
+        buckets = len(bounds) - 1
+        if buckets == 0:
+            return 0.5
+        bucket = min(bisect_right(bounds, value) - 1, buckets - 1)
+        low, high = bounds[bucket], bounds[bucket + 1]
+        numeric = all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in (low, high, value))
+        within = (value - low) / (high - low) if numeric and high > low else 0.5
+        return (bucket + min(1.0, within)) / buckets
+
+class TableStatistics:
+    # Estadísticas de todas las columnas de una tabla, guardadas en el catálogo
+
+    def __init__(self, schema: Dict[str, Any]):
+        self.columns: Dict[str, ColumnStatistics] = {
+            f['name']: ColumnStatistics(f['name'], seed=i) for i, f in enumerate(schema['fields'])
+        }
+
+    def add(self, record: Dict[str, Any]):
+        for name, column in self.columns.items():
+            column.add(record.get(name))
+
+    def selectivity(self, field_name: str, operator: str, value: Any, upper: Any = None) -> Optional[float]:
+        column = self.columns.get(field_name)
+        return column.selectivity(operator, value, upper) if column else None
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        return {name: column.summary() for name, column in self.columns.items()}
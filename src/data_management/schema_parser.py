@@ -33,6 +33,29 @@ class SchemaParser:
         
         return self.parse_create_table(content)
     
+    def parse_schema_file_tables(self, file_path: str) -> List[Dict[str, Any]]:
+        # Parsea un archivo con una o varias sentencias CREATE TABLE y retorna un esquema por tabla
+        with open(file_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        
+        return self.parse_create_tables(content)
+    
+    def parse_create_tables(self, sql_content: str) -> List[Dict[str, Any]]:
+        # Parsea todas las sentencias CREATE TABLE separadas por ';'
+        sql = self._normalize_sql(sql_content)
+        
+        statements = [stmt.strip() for stmt in sql.split(';')]
+        schemas = [self.parse_create_table(stmt) for stmt in statements
+                   if re.match(r'CREATE\s+TABLE\b', stmt, re.IGNORECASE)]
+        if not schemas:
+            raise ValueError("No se encontró ninguna sentencia CREATE TABLE")
+        
+        names = [schema['table_name'].lower() for schema in schemas]
+        if len(set(names)) != len(names):
+            raise ValueError("Hay tablas definidas más de una vez")
+        
+        return schemas
+    
     def parse_create_table(self, sql_content: str) -> Dict[str, Any]:
         # Parsea el contenido SQL de CREATE TABLE
         sql = self._normalize_sql(sql_content)
@@ -53,13 +76,18 @@ class SchemaParser:
         
         primary_key = self._find_primary_key(columns_def, fields)
         
-        record_size = self._calculate_record_size(fields)
+        options = self._parse_table_options(sql[columns_match.end():])
+        
+        record_size = self._calculate_record_size(fields, options['row_format'])
         
         return {
             'table_name': table_name,
             'primary_key': primary_key,
             'fields': fields,
-            'record_size': record_size
+            'record_size': record_size,
+            'row_format': options['row_format'],
+            'compression': options['compression'],
+            'organization': options['organization']
         }
     
     def _normalize_sql(self, sql: str) -> str:
@@ -171,11 +199,47 @@ class SchemaParser:
         
         raise ValueError("No se pudo determinar la clave primaria")
     
-    def _calculate_record_size(self, fields: List[Dict]) -> int:
-        # Calcula el tamaño total del registro
+    def _parse_table_options(self, options_def: str) -> Dict[str, Any]:
+        # Parsea las opciones escritas después de las columnas, p. ej. ") ROW_FORMAT=VARIABLE COMPRESSION=ZLIB;"
+        # u ") ORGANIZATION=CLUSTERED;" para guardar las filas ordenadas por clave primaria
+        options = {'row_format': 'FIXED', 'compression': 'NONE', 'organization': 'HEAP'}
+        
+        row_format_match = re.search(r'ROW_FORMAT\s*=\s*(\w+)', options_def, re.IGNORECASE)
+        if row_format_match:
+            row_format = row_format_match.group(1).upper()
+            if row_format not in ('FIXED', 'VARIABLE'):
+                raise ValueError(f"ROW_FORMAT no soportado: {row_format}")
+            options['row_format'] = row_format
+        
+        compression_match = re.search(r'COMPRESSION\s*=\s*(\w+)', options_def, re.IGNORECASE)
+        if compression_match:
+            compression = compression_match.group(1).upper()
+            if compression not in ('NONE', 'ZLIB', 'LZMA'):
+                raise ValueError(f"COMPRESSION no soportado: {compression}")
+            options['compression'] = compression
+        
+        organization_match = re.search(r'ORGANIZATION\s*=\s*(\w+)', options_def, re.IGNORECASE)
+        if organization_match:
+            organization = organization_match.group(1).upper()
+            if organization not in ('HEAP', 'CLUSTERED'):
+                raise ValueError(f"ORGANIZATION no soportado: {organization}")
+            if organization == 'CLUSTERED' and options['compression'] != 'NONE':
+                raise ValueError("Una tabla agrupada no puede usar COMPRESSION")
+            options['organization'] = organization
+        
+        return options
+    
+    def _calculate_record_size(self, fields: List[Dict], row_format: str = 'FIXED') -> int:
+        # Calcula el tamaño total del registro. En formato VARIABLE es el tamaño máximo:
+        # mapa de bits de NULL más un prefijo de 2 bytes por cada VARCHAR/TEXT
         total_size = 0
         
         for field in fields:
             total_size += field['size']
+            if row_format == 'VARIABLE' and field['type'] in ('VARCHAR', 'TEXT'):
+                total_size += 2
+        
+        if row_format == 'VARIABLE':
+            total_size += (len(fields) + 7) // 8
         
         return total_size
\ No newline at end of file
@@ -0,0 +1,98 @@
+# Contadores de E/S e histogramas de latencia del disco simulado
+
+import math
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List
+
+COUNTERS = (
+    'file_opens',           # Aperturas del archivo del disco o del mapa de sectores
+    'read_ops',             # Operaciones de lectura (cada una puede abarcar varios sectores)
+    'sectors_read',
+    'bytes_read',
+    'write_ops',
+    'bytes_written',
+    'fragments_read',       # Fragmentos seguidos al leer registros
+    'fragments_written',
+    'map_saves',            # Escrituras del mapa de sectores
+    'head_moves',           # Cambios de cilindro del cabezal simulado
+    'seek_distance',        # Cilindros recorridos por el cabezal
+    'index_nodes_visited',  # Nodos AVL visitados en búsquedas
+    'readahead_sectors',    # Sectores leídos por anticipado
+    'readahead_hits',       # Sectores anticipados que luego se pidieron
+    'readahead_wasted'      # Sectores anticipados descartados sin usar
+)
+HISTOGRAM_BUCKETS = 24  # Cubetas de potencias de 2 en microsegundos: 1 µs ... ~8 s
+
+class LatencyHistogram:
+    # Histograma logarítmico de latencias: la cubeta i cuenta las operaciones de hasta 2^i µs
+
+    def __init__(self):
+        self.buckets: List[int] = [0] * HISTOGRAM_BUCKETS
+        self.count = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    def record(self, seconds: float):
+        # Menor i con 2^i >= microsegundos
+        bucket = min(HISTOGRAM_BUCKETS - 1, max(0, math.ceil(seconds * 1_000_000) - 1).bit_length())
+        self.buckets[bucket] += 1
+        self.count += 1
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+
+    def percentile_ms(self, p: float) -> float:
+        # Límite superior de la cubeta que contiene el percentil p (entre 0 y 100)
+        if self.count == 0:
+            return 0.0
+        target = p / 100 * self.count
+        seen = 0
+        for bucket, count in enumerate(self.buckets):
+            seen += count
+            if seen >= target and count:
+                return min((1 << bucket) / 1000, self.max_seconds * 1000)
+        return self.max_seconds * 1000
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            'count': self.count,
+            'mean_ms': 1000 * self.total_seconds / self.count if self.count else 0.0,
+            'p50_ms': self.percentile_ms(50),
+            'p99_ms': self.percentile_ms(99),
+            'max_ms': 1000 * self.max_seconds,
+            'buckets': {f"<={1 << i}us": n for i, n in enumerate(self.buckets) if n}
+        }
+
+class IOStats:
+    # Contadores acumulados desde la creación o el último reset()
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.counters: Dict[str, int] = {name: 0 for name in COUNTERS}
+        self.histograms: Dict[str, LatencyHistogram] = {}
+
+    def count(self, name: str, amount: int = 1):
+        self.counters[name] += amount
+
+    def record_latency(self, operation: str, seconds: float):
+        histogram = self.histograms.get(operation)
+        if histogram is None:
+            histogram = self.histograms[operation] = LatencyHistogram()
+        histogram.record(seconds)
+
+    @contextmanager
+    def timer(self, operation: str) -> Iterator[None]:
+        # Mide la duración del bloque y la agrega al histograma de `operation`
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_latency(operation, time.perf_counter() - start)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            'counters': dict(self.counters),
+            'latency': {operation: h.summary() for operation, h in self.histograms.items()}
+        }
@@ -0,0 +1,111 @@
+# Perfilado de una sola operación, determinista (cada llamada y retorno) o por muestreo (la pila
+# del hilo se lee a intervalos fijos desde otro hilo). El resultado se exporta como pilas
+# colapsadas para generar un flamegraph
+
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional
+
+DEFAULT_SAMPLE_INTERVAL = 0.001  # Segundos entre muestras
+PROFILE_MODES = ('deterministic', 'sampling')
+
+class ProfileResult:
+    # Valor retornado por la operación y pilas colapsadas con su peso
+    # (microsegundos propios en modo determinista, cantidad de muestras en modo muestreo)
+
+    def __init__(self, mode: str, value: Any, stacks: Counter, elapsed: float):
+        self.mode = mode
+        self.value = value
+        self.stacks = stacks
+        self.elapsed = elapsed
+
+    def collapsed(self) -> str:
+        return "\n".join(f"{stack} {int(weight)}" for stack, weight in sorted(self.stacks.items()) if weight >= 1)
+
+    def write_collapsed(self, path: str):
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(self.collapsed() + "\n")
+
+    def top(self, limit: int = 10) -> List[Dict[str, Any]]:
+        # Funciones con mayor peso propio (última entrada de cada pila)
+        own = Counter()
+        for stack, weight in self.stacks.items():
+            own[stack.rsplit(';', 1)[-1]] += weight
+        total = sum(own.values()) or 1
+        return [{'function': name, 'weight': weight, 'share': weight / total}
+                for name, weight in own.most_common(limit)]
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+def profile_call(function: Callable, *args, mode: str = 'deterministic',
+                 interval: float = DEFAULT_SAMPLE_INTERVAL, **kwargs) -> ProfileResult:
+    # Ejecuta function(*args, **kwargs) bajo el perfilador elegido
+    if mode == 'deterministic':
+        return _deterministic(function, args, kwargs)
+    if mode == 'sampling':
+        return _sampling(function, args, kwargs, interval)
+    raise ValueError(f"Modo de perfilado desconocido: {mode}")
+
+def _deterministic(function: Callable, args: tuple, kwargs: dict) -> ProfileResult:
+    # sys.setprofile registra cada llamada y retorno (también de funciones en C), de modo que el
+    # tiempo propio de cada pila es exacto aunque la ejecución se vuelve más lenta
+    stacks: Counter = Counter()
+    path: List[str] = []
+    marks: List[float] = []  # Inicio del tramo propio en curso de cada nivel de la pila
+    clock = time.perf_counter
+
+    def profiler(frame, event, arg):
+        now = clock()
+        if event in ('call', 'c_call'):
+            if path:
+                stacks[";".join(path)] += (now - marks[-1]) * 1_000_000
+            label = _frame_label(frame) if event == 'call' else f"{getattr(arg, '__qualname__', arg)} (C)"
+            path.append(label)
+            marks.append(clock())
+        elif event in ('return', 'c_return', 'c_exception') and path:
+            stacks[";".join(path)] += (now - marks[-1]) * 1_000_000
+            path.pop()
+            marks.pop()
+            if marks:
+                marks[-1] = clock()
+
+    start = time.perf_counter()
+    sys.setprofile(profiler)
+    try:
+        value = function(*args, **kwargs)
+    finally:
+        sys.setprofile(None)
+    elapsed = time.perf_counter() - start
+    return ProfileResult('deterministic', value, stacks, elapsed)
+
+def _sampling(function: Callable, args: tuple, kwargs: dict, interval: float) -> ProfileResult:
+    # Un hilo auxiliar toma la pila del hilo que ejecuta la operación cada `interval` segundos
+    stacks: Counter = Counter()
+    target = threading.get_ident()
+    done = threading.Event()
+
+    def sampler():
+        while not done.wait(interval):
+            frame = sys._current_frames().get(target)
+            labels = []
+            while frame is not None:
+                labels.append(_frame_label(frame))
+                frame = frame.f_back
+            if labels:
+                stacks[";".join(reversed(labels))] += 1
+
+    thread = threading.Thread(target=sampler, daemon=True)
+    start = time.perf_counter()
+    thread.start()
+    try:
+        value = function(*args, **kwargs)
+    finally:
+        done.set()
+        thread.join()
+    elapsed = time.perf_counter() - start
+    return ProfileResult('sampling', value, stacks, elapsed)
@@ -0,0 +1,116 @@
+# Spans de trazado para las rutas calientes (parseo de CSV, validación, serialización, escritura
+# y lectura de registros, inserción en AVL). Con el trazado desactivado span() devuelve un
+# contexto vacío compartido, así que el costo es una llamada a función
+
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_NULL_SPAN = _NullSpan()
+_tracer: Optional["Tracer"] = None
+
+class _Span:
+    __slots__ = ('tracer', 'name', 'start', 'children')
+
+    def __init__(self, tracer: "Tracer", name: str):
+        self.tracer = tracer
+        self.name = name
+
+    def __enter__(self):
+        self.children = 0.0
+        self.tracer._stack().append(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.start
+        stack = self.tracer._stack()
+        path = ";".join(span.name for span in stack)
+        stack.pop()
+        if stack:
+            stack[-1].children += elapsed
+        self.tracer._record(path, self.name, elapsed, elapsed - self.children)
+        return False
+
+class Tracer:
+    # Acumula por camino de spans ("load_csv;insert;write_record") la cantidad, el tiempo total
+    # y el tiempo propio (sin contar los spans hijos)
+
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.paths: Dict[str, List[float]] = defaultdict(lambda: [0, 0.0])  # camino -> [n, propio]
+        self.totals: Dict[str, List[float]] = defaultdict(lambda: [0, 0.0, 0.0])  # span -> [n, total, propio]
+
+    def span(self, name: str) -> _Span:
+        return _Span(self, name)
+
+    def _stack(self) -> List[_Span]:
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _record(self, path: str, name: str, elapsed: float, own: float):
+        with self._lock:
+            entry = self.paths[path]
+            entry[0] += 1
+            entry[1] += own
+            total = self.totals[name]
+            total[0] += 1
+            total[1] += elapsed
+            total[2] += own
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        # Por nombre de span: llamadas, tiempo total y propio en milisegundos
+        return {name: {'count': n, 'total_ms': 1000 * total, 'self_ms': 1000 * own,
+                       'mean_ms': 1000 * total / n if n else 0.0}
+                for name, (n, total, own) in sorted(self.totals.items(), key=lambda item: -item[1][1])}
+
+    def collapsed(self) -> str:
+        # Formato de pilas colapsadas (flamegraph.pl, speedscope): "a;b;c <microsegundos propios>"
+        return "\n".join(f"{path} {int(own * 1_000_000)}" for path, (_, own) in sorted(self.paths.items()))
+
+    def write_collapsed(self, path: str):
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(self.collapsed() + "\n")
+
+def span(name: str):
+    # Contexto que mide un tramo con nombre si el trazado está activo
+    tracer = _tracer
+    return tracer.span(name) if tracer is not None else _NULL_SPAN
+
+def enable_tracing() -> Tracer:
+    global _tracer
+    _tracer = Tracer()
+    return _tracer
+
+def disable_tracing() -> Optional[Tracer]:
+    global _tracer
+    tracer, _tracer = _tracer, None
+    return tracer
+
+def current_tracer() -> Optional[Tracer]:
+    return _tracer
+
+@contextmanager
+def tracing() -> Iterator[Tracer]:
+    # Activa el trazado durante el bloque y entrega el Tracer con los resultados
+    global _tracer
+    previous = _tracer
+    tracer = enable_tracing()
+    try:
+        yield tracer
+    finally:
+        _tracer = previous
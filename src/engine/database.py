@@ -0,0 +1,454 @@
+# Motor de base de datos sin interfaz gráfica: disco, catálogo, índices, carga de datos y búsquedas
+
+import os
+import sys
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Agregar el directorio src al path para importar módulos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_management.csv_loader import CSVLoader
+from data_management.data_validator import DataValidator
+from data_management.column_statistics import TableStatistics
+from data_management.schema_parser import SchemaParser
+from diagnostics.tracing import span
+from engine.snapshots import ReadView, VersionStore
+from indexing.avl_tree import AVL, Node
+from indexing.bulk_build import IndexColumn, build_indexes, column_pairs
+from query.planner import QueryPlanner, QueryResult
+from storage.catalog import Catalog, TableEntry
+from storage.disk import Disk, DiskGeometry, read_geometry
+from storage.record_cache import DEFAULT_CACHE_BYTES, RecordCache
+from storage.sector_manager import SectorManager
+from storage.serialization import RecordSerializer, create_serializer
+from storage.table_scan import Predicate, TableScan, STRING_TYPES
+from storage.volume import DEFAULT_STRIPE_UNIT, MirroredVolume, StripedVolume
+
+DEFAULT_DISK_FILE = "data/virtual_disk.bin"
+PROGRESS_EVERY = 100  # Registros entre cada aviso de progreso durante la carga
+
+class Database:
+    # Reúne disco, catálogo, índices AVL, carga de CSV y búsquedas. La interfaz gráfica y la
+    # línea de comandos son clientes de esta clase, que no depende de tkinter
+
+    def __init__(self, geometry: DiskGeometry, filename: str = DEFAULT_DISK_FILE,
+                 record_cache_bytes: int = DEFAULT_CACHE_BYTES, stripes: int = 1,
+                 stripe_unit: int = DEFAULT_STRIPE_UNIT, mirrors: int = 1, read_ahead: int = 0,
+                 format_version: Optional[int] = None):
+        # Con stripes > 1 los datos se reparten en franjas entre varios discos de `geometry`;
+        # con mirrors > 1 cada disco es una réplica completa. read_ahead es la ventana inicial de
+        # lectura anticipada en sectores (0 la desactiva). format_version elige el formato de
+        # fragmentos de un disco nuevo (por defecto, el actual; ver storage/record_format.py)
+        if stripes > 1 and mirrors > 1:
+            raise ValueError("Un volumen no puede ser en franjas y espejado a la vez")
+        if stripes > 1:
+            self.disk = StripedVolume(geometry, filename, stripes, stripe_unit)
+        elif mirrors > 1:
+            self.disk = MirroredVolume(geometry, filename, mirrors)
+        else:
+            self.disk = Disk(geometry, filename, format_version)
+        self.catalog = Catalog(self.disk)
+        self._serializers: Dict[str, RecordSerializer] = {}
+        self.record_cache = RecordCache(record_cache_bytes)  # Registros decodificados por dirección
+        self._watched_managers: Dict[str, SectorManager] = {}
+        self.versions = VersionStore()  # Versiones de las inserciones para las lecturas instantáneas
+        self.read_ahead = read_ahead
+
+    @classmethod
+    def open(cls, filename: str, **options) -> 'Database':
+        # Reabre una base existente sin indicar la geometría: sale del superbloque del disco, y
+        # el catálogo trae esquemas, extents, índices y estadísticas sin leer los registros
+        return cls(read_geometry(filename), filename, **options)
+
+    # ----------------------- Esquema -----------------------
+    def load_schema(self, schema_path: str) -> List[str]:
+        # Registra las tablas de un archivo CREATE TABLE; las que ya existen se conservan
+        schemas = SchemaParser().parse_schema_file_tables(schema_path)
+        return self._register_schemas(schemas)
+
+    def create_tables(self, sql: str) -> List[str]:
+        # Registra las tablas definidas en un texto SQL
+        return self._register_schemas(SchemaParser().parse_create_tables(sql))
+
+    def _register_schemas(self, schemas: List[Dict[str, Any]]) -> List[str]:
+        names = []
+        for schema in schemas:
+            if not self.catalog.has_table(schema['table_name']):
+                self.catalog.create_table(schema)
+            names.append(self.catalog.get_table(schema['table_name']).name)
+        return names
+
+    def table_names(self) -> List[str]:
+        return self.catalog.table_names()
+
+    def get_table(self, table: str) -> TableEntry:
+        return self.catalog.get_table(table)
+
+    def get_schema(self, table: str) -> Dict[str, Any]:
+        return self.catalog.get_table(table).schema
+
+    def get_sector_manager(self, table: str) -> SectorManager:
+        manager = self.catalog.get_sector_manager(table)
+        name = self.catalog.get_table(table).name
+        if self._watched_managers.get(name) is not manager:
+            # Las escrituras y liberaciones de la tabla invalidan su entrada en la caché de registros
+            manager.add_listener(lambda sector, offset: self.record_cache.invalidate((name, sector, offset)))
+            # Las tablas comprimidas ya guardan en memoria el último grupo leído
+            if self.read_ahead and self.catalog.get_table(table).compression is None:
+                manager.enable_read_ahead(self.read_ahead)
+            self._watched_managers[name] = manager
+        return manager
+
+    def get_serializer(self, table: str) -> RecordSerializer:
+        entry = self.catalog.get_table(table)
+        if entry.name not in self._serializers:
+            self._serializers[entry.name] = create_serializer(entry.schema)
+        return self._serializers[entry.name]
+
+    # ----------------------- Carga de datos -----------------------
+    def load_csv(self, table: str, csv_path: str,
+                 progress: Optional[Callable[[str], None]] = None,
+                 defer_indexes: bool = False, index_workers: Optional[int] = None) -> int:
+        # Valida el CSV contra el esquema, escribe los registros al disco y los indexa.
+        # `progress` recibe mensajes de avance. Con defer_indexes los índices secundarios se
+        # arman al final, en bloque y en `index_workers` procesos (ver build_indexes).
+        # Retorna la cantidad de registros escritos
+        notify = progress or (lambda message: None)
+        schema = self.get_schema(table)
+        with span('load_csv'):
+            notify("Validando estructura del CSV...")
+            with span('csv_parse'):
+                data = CSVLoader().load_csv(csv_path)
+
+            notify("Validando datos contra esquema...")
+            with span('validate'):
+                validated_data = DataValidator().validate_data(data, schema)
+            notify(f"Se cargaron {len(validated_data)} registros válidos")
+            if self.get_table(table).clustered is not None:
+                # Carga ordenada: cada registro va al final de la última página
+                primary_key = schema['primary_key']
+                validated_data.sort(key=lambda record: (record[primary_key] is None, record[primary_key]))
+
+            notify("Escribiendo datos al disco...")
+            records_written = self.load_records(table, validated_data, notify, defer_indexes, index_workers)
+
+            with span('save_catalog'):
+                self.save()
+        return records_written
+
+    def load_records(self, table: str, records: Iterable[Dict[str, Any]],
+                     progress: Optional[Callable[[str], None]] = None,
+                     defer_indexes: bool = False, index_workers: Optional[int] = None) -> int:
+        # Inserta registros ya validados a medida que llegan (pueden venir de un generador).
+        # Retorna la cantidad de registros escritos
+        notify = progress or (lambda message: None)
+        schema = self.get_schema(table)
+        if defer_indexes and self.get_table(table).clustered is not None:
+            # Las divisiones de página cambian direcciones ya extraídas para los índices
+            raise ValueError("Las tablas agrupadas no admiten índices diferidos")
+        records_written = 0
+        if defer_indexes:
+            entry, columns, versions = self._detach_secondary_indexes(table)
+        try:
+            for record in records:
+                address = self.insert(table, record, secondary_indexes=not defer_indexes)
+                records_written += 1
+                if defer_indexes:
+                    versions[address] = self.versions.committed
+                    for field in schema['fields']:
+                        key = self._index_key(field, record[field['name']])
+                        if field['name'] in columns and key is not None:
+                            columns[field['name']].append((key, address))
+                if records_written % PROGRESS_EVERY == 0:
+                    notify(f"Procesados {records_written} registros...")
+        finally:
+            if defer_indexes:
+                notify("Construyendo índices secundarios...")
+                with span('build_indexes'):
+                    self._attach_secondary_indexes(entry, build_indexes(columns, index_workers), columns, versions)
+        return records_written
+
+    def insert(self, table: str, record: Dict[str, Any], secondary_indexes: bool = True) -> Tuple[int, int]:
+        # Escribe un registro ya validado y lo agrega al índice primario y, salvo que se
+        # construyan después en bloque, a los secundarios
+        with span('insert'):
+            entry = self.catalog.get_table(table)
+            with span('serialize'):
+                serialized_record = self.get_serializer(table).serialize_record(record, entry.schema)
+            manager = self.get_sector_manager(table)
+            if entry.clustered is not None:
+                address, moves = manager.insert_record(record[entry.schema['primary_key']], serialized_record)
+                for old_address, new_address, data in moves:
+                    self._relocate(entry, old_address, new_address, data)
+            else:
+                address = manager.write_record(serialized_record)
+            version = self.versions.begin_write()
+            with span('avl_insert'):
+                self.versions.stamp(entry.primary_index, address, version)
+                entry.primary_index.insert(record[entry.schema['primary_key']], address)
+                for field in (entry.schema['fields'] if secondary_indexes else ()):
+                    avl = entry.secondary_indexes.get(field['name'])
+                    key = self._index_key(field, record[field['name']])
+                    if avl is not None and key is not None:
+                        self.versions.stamp(avl, address, version)
+                        avl.insert(key, address)
+            self.versions.commit(version)
+            entry.row_count += 1
+            if entry.statistics is None:
+                entry.statistics = TableStatistics(entry.schema)
+            with span('statistics'):
+                entry.statistics.add(record)
+        return address
+
+    def _detach_secondary_indexes(self, table: str) -> Tuple[TableEntry, Dict[str, IndexColumn], Dict[Tuple[int, int], int]]:
+        # Quita los índices secundarios mientras dura una carga con índices diferidos (las
+        # búsquedas recorren la tabla) y retorna sus pares actuales para reconstruirlos
+        entry = self.catalog.get_table(table)
+        columns = {name: column_pairs(avl) for name, avl in entry.secondary_indexes.items()}
+        entry.secondary_indexes = {}
+        return entry, columns, {}
+
+    def _attach_secondary_indexes(self, entry: TableEntry, built: Dict[str, AVL],
+                                  columns: Dict[str, IndexColumn], versions: Dict[Tuple[int, int], int]):
+        # Coloca todos los índices construidos de una vez. Las entradas que una vista abierta
+        # todavía no debe ver se marcan con su versión antes de quedar alcanzables
+        oldest = self.versions.oldest_view()
+        if oldest is not None:
+            for name, avl in built.items():
+                for _, address in columns[name]:
+                    version = versions.get(address, 0)
+                    if version > oldest:
+                        self.versions.stamp(avl, address, version)
+        entry.secondary_indexes = built
+        self.versions.collect()
+
+    def snapshot(self) -> ReadView:
+        # Vista de solo lectura con las inserciones confirmadas hasta ahora; otro hilo puede
+        # seguir cargando mientras tanto. Cerrarla (o usarla con `with`) libera las versiones viejas
+        return ReadView(self)
+
+    def _relocate(self, entry: TableEntry, old_address: Tuple[int, int], new_address: Tuple[int, int], data: bytes):
+        # Actualiza los índices de un registro que cambió de lugar al reescribir una página agrupada
+        record = self.get_serializer(entry.name).deserialize_record(data, entry.schema)
+        nodes = [entry.primary_index.search(record[entry.schema['primary_key']])]
+        for field in entry.schema['fields']:
+            avl = entry.secondary_indexes.get(field['name'])
+            key = self._index_key(field, record[field['name']])
+            if avl is not None and key is not None:
+                nodes.append(avl.search(key))
+        for node in nodes:
+            if node is not None and old_address in node.addresses:
+                node.addresses[node.addresses.index(old_address)] = new_address
+
+    def save(self):
+        # Persiste el catálogo (esquemas, extents e índices)
+        self.catalog.save()
+
+    # ----------------------- Búsquedas -----------------------
+    def parse_value(self, table: str, field_name: str, text: str) -> Any:
+        # Convierte el texto ingresado por el usuario al tipo del campo (como se guarda en el índice)
+        field = self._field(table, field_name)
+        field_type = field['type']
+        if 'INT' in field_type:
+            try:
+                return int(text)
+            except ValueError:
+                return text
+        if field_type in ('DECIMAL', 'FLOAT', 'DOUBLE'):
+            try:
+                return float(text)
+            except ValueError:
+                return text
+        if field_type in ('BOOLEAN', 'BOOL'):
+            value_lower = text.strip().lower()
+            if value_lower in ('true', '1', 'yes'):
+                return True
+            if value_lower in ('false', '0', 'no'):
+                return False
+            return text
+        # Para strings, minúsculas para coincidir con los valores indexados
+        return text.strip().lower()
+
+    def search(self, table: str, field_name: str, value: Any) -> Dict[str, Any]:
+        # Busca los registros con field_name = value. Usa el índice del campo si está poblado y
+        # si no recorre la tabla. Retorna el método usado y, por cada coincidencia, su dirección,
+        # su ubicación física y el registro decodificado
+        with self.disk.stats.timer('search'):
+            field = self._field(table, field_name)
+            key = self._index_key(field, value)
+            avl = self.catalog.get_table(table).secondary_indexes.get(field_name)
+            if avl is not None and avl.root is not None:
+                node = self.index_search(avl, key)
+                addresses = list(node.addresses) if node else []
+                matches = list(zip(addresses, self.read_records(table, addresses)))
+                method = 'index'
+            else:
+                predicate = Predicate(field_name, '=', key, ignore_case=field['type'] in STRING_TYPES)
+                matches = list(self.scan(table, [predicate]))
+                method = 'scan'
+        return {
+            'method': method,
+            'key': key,
+            'results': [{'address': address,
+                         'physical_location': self.physical_location(table, address),
+                         'record': record} for address, record in matches]
+        }
+
+    def lookup_many(self, table: str, field_name: str, values: Iterable[Any]) -> Dict[Any, List[Dict[str, Any]]]:
+        # Busca varios valores de un campo a la vez: las claves se resuelven en una pasada ordenada
+        # por el índice y los registros se leen juntos con read_records. Sin índice poblado se hace
+        # un único recorrido de la tabla. Retorna, por cada valor pedido, sus registros
+        field = self._field(table, field_name)
+        keys = {value: self._index_key(field, value) for value in set(values)}
+        avl = self.catalog.get_table(table).secondary_indexes.get(field_name)
+        if avl is None or avl.root is None:
+            wanted = set(keys.values())
+            by_key: Dict[Any, List[Dict[str, Any]]] = {key: [] for key in wanted}
+            for _, record in self.scan(table):
+                key = self._index_key(field, record.get(field_name))
+                if key in wanted:
+                    by_key[key].append(record)
+            return {value: [dict(record) for record in by_key[key]] for value, key in keys.items()}
+        addresses_by_key = {}
+        for key in sorted(set(keys.values())):
+            node = self.index_search(avl, key)
+            addresses_by_key[key] = list(node.addresses) if node else []
+        needed = sorted({address for addresses in addresses_by_key.values() for address in addresses})
+        records = dict(zip(needed, self.read_records(table, needed)))
+        return {value: [dict(records[address]) for address in addresses_by_key[key]]
+                for value, key in keys.items()}
+
+    def index_search(self, avl: AVL, key: Any) -> Optional[Node]:
+        # Búsqueda en un índice AVL contando los nodos visitados
+        visited = avl.nodes_visited
+        node = avl.search(key)
+        self.disk.stats.count('index_nodes_visited', avl.nodes_visited - visited)
+        return node
+
+    def index_range(self, avl: AVL, *bounds) -> List[Node]:
+        # Búsqueda por rango en un índice AVL contando los nodos visitados
+        visited = avl.nodes_visited
+        nodes = avl.range_search(*bounds)
+        self.disk.stats.count('index_nodes_visited', avl.nodes_visited - visited)
+        return nodes
+
+    def query(self, sql: str) -> QueryResult:
+        # Ejecuta un SELECT: [EXPLAIN] SELECT cols FROM tabla [WHERE ...] [ORDER BY ...] [LIMIT n]
+        with self.disk.stats.timer('query'):
+            return QueryPlanner(self).run(sql)
+
+    def explain(self, result: QueryResult) -> str:
+        # Describe el plan de una consulta ya ejecutada con lecturas de sector estimadas y reales
+        return QueryPlanner(self).explain(result)
+
+    def read_record(self, table: str, address: Tuple[int, int]) -> Dict[str, Any]:
+        # Registro decodificado en `address`; si está en la caché no hay E/S ni decodificación
+        key = (self.catalog.get_table(table).name,) + tuple(address)
+        record = self.record_cache.get(key)
+        if record is not None:
+            return record
+        return self._fetch_record(table, key, tuple(address))
+
+    def _fetch_record(self, table: str, key: Tuple, address: Tuple[int, int]) -> Dict[str, Any]:
+        # Lee y decodifica un registro que no está en la caché y lo guarda en ella
+        data = self.get_sector_manager(table).read_record(*address)
+        with span('deserialize'):
+            record = self.get_serializer(table).deserialize_record(data, self.get_schema(table))
+        self.record_cache.put(key, record)
+        return record
+
+    def read_records(self, table: str, addresses: Iterable[Tuple[int, int]]) -> List[Dict[str, Any]]:
+        # Registros decodificados de varias direcciones, en el orden pedido. Los que no están en la
+        # caché se leen juntos en orden físico (SectorManager.read_records)
+        name = self.catalog.get_table(table).name
+        addresses = [tuple(address) for address in addresses]
+        records: Dict[Tuple[int, int], Dict[str, Any]] = {}
+        missing = []
+        for address in dict.fromkeys(addresses):
+            record = self.record_cache.get((name,) + address)
+            if record is None:
+                missing.append(address)
+            else:
+                records[address] = record
+        if len(missing) == 1:
+            records[missing[0]] = self._fetch_record(table, (name,) + missing[0], missing[0])
+        elif missing:
+            data = self.get_sector_manager(table).read_records(missing)
+            serializer = self.get_serializer(table)
+            schema = self.get_schema(table)
+            with span('deserialize'):
+                for address in missing:
+                    record = serializer.deserialize_record(data[address], schema)
+                    self.record_cache.put((name,) + address, record)
+                    records[address] = record
+        return [records[address] for address in addresses]
+
+    def scan(self, table: str, predicates: Iterable[Predicate] = ()) -> Iterator[Tuple[Tuple[int, int], Dict[str, Any]]]:
+        # Recorrido completo de la tabla en orden físico
+        return TableScan(self.get_sector_manager(table), self.get_schema(table),
+                         self.get_serializer(table)).scan(predicates)
+
+    def physical_location(self, table: str, address: Tuple[int, int]) -> Optional[Dict[str, int]]:
+        # Coordenadas físicas (plato, superficie, pista, sector) de la dirección de un registro.
+        # None si el registro está en un grupo comprimido que todavía no se escribió al disco
+        sector = self.get_sector_manager(table).physical_sector(address[0])
+        if sector is None:
+            return None
+        return self.disk._get_physical_location(sector)
+
+    def index_sample(self, table: str, field_name: str, limit: int = 5) -> List[Any]:
+        # Primeros valores del índice de un campo (para mostrar cuando no hay coincidencias)
+        avl = self.catalog.get_table(table).secondary_indexes.get(field_name)
+        if avl is None or avl.root is None:
+            return []
+        return [node.value for node in avl.get_all_nodes()[:limit]]
+
+    # ----------------------- Estado -----------------------
+    def io_stats(self) -> Dict[str, Any]:
+        # Contadores de E/S e histogramas de latencia desde la apertura o el último reset
+        stats = self.disk.stats.snapshot()
+        stats['record_cache'] = self.record_cache.stats()
+        return stats
+
+    def reset_io_stats(self):
+        self.disk.stats.reset()
+        self.record_cache.reset_stats()
+
+    def status(self) -> Dict[str, Any]:
+        # Estado del disco y resumen de cada tabla del catálogo
+        status = self.disk.get_disk_status()
+        tables = []
+        for entry in self.catalog.tables.values():
+            info = {
+                'name': entry.name,
+                'primary_key': entry.schema['primary_key'],
+                'record_size': entry.schema['record_size'],
+                'row_format': entry.schema.get('row_format', 'FIXED'),
+                'organization': entry.schema.get('organization', 'HEAP'),
+                'allocated_sectors': entry.allocated_sectors,
+                'extents': list(entry.extents)
+            }
+            if entry.statistics is not None:
+                info['statistics'] = entry.statistics.summary()
+            if entry.compression is not None:
+                info['compression'] = self.get_sector_manager(entry.name).get_compression_stats()
+            if entry.clustered is not None:
+                info['clustering'] = self.get_sector_manager(entry.name).get_clustering_stats()
+            if self.read_ahead and entry.compression is None:
+                info['read_ahead'] = self.get_sector_manager(entry.name).read_ahead.report()
+            tables.append(info)
+        status['tables'] = tables
+        status['record_cache'] = self.record_cache.stats()
+        return status
+
+    def _field(self, table: str, field_name: str) -> Dict[str, Any]:
+        field = next((f for f in self.get_schema(table)['fields'] if f['name'] == field_name), None)
+        if field is None:
+            raise ValueError(f"Campo desconocido: {field_name}")
+        return field
+
+    def _index_key(self, field: Dict[str, Any], value: Any) -> Any:
+        # Para campos de tipo string, convertir a minúsculas para consistencia en búsquedas
+        if field['type'] in ('CHAR', 'VARCHAR', 'TEXT'):
+            return str(value).lower() if value else ""
+        return value
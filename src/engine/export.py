@@ -0,0 +1,139 @@
+# Exportación masiva de una tabla, o de las filas que cumplen condiciones, a CSV o al archivo
+# columnar de storage/columnar_file.py. Las filas salen en orden físico y se procesan por bloques:
+# en las tablas de longitud fija (con NumPy instalado) cada bloque de sectores se decodifica de una
+# vez como arreglo estructurado, las condiciones se evalúan sobre las columnas y los valores pasan
+# a listas sin armar un diccionario por fila. Las demás tablas se exportan con el recorrido de la
+# tabla. En memoria queda un solo bloque
+
+import csv
+import os
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from storage.columnar_file import ColumnarWriter
+from storage.record_arrays import RecordArrayScanner, np
+from storage.table_scan import Predicate, STRING_TYPES
+from .database import Database
+
+EXPORT_FORMATS = ('csv', 'columnar')
+EXPORT_BLOCK_ROWS = 65536  # Filas por bloque (y por bloque del archivo columnar)
+
+def _compare(operator: str, values: "np.ndarray", low: Any, high: Any) -> "np.ndarray":
+    if operator == '=':
+        return values == low
+    if operator == '<':
+        return values < low
+    if operator == '>':
+        return values > low
+    if operator == '<=':
+        return values <= low
+    if operator == '>=':
+        return values >= low
+    return (values >= low) & (values <= high)
+
+def _predicate_mask(predicate: Predicate, field: Dict[str, Any], column: "np.ndarray") -> "np.ndarray":
+    # Evalúa el predicado sobre una columna entera con la misma semántica que Predicate.compile
+    if field['type'] not in STRING_TYPES:
+        if predicate.operator == 'PREFIX':
+            raise ValueError(f"PREFIX solo aplica a campos de texto, no a {field['type']}")
+        return _compare(predicate.operator, column, predicate.value, predicate.upper)
+    # Texto: NumPy ya quita los ceros finales, así que los NULL quedan como b''
+    values = np.char.rstrip(column, b' ')
+    if predicate.ignore_case:
+        values = np.char.lower(values)
+    low = predicate._encode(predicate.value)
+    if predicate.operator == 'PREFIX':
+        mask = np.char.startswith(values, low)
+    else:
+        high = predicate._encode(predicate.upper) if predicate.upper is not None else None
+        mask = _compare(predicate.operator, values, low, high)
+    return mask & (column != b'')
+
+def _array_blocks(db: Database, table: str, predicates: List[Predicate],
+                  block_rows: int) -> Iterator[Dict[str, List[Any]]]:
+    # Bloques decodificados con np.frombuffer y filtrados con máscaras sobre las columnas
+    schema = db.get_schema(table)
+    manager = db.get_sector_manager(table)
+    fields = {f['name']: f for f in schema['fields']}
+    for predicate in predicates:
+        if predicate.field not in fields:
+            raise ValueError(f"Campo desconocido: {predicate.field}")
+    sector_size = manager.disk.sector_size
+    batch_sectors = max(1, -(-block_rows * schema['record_size'] // sector_size))
+    for batch in RecordArrayScanner(manager, schema).iter_batches(batch_sectors=batch_sectors):
+        if predicates:
+            mask = np.ones(len(batch), dtype=bool)
+            for predicate in predicates:
+                mask &= _predicate_mask(predicate, fields[predicate.field], batch[predicate.field])
+            batch = batch[mask]
+            if len(batch) == 0:
+                continue
+        block = {}
+        for name, field in fields.items():
+            column = batch[name]
+            if field['type'] in STRING_TYPES:
+                values = np.char.decode(np.char.rstrip(column, b' '), 'utf-8').tolist()
+                for i in np.flatnonzero(column == b'').tolist():
+                    values[i] = None
+                block[name] = values
+            else:
+                block[name] = column.tolist()
+        yield block
+
+def _record_blocks(db: Database, table: str, predicates: List[Predicate],
+                   block_rows: int) -> Iterator[Dict[str, List[Any]]]:
+    # Bloques armados con el recorrido de la tabla (registros de longitud variable o sin NumPy)
+    names = [f['name'] for f in db.get_schema(table)['fields']]
+    block: Dict[str, List[Any]] = {name: [] for name in names}
+    rows = 0
+    for _, record in db.scan(table, predicates):
+        for name in names:
+            block[name].append(record[name])
+        rows += 1
+        if rows == block_rows:
+            yield block
+            block = {name: [] for name in names}
+            rows = 0
+    if rows:
+        yield block
+
+def export_table(db: Database, table: str, output: str, fmt: str = 'csv',
+                 predicates: Iterable[Predicate] = (), block_rows: int = EXPORT_BLOCK_ROWS,
+                 progress: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
+    # Escribe en `output` las filas de `table` que cumplen los predicados, en orden físico.
+    # Retorna las filas y bloques escritos, el tamaño del archivo y el método de lectura
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Formato de exportación desconocido: {fmt} (use {' o '.join(EXPORT_FORMATS)})")
+    notify = progress or (lambda message: None)
+    schema = db.get_schema(table)
+    names = [f['name'] for f in schema['fields']]
+    predicates = list(predicates)
+    use_arrays = np is not None and schema.get('row_format', 'FIXED') == 'FIXED'
+    blocks = (_array_blocks if use_arrays else _record_blocks)(db, table, predicates, block_rows)
+
+    rows = 0
+    written_blocks = 0
+    if fmt == 'csv':
+        with open(output, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(names)
+            for block in blocks:
+                writer.writerows(zip(*(block[name] for name in names)))
+                rows += len(block[names[0]])
+                written_blocks += 1
+                notify(f"Exportadas {rows} filas...")
+    else:
+        with ColumnarWriter(output, schema['table_name'], schema['fields']) as writer:
+            for block in blocks:
+                writer.write_block(block)
+                rows += len(block[names[0]])
+                written_blocks += 1
+                notify(f"Exportadas {rows} filas...")
+    return {
+        'table': schema['table_name'],
+        'format': fmt,
+        'output': output,
+        'rows_written': rows,
+        'blocks': written_blocks,
+        'bytes': os.path.getsize(output),
+        'method': 'arrays' if use_arrays else 'records'
+    }
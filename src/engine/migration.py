@@ -0,0 +1,50 @@
+# Migración de un disco a otro formato de fragmentos (por ejemplo, del formato 1 con sectores de
+# 16 bits al actual con sectores de 32 bits). Cada tabla se copia en orden físico a un disco
+# nuevo, que puede tener otra geometría: los registros se leen por bloques con el recorrido de la
+# tabla y se escriben a medida que llegan, sin cargar la tabla en memoria. Como el encabezado de
+# los fragmentos cambia de tamaño las direcciones cambian, así que los índices se arman de nuevo
+# (los secundarios en bloque al terminar cada tabla)
+
+import os
+from typing import Any, Callable, Dict, Optional
+
+from storage.disk import DiskGeometry
+from storage.record_format import CURRENT_FORMAT
+from .database import Database
+
+def migrate_database(source: Database, target_path: str, target_geometry: Optional[DiskGeometry] = None,
+                     progress: Optional[Callable[[str], None]] = None,
+                     index_workers: Optional[int] = None) -> Dict[str, Any]:
+    # Copia todas las tablas de `source` a un disco nuevo en `target_path` con el formato actual.
+    # Retorna las filas copiadas por tabla y los sectores usados antes y después
+    notify = progress or (lambda message: None)
+    version = source.disk.record_format.version
+    if version == CURRENT_FORMAT.version:
+        raise ValueError(f"El disco {source.disk.filename} ya usa el formato {version}")
+    if os.path.exists(target_path):
+        raise ValueError(f"El disco destino {target_path} ya existe")
+    target = Database(target_geometry or source.disk.geometry, target_path, record_cache_bytes=0)
+
+    tables: Dict[str, int] = {}
+    for name in source.table_names():
+        entry = source.get_table(name)
+        copy = target.catalog.create_table(entry.schema, entry.extent_sectors)
+        if entry.compression is not None:
+            copy.compression.group_sectors = entry.compression.group_sectors
+        if entry.clustered is not None:
+            # El recorrido de una tabla agrupada sale en orden de clave: cada fila va al final
+            copy.clustered.page_sectors = entry.clustered.page_sectors
+            copy.clustered.fill_factor = entry.clustered.fill_factor
+        notify(f"Copiando {name}...")
+        records = (record for _, record in source.scan(name))
+        tables[name] = target.load_records(name, records, notify, defer_indexes=entry.clustered is None,
+                                           index_workers=index_workers)
+    target.save()
+    return {
+        'source_format': version,
+        'target_format': target.disk.record_format.version,
+        'target': target_path,
+        'tables': tables,
+        'used_sectors_before': source.disk.sector_map.extents.used_count,
+        'used_sectors_after': target.disk.sector_map.extents.used_count
+    }
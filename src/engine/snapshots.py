@@ -0,0 +1,262 @@
+# Lecturas instantáneas (snapshot isolation) mientras otro hilo carga datos. Cada inserción recibe
+# un número de versión y sus entradas de índice quedan marcadas con él hasta que ningún lector
+# abierto antes pueda necesitar la marca. Una ReadView abierta con la versión T fija las raíces
+# de los índices que consulta (el escritor pasa a copiar el camino de cada inserción), ignora las
+# entradas con versión mayor que T y fija el mapa de sectores con copia de páginas al escribir.
+# El escritor nunca espera a los lectores
+
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from indexing.avl_tree import AVL, Node
+from storage.free_extents import SectorMapSnapshot
+from storage.table_scan import Predicate
+
+SNAPSHOT_READ_BATCH = 256  # Direcciones leídas juntas por los recorridos de una vista
+
+class VersionStore:
+    # Versión confirmada, marcas de versión de las entradas de índice recientes y lectores
+    # abiertos. Un solo escritor: begin_write / stamp / commit se llaman desde el hilo que carga
+
+    def __init__(self):
+        self.committed = 0
+        self._stamps: Dict[Tuple[int, Tuple[int, int]], int] = {}  # (índice, dirección) -> versión
+        self._log: Deque[Tuple[int, Tuple[int, Tuple[int, int]]]] = deque()  # En orden de versión
+        self._views: Dict[int, int] = {}  # id de vista -> versión
+        self._horizon: Optional[int] = None  # Versión más vieja que un lector puede pedir
+        self._lock = threading.Lock()      # Solo entre lectores
+        self._gc_lock = threading.Lock()   # El escritor no espera: si está tomado, no recolecta
+        self.collected = 0
+
+    # ----------------------- Escritor -----------------------
+    def begin_write(self) -> int:
+        return self.committed + 1
+
+    def stamp(self, index: AVL, address: Tuple[int, int], version: int):
+        # Se marca antes de insertar en el índice, así ningún lector ve la entrada sin marca
+        key = (id(index), tuple(address))
+        self._stamps[key] = version
+        self._log.append((version, key))
+
+    def commit(self, version: int):
+        self.committed = version
+        self.collect()
+
+    # ----------------------- Lectores -----------------------
+    def open(self, view: 'ReadView') -> int:
+        with self._lock:
+            version = self.committed
+            self._views[id(view)] = version
+            self._horizon = min(self._views.values())
+        return version
+
+    def close(self, view: 'ReadView'):
+        with self._lock:
+            self._views.pop(id(view), None)
+            self._horizon = min(self._views.values()) if self._views else None
+        self.collect()
+
+    def oldest_view(self) -> Optional[int]:
+        # Versión de la vista abierta más vieja, o None si no hay vistas
+        return self._horizon
+
+    def visible(self, index: AVL, address: Tuple[int, int], version: int) -> bool:
+        stamp = self._stamps.get((id(index), address))
+        return stamp is None or stamp <= version
+
+    def collect(self):
+        # Descarta las marcas que ya todos los lectores ven: sin lectores, todas las confirmadas
+        if not self._gc_lock.acquire(blocking=False):
+            return
+        try:
+            # La versión confirmada y el horizonte se leen juntos bajo el candado de lectores: una
+            # vista que se está abriendo ya publicó su versión o verá la confirmada. Si un lector
+            # tiene el candado, la recolección queda para la próxima vez
+            if not self._lock.acquire(blocking=False):
+                return
+            try:
+                horizon, committed = self._horizon, self.committed
+            finally:
+                self._lock.release()
+            limit = min(committed, horizon) if horizon is not None else committed
+            log = self._log
+            while log and log[0][0] <= limit:
+                version, key = log.popleft()
+                if self._stamps.get(key) == version:
+                    del self._stamps[key]
+                    self.collected += 1
+        finally:
+            self._gc_lock.release()
+
+    def stats(self) -> Dict[str, Any]:
+        return {'committed': self.committed, 'open_views': len(self._views),
+                'stamps': len(self._stamps), 'collected': self.collected}
+
+class ReadView:
+    # Vista de solo lectura de la base en la versión confirmada al abrirla. Ofrece las mismas
+    # búsquedas que Database (search, lookup_many, query) y un recorrido en orden físico; los
+    # registros se leen del disco sin pasar por la caché compartida. Se usa como contexto:
+    #     with db.snapshot() as view: view.query("SELECT ...")
+
+    def __init__(self, db):
+        self.db = db
+        self._store: VersionStore = db.versions
+        self._roots: Dict[int, Tuple[AVL, Optional[Node]]] = {}
+        self.version = self._store.open(self)
+        # Extents de cada tabla al abrir la vista (el escritor solo agrega al final)
+        self._extents: Dict[str, List[Tuple[int, int]]] = {
+            name: list(db.get_table(name).extents) for name in db.table_names()}
+        self.sector_map: SectorMapSnapshot = db.disk.sector_map.pin()
+        self.closed = False
+
+    def __enter__(self) -> 'ReadView':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def close(self):
+        # Suelta las raíces y el mapa fijados; las marcas de versión se recolectan
+        if self.closed:
+            return
+        self.closed = True
+        with self._store._lock:
+            for avl, _ in self._roots.values():
+                avl.readers -= 1
+        self._roots.clear()
+        self.sector_map.release()
+        self._store.close(self)
+
+    def __getattr__(self, name: str) -> Any:
+        # Esquemas, conversión de valores, disco y ubicación física vienen de la base
+        return getattr(self.db, name)
+
+    # ----------------------- Índices fijados -----------------------
+    def _root(self, avl: AVL) -> Optional[Node]:
+        # Raíz del índice fijada en la primera consulta. Las entradas insertadas después quedan
+        # con versión mayor que la de la vista y se filtran
+        if self.closed:
+            raise ValueError("La vista de lectura está cerrada")
+        pinned = self._roots.get(id(avl))
+        if pinned is not None:
+            return pinned[1]
+        with self._store._lock:
+            avl.readers += 1
+        while True:
+            seen = avl.modifications
+            if seen % 2 == 0:
+                root = avl.root
+                if avl.modifications == seen:
+                    break
+            time.sleep(0)
+        self._roots[id(avl)] = (avl, root)
+        return root
+
+    def _visible(self, avl: AVL, node: Optional[Node]) -> Optional[Node]:
+        # Copia del nodo con solo las direcciones visibles en la versión de la vista
+        if node is None:
+            return None
+        addresses = [a for a in node.addresses if self._store.visible(avl, a, self.version)]
+        if not addresses:
+            return None
+        visible = node.copy()
+        visible.addresses = addresses
+        return visible
+
+    def index_search(self, avl: AVL, key: Any) -> Optional[Node]:
+        visited = avl.nodes_visited
+        node = avl._search_recursive(self._root(avl), key)
+        self.db.disk.stats.count('index_nodes_visited', avl.nodes_visited - visited)
+        return self._visible(avl, node)
+
+    def index_range(self, avl: AVL, low: Any = None, high: Any = None,
+                    include_low: bool = True, include_high: bool = True) -> List[Node]:
+        nodes: List[Node] = []
+        visited = avl.nodes_visited
+        avl._range_collect(self._root(avl), low, high, include_low, include_high, nodes)
+        self.db.disk.stats.count('index_nodes_visited', avl.nodes_visited - visited)
+        return [v for v in (self._visible(avl, node) for node in nodes) if v is not None]
+
+    def get_table(self, table: str):
+        entry = self.db.get_table(table)
+        if entry.clustered is not None or entry.compression is not None:
+            # Las páginas agrupadas y los grupos comprimidos se reescriben en el mismo lugar
+            raise ValueError(f"La tabla {entry.name} no admite lecturas instantáneas "
+                             f"(ORGANIZATION=CLUSTERED o COMPRESSION)")
+        return entry
+
+    def get_schema(self, table: str) -> Dict[str, Any]:
+        return self.get_table(table).schema
+
+    # ----------------------- Lectura de registros -----------------------
+    def read_records(self, table: str, addresses: Iterable[Tuple[int, int]]) -> List[Dict[str, Any]]:
+        # Registros visibles en orden pedido. Un registro confirmado no vuelve a escribirse, así
+        # que sus bytes se leen sin coordinar con el escritor
+        entry = self.get_table(table)
+        addresses = [tuple(address) for address in addresses]
+        if not addresses:
+            return []
+        data = self.db.get_sector_manager(table).read_records(addresses)
+        serializer = self.db.get_serializer(table)
+        return [serializer.deserialize_record(data[address], entry.schema) for address in addresses]
+
+    def scan(self, table: str, predicates: Iterable[Predicate] = ()) -> Iterator[Tuple[Tuple[int, int], Dict[str, Any]]]:
+        # Recorrido de las filas visibles en orden físico: las direcciones salen del índice
+        # primario fijado, no de los sectores, que el escritor sigue llenando
+        entry = self.get_table(table)
+        predicates = list(predicates)
+        avl = entry.primary_index
+        nodes: List[Node] = []
+        avl._inorder_collect(self._root(avl), nodes)
+        addresses = sorted(a for node in nodes for a in node.addresses
+                           if self._store.visible(avl, a, self.version))
+        for i in range(0, len(addresses), SNAPSHOT_READ_BATCH):
+            batch = addresses[i:i + SNAPSHOT_READ_BATCH]
+            for address, record in zip(batch, self.read_records(table, batch)):
+                if all(p.matches(record) for p in predicates):
+                    yield address, record
+
+    def row_count(self, table: str) -> int:
+        entry = self.get_table(table)
+        avl = entry.primary_index
+        nodes: List[Node] = []
+        avl._inorder_collect(self._root(avl), nodes)
+        return sum(1 for node in nodes for a in node.addresses if self._store.visible(avl, a, self.version))
+
+    # ----------------------- Búsquedas -----------------------
+    # Las búsquedas de Database se ejecutan sobre la vista: usan sus index_search, index_range,
+    # read_records y scan
+    def search(self, table: str, field_name: str, value: Any) -> Dict[str, Any]:
+        return type(self.db).search(self, table, field_name, value)
+
+    def lookup_many(self, table: str, field_name: str, values: Iterable[Any]) -> Dict[Any, List[Dict[str, Any]]]:
+        return type(self.db).lookup_many(self, table, field_name, values)
+
+    def query(self, sql: str):
+        return type(self.db).query(self, sql)
+
+    def status(self) -> Dict[str, Any]:
+        # Filas visibles y sectores ocupados en la versión de la vista
+        sector_map = self.sector_map
+        tables = []
+        for name in self.db.table_names():
+            entry = self.db.get_table(name)
+            if entry.clustered is not None or entry.compression is not None:
+                continue
+            # Los extents se marcan ocupados al asignarse: los asignados después de abrir la vista
+            # figuran libres en el mapa fijado
+            tables.append({
+                'name': name,
+                'rows': self.row_count(name),
+                'allocated_sectors': sum(1 for start, count in self._extents.get(name, [])
+                                         for sector in range(start, start + count) if sector_map[sector])
+            })
+        return {
+            'version': self.version,
+            'used_sectors': sector_map.used_count,
+            'free_sectors': len(sector_map) - sector_map.used_count,
+            'tables': tables
+        }
@@ -10,10 +10,30 @@ class Node:
         self.right = None
         self.height = 1
 
+    def copy(self) -> 'Node':
+        # Copia del nodo con su propia lista de direcciones (los hijos se comparten)
+        node = Node(self.value)
+        node.addresses = list(self.addresses)
+        node.left = self.left
+        node.right = self.right
+        node.height = self.height
+        return node
+
 class AVL:
+  nodes_visited = 0  # Nodos recorridos por search() y range_search()
+  readers = 0        # Lecturas instantáneas con una raíz fijada: las inserciones copian el camino
+  modifications = 0  # Impar mientras hay una inserción en curso
+
   def __init__(self):
     self.root = None
 
+  def __getstate__(self):
+    # Los lectores fijados y el contador de modificaciones no se guardan con el catálogo
+    state = dict(self.__dict__)
+    state.pop('readers', None)
+    state.pop('modifications', None)
+    return state
+
   def height(self, p):
     return p.height if p else 0
 
@@ -72,13 +92,17 @@ class AVL:
     return p
 
   # ----------------------------------------------
-  def ins(self, p, x, address: Optional[tuple] = None):
+  def ins(self, p, x, address: Optional[tuple] = None, copy: bool = False):
+    # Con copy=True los nodos del camino se copian en lugar de modificarse, así quien tenga una
+    # raíz anterior sigue viendo el árbol intacto. Las rotaciones solo tocan nodos del camino
     if not p:
       return Node(x, address)
+    if copy:
+      p = p.copy()
     if x < p.value:
-      p.left = self.ins(p.left, x, address)
+      p.left = self.ins(p.left, x, address, copy)
     elif x > p.value:
-      p.right = self.ins(p.right, x, address)
+      p.right = self.ins(p.right, x, address, copy)
     else:
       if address and address not in p.addresses:
           p.addresses.append(address)
@@ -86,7 +110,28 @@ class AVL:
     return self.balance(p)
 
   def insert(self, x, address: Optional[tuple] = None):
-    self.root = self.ins(self.root, x, address)
+    self.modifications += 1
+    try:
+      self.root = self.ins(self.root, x, address, copy=self.readers > 0)
+    finally:
+      self.modifications += 1
+
+  def build_sorted(self, items: list):
+    # Reemplaza el árbol por uno perfectamente balanceado a partir de pares (valor, direcciones)
+    # ya ordenados por valor y sin valores repetidos
+    self.root = self._build_range(items, 0, len(items))
+
+  def _build_range(self, items: list, low: int, high: int) -> Optional[Node]:
+    if low >= high:
+      return None
+    middle = (low + high) // 2
+    value, addresses = items[middle]
+    node = Node(value)
+    node.addresses = list(addresses)
+    node.left = self._build_range(items, low, middle)
+    node.right = self._build_range(items, middle + 1, high)
+    self.update_height(node)
+    return node
 
   def search(self, x) -> Optional[Node]:
     # Busca un valor en el árbol AVL
@@ -94,7 +139,10 @@ class AVL:
   
   def _search_recursive(self, node: Optional[Node], x: Any) -> Optional[Node]:
     # Búsqueda recursiva en el árbol
-    if node is None or node.value == x:
+    if node is None:
+      return node
+    self.nodes_visited += 1
+    if node.value == x:
       return node
     
     if x < node.value:
@@ -102,6 +150,27 @@ class AVL:
     else:
       return self._search_recursive(node.right, x)
 
+  def range_search(self, low: Any = None, high: Any = None,
+                   include_low: bool = True, include_high: bool = True) -> list:
+    # Nodos con valores dentro de [low, high] en orden; None deja el extremo abierto
+    nodes = []
+    self._range_collect(self.root, low, high, include_low, include_high, nodes)
+    return nodes
+
+  def _range_collect(self, node: Optional[Node], low: Any, high: Any,
+                     include_low: bool, include_high: bool, nodes: list):
+    if node is None:
+      return
+    self.nodes_visited += 1
+    above_low = low is None or node.value > low or (include_low and node.value == low)
+    below_high = high is None or node.value < high or (include_high and node.value == high)
+    if low is None or node.value > low:
+      self._range_collect(node.left, low, high, include_low, include_high, nodes)
+    if above_low and below_high:
+      nodes.append(node)
+    if high is None or node.value < high:
+      self._range_collect(node.right, low, high, include_low, include_high, nodes)
+
   def inorder(self, p):
     if p:
       self.inorder(p.left)
@@ -0,0 +1,51 @@
+# Construcción de índices secundarios en bloque después de una carga masiva: por cada campo se
+# extraen los pares (clave, dirección), se ordenan y se arma un AVL balanceado de una sola vez,
+# cada campo en su propio proceso
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import groupby
+from typing import Any, Dict, List, Optional, Tuple
+
+from .avl_tree import AVL
+
+IndexColumn = List[Tuple[Any, Tuple[int, int]]]  # Pares (clave, dirección) en orden de carga
+
+def sorted_entries(keys: List[Any], addresses: List[Tuple[int, int]]) -> List[Tuple[Any, List[Tuple[int, int]]]]:
+    # Claves distintas en orden con sus direcciones en el orden en que llegaron (el ordenamiento
+    # es estable). Es la parte O(n log n) y la que corre en los procesos de trabajo
+    order = sorted(range(len(keys)), key=keys.__getitem__)
+    entries: List[Tuple[Any, List[Tuple[int, int]]]] = []
+    for key, group in groupby(order, key=keys.__getitem__):
+        entries.append((key, list(dict.fromkeys(addresses[i] for i in group))))
+    return entries
+
+def build_index(pairs: IndexColumn) -> AVL:
+    # AVL balanceado armado de una vez a partir de los pares (clave, dirección)
+    avl = AVL()
+    avl.build_sorted(sorted_entries([key for key, _ in pairs], [address for _, address in pairs]))
+    return avl
+
+def column_pairs(avl: Optional[AVL]) -> IndexColumn:
+    # Pares (clave, dirección) de un índice existente, para reconstruirlo junto con los nuevos
+    if avl is None:
+        return []
+    return [(node.value, address) for node in avl.get_all_nodes() for address in node.addresses]
+
+def build_indexes(columns: Dict[str, IndexColumn], workers: Optional[int] = None) -> Dict[str, AVL]:
+    # Construye un índice por campo. Con workers > 1 cada campo se ordena en un proceso aparte,
+    # que recibe las claves y las direcciones como dos columnas y devuelve las entradas ordenadas;
+    # el árbol se enlaza acá. Con workers = 1 todo corre en este proceso. None usa un proceso por
+    # campo hasta la cantidad de CPUs (con una sola CPU los procesos solo agregan costo)
+    if workers is None:
+        workers = min(len(columns), os.cpu_count() or 1)
+    if workers <= 1 or len(columns) <= 1:
+        return {name: build_index(pairs) for name, pairs in columns.items()}
+    with ProcessPoolExecutor(max_workers=min(workers, len(columns))) as pool:
+        futures = {name: pool.submit(sorted_entries, [key for key, _ in pairs], [address for _, address in pairs])
+                   for name, pairs in columns.items()}
+        built = {}
+        for name, future in futures.items():
+            built[name] = AVL()
+            built[name].build_sorted(future.result())
+        return built
@@ -1,6 +1,6 @@
 import os
 import sys
-from typing import Optional, Dict, Any
+from typing import Optional
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
 import threading
@@ -8,13 +8,8 @@ import threading
 # Agregar el directorio src al path para importar módulos
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from storage.disk import Disk, DiskGeometry
-from data_management.schema_parser import SchemaParser
-from data_management.csv_loader import CSVLoader
-from data_management.data_validator import DataValidator
-from indexing.avl_tree import AVL
-from storage.serialization import RecordSerializer
-from storage.sector_manager import SectorManager
+from storage.disk import DiskGeometry
+from engine.database import Database
 
 class DiskSimulatorInterface:
     def __init__(self):
@@ -22,13 +17,9 @@ class DiskSimulatorInterface:
         self.root.title("Simulador de Disco - Base de Datos II")
         self.root.geometry("1000x700")
         
-        # Variables de estado
-        self.disk: Optional[Disk] = None
-        self.schema: Optional[Dict] = None
-        self.avl_tree = AVL()
-        self.serializer: Optional[RecordSerializer] = None
-        self.sector_manager: Optional[SectorManager] = None
-        self.secondary_indexes = {}  # Diccionario de AVLs por campo
+        # Variables de estado: la interfaz solo delega en el motor
+        self.db: Optional[Database] = None
+        self.table_name: Optional[str] = None  # Tabla activa
         
         self.setup_ui()
         
@@ -78,7 +69,11 @@ class DiskSimulatorInterface:
         
         create_btn = ttk.Button(params_frame, text="Crear Disco", 
                                command=self.create_disk)
-        create_btn.grid(row=4, column=0, columnspan=2, pady=20)
+        create_btn.grid(row=4, column=0, pady=20)
+        
+        open_btn = ttk.Button(params_frame, text="Abrir Disco", 
+                             command=self.open_disk)
+        open_btn.grid(row=4, column=1, pady=20)
         
         self.capacity_label = ttk.Label(params_frame, text="", font=("Arial", 10))
         self.capacity_label.grid(row=5, column=0, columnspan=2, pady=10)
@@ -109,6 +104,12 @@ class DiskSimulatorInterface:
         ttk.Button(schema_frame, text="Cargar Esquema", 
                   command=self.load_schema).pack(pady=10)
         
+        self.table_var = tk.StringVar()
+        ttk.Label(schema_frame, text="Tabla activa:").pack(anchor='w')
+        self.table_combo = ttk.Combobox(schema_frame, textvariable=self.table_var, width=30, state="readonly")
+        self.table_combo.pack(anchor='w', pady=5)
+        self.table_combo.bind("<<ComboboxSelected>>", lambda _: self.select_table(self.table_var.get()))
+        
         schema_display_frame = ttk.LabelFrame(frame, text="Esquema Cargado", padding=10)
         schema_display_frame.pack(fill='both', expand=True, padx=20, pady=10)
         
@@ -138,6 +139,10 @@ class DiskSimulatorInterface:
         ttk.Button(csv_file_frame, text="Buscar", 
                   command=self.browse_csv_file).pack(side='left')
         
+        self.defer_indexes_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(csv_frame, text="Construir índices secundarios al final (en bloque)",
+                        variable=self.defer_indexes_var).pack(anchor='w')
+        
         ttk.Button(csv_frame, text="Validar y Cargar Datos", 
                   command=self.load_csv_data).pack(pady=10)
         
@@ -173,6 +178,14 @@ class DiskSimulatorInterface:
         ttk.Button(search_frame, text="Buscar", 
                   command=self.search_record).pack(pady=10)
         
+        sql_frame = ttk.LabelFrame(frame, text="Consulta SQL (SELECT / EXPLAIN SELECT)", padding=10)
+        sql_frame.pack(fill='x', padx=20, pady=10)
+        
+        self.sql_var = tk.StringVar()
+        ttk.Entry(sql_frame, textvariable=self.sql_var, width=80).pack(side='left', fill='x', expand=True)
+        ttk.Button(sql_frame, text="Ejecutar", 
+                  command=self.run_query).pack(side='left', padx=5)
+        
         results_frame = ttk.LabelFrame(frame, text="Resultados de Búsqueda", padding=10)
         results_frame.pack(fill='both', expand=True, padx=20, pady=10)
         
@@ -188,8 +201,12 @@ class DiskSimulatorInterface:
                                font=("Arial", 14, "bold"))
         title_label.pack(pady=20)
         
-        ttk.Button(frame, text="Actualizar Estado", 
-                  command=self.update_disk_status).pack(pady=10)
+        buttons_frame = ttk.Frame(frame)
+        buttons_frame.pack(pady=10)
+        ttk.Button(buttons_frame, text="Actualizar Estado", 
+                  command=self.update_disk_status).pack(side='left', padx=5)
+        ttk.Button(buttons_frame, text="Reiniciar contadores de E/S", 
+                  command=self.reset_io_stats).pack(side='left', padx=5)
         
         status_frame = ttk.LabelFrame(frame, text="Estado Actual", padding=10)
         status_frame.pack(fill='both', expand=True, padx=20, pady=10)
@@ -210,18 +227,8 @@ class DiskSimulatorInterface:
                 return
             
             geometry = DiskGeometry(platters, tracks, sectors, sector_size)
-            self.disk = Disk(geometry)
-            
-            self.sector_manager = SectorManager(self.disk)
-            self.serializer = RecordSerializer()
-            
-            total_capacity = geometry.platters * 2 * geometry.tracks * geometry.sectors * geometry.sector_size
-            capacity_mb = total_capacity / (1024 * 1024)
-            
-            self.capacity_label.config(
-                text=f"Capacidad Total: {capacity_mb:.2f} MB\n"
-                     f"Sectores Totales: {geometry.platters * 2 * geometry.tracks * geometry.sectors:,}"
-            )
+            self.db = Database(geometry)
+            self.show_disk()
             
             messagebox.showinfo("Éxito", "Disco creado exitosamente")
             
@@ -230,6 +237,43 @@ class DiskSimulatorInterface:
         except Exception as e:
             messagebox.showerror("Error", f"Error al crear disco: {str(e)}")
     
+    def open_disk(self):
+        # Reabre un disco existente con la geometría guardada en su superbloque
+        filename = filedialog.askopenfilename(
+            title="Seleccionar disco virtual",
+            filetypes=[("Discos virtuales", "*.bin"), ("Todos los archivos", "*.*")]
+        )
+        if not filename:
+            return
+        try:
+            self.db = Database.open(filename)
+        except Exception as e:
+            messagebox.showerror("Error", f"Error al abrir disco: {str(e)}")
+            return
+        geometry = self.db.disk.geometry
+        self.platters_var.set(str(geometry.platters))
+        self.tracks_var.set(str(geometry.tracks))
+        self.sectors_var.set(str(geometry.sectors))
+        self.sector_size_var.set(str(geometry.sector_size))
+        self.show_disk()
+        messagebox.showinfo("Éxito", "Disco abierto exitosamente")
+    
+    def show_disk(self):
+        # Muestra la capacidad del disco actual y sus tablas registradas
+        self.table_name = None
+        self.table_combo['values'] = self.db.table_names()
+        if self.db.table_names():
+            self.select_table(self.db.table_names()[0])
+        
+        geometry = self.db.disk.geometry
+        total_sectors = geometry.platters * 2 * geometry.tracks * geometry.sectors
+        capacity_mb = total_sectors * geometry.sector_size / (1024 * 1024)
+        
+        self.capacity_label.config(
+            text=f"Capacidad Total: {capacity_mb:.2f} MB\n"
+                 f"Sectores Totales: {total_sectors:,}"
+        )
+    
     def browse_schema_file(self):
         # Abre diálogo para seleccionar archivo de esquema
         filename = filedialog.askopenfilename(
@@ -250,7 +294,7 @@ class DiskSimulatorInterface:
     
     def load_schema(self):
         # Carga y parsea el esquema SQL
-        if not self.disk:
+        if not self.db:
             messagebox.showerror("Error", "Primero debe crear un disco")
             return
             
@@ -260,42 +304,49 @@ class DiskSimulatorInterface:
             return
             
         try:
-            parser = SchemaParser()
-            self.schema = parser.parse_schema_file(schema_path)
-            
-            # Mostrar esquema en el área de texto
-            self.schema_text.delete(1.0, tk.END)
-            self.schema_text.insert(tk.END, "Esquema cargado exitosamente:\n\n")
-            self.schema_text.insert(tk.END, f"Tabla: {self.schema['table_name']}\n")
-            self.schema_text.insert(tk.END, f"Clave Primaria: {self.schema['primary_key']}\n\n")
-            self.schema_text.insert(tk.END, "Campos:\n")
-            
-            for field in self.schema['fields']:
-                self.schema_text.insert(tk.END, 
-                    f"  - {field['name']}: {field['type']} ({field['size']} bytes)\n")
+            table_names = self.db.load_schema(schema_path)
             
-            self.schema_text.insert(tk.END, f"\nTamaño total del registro: {self.schema['record_size']} bytes\n")
+            self.table_combo['values'] = self.db.table_names()
+            self.select_table(table_names[0])
             
-            messagebox.showinfo("Éxito", "Esquema cargado exitosamente")
-            
-            if self.schema:
-                field_names = [field['name'] for field in self.schema['fields']]
-                self.search_field_combo['values'] = field_names
-                self.search_field_combo.current(0)
-                # Crear un AVL por cada campo
-                for field in field_names:
-                    self.secondary_indexes[field] = AVL()
+            messagebox.showinfo("Éxito", f"Esquema cargado exitosamente ({len(table_names)} tabla(s))")
             
         except Exception as e:
             messagebox.showerror("Error", f"Error al cargar esquema: {str(e)}")
     
+    def select_table(self, table_name: str):
+        # Activa una tabla del catálogo y muestra su esquema
+        schema = self.db.get_schema(table_name)
+        self.table_name = schema['table_name']
+        self.table_var.set(self.table_name)
+        
+        # Mostrar esquema en el área de texto
+        self.schema_text.delete(1.0, tk.END)
+        self.schema_text.insert(tk.END, "Esquema cargado exitosamente:\n\n")
+        self.schema_text.insert(tk.END, f"Tabla: {schema['table_name']}\n")
+        self.schema_text.insert(tk.END, f"Clave Primaria: {schema['primary_key']}\n\n")
+        self.schema_text.insert(tk.END, "Campos:\n")
+        
+        for field in schema['fields']:
+            self.schema_text.insert(tk.END, 
+                f"  - {field['name']}: {field['type']} ({field['size']} bytes)\n")
+        
+        if schema.get('row_format') == 'VARIABLE':
+            self.schema_text.insert(tk.END, f"\nFormato de registro: variable (máximo {schema['record_size']} bytes)\n")
+        else:
+            self.schema_text.insert(tk.END, f"\nTamaño total del registro: {schema['record_size']} bytes\n")
+        
+        field_names = [field['name'] for field in schema['fields']]
+        self.search_field_combo['values'] = field_names
+        self.search_field_combo.current(0)
+    
     def load_csv_data(self):
         # Carga y valida datos CSV
-        if not self.disk:
+        if not self.db:
             messagebox.showerror("Error", "Primero debe crear un disco")
             return
             
-        if not self.schema:
+        if not self.table_name:
             messagebox.showerror("Error", "Primero debe cargar un esquema")
             return
             
@@ -318,39 +369,8 @@ class DiskSimulatorInterface:
             self.progress_text.delete(1.0, tk.END)
             self.progress_text.insert(tk.END, "Iniciando carga de datos...\n")
             
-            loader = CSVLoader()
-            validator = DataValidator()
-            
-            self.progress_text.insert(tk.END, "Validando estructura del CSV...\n")
-            data = loader.load_csv(csv_path)
-            
-            self.progress_text.insert(tk.END, "Validando datos contra esquema...\n")
-            validated_data = validator.validate_data(data, self.schema)
-            
-            self.progress_text.insert(tk.END, f"Se cargaron {len(validated_data)} registros válidos\n")
-            
-            self.progress_text.insert(tk.END, "Escribiendo datos al disco...\n")
-            
-            records_written = 0
-            for record in validated_data:
-                serialized_record = self.serializer.serialize_record(record, self.schema)
-                sector, offset = self.sector_manager.write_record(serialized_record)
-                primary_key = record[self.schema['primary_key']]
-                self.avl_tree.insert(primary_key, (sector, offset))
-                # Insertar en los índices secundarios
-                for field, avl in self.secondary_indexes.items():
-                    # Para campos de tipo string, convertir a minúsculas para consistencia en búsquedas
-                    field_info = next(f for f in self.schema['fields'] if f['name'] == field)
-                    if 'VARCHAR' in field_info['type'] or 'CHAR' in field_info['type'] or 'TEXT' in field_info['type']:
-                        value_to_insert = str(record[field]).lower() if record[field] else ""
-                    else:
-                        value_to_insert = record[field]
-                    avl.insert(value_to_insert, (sector, offset))
-                records_written += 1
-                
-                if records_written % 100 == 0:
-                    self.progress_text.insert(tk.END, f"Procesados {records_written} registros...\n")
-                    self.progress_text.see(tk.END)
+            records_written = self.db.load_csv(self.table_name, csv_path, progress=self._show_progress,
+                                               defer_indexes=self.defer_indexes_var.get())
             
             self.progress_text.insert(tk.END, f"\n¡Carga completada! {records_written} registros escritos al disco.\n")
             self.progress_text.insert(tk.END, f"Índice AVL creado con {records_written} entradas.\n")
@@ -358,9 +378,13 @@ class DiskSimulatorInterface:
         except Exception as e:
             self.progress_text.insert(tk.END, f"\nError: {str(e)}\n")
     
+    def _show_progress(self, message: str):
+        self.progress_text.insert(tk.END, message + "\n")
+        self.progress_text.see(tk.END)
+    
     def search_record(self):
         # Búsqueda por cualquier campo, mostrando todas las coincidencias y la ubicación física exacta
-        if not self.disk or not self.schema:
+        if not self.db or not self.table_name:
             messagebox.showerror("Error", "Debe tener un disco y esquema cargados")
             return
 
@@ -371,71 +395,76 @@ class DiskSimulatorInterface:
             return
 
         try:
-            field_info = next(f for f in self.schema['fields'] if f['name'] == search_field)
-            field_type = field_info['type']
-            if 'INTEGER' in field_type:
-                try:
-                    search_value_cast = int(search_value)
-                except Exception:
-                    search_value_cast = search_value
-            elif 'DECIMAL' in field_type:
-                try:
-                    search_value_cast = float(search_value)
-                except Exception:
-                    search_value_cast = search_value
-            elif 'BOOLEAN' in field_type or 'BOOL' in field_type:
-                value_lower = search_value.strip().lower()
-                if value_lower in ('true', '1', 'yes'):
-                    search_value_cast = True
-                elif value_lower in ('false', '0', 'no'):
-                    search_value_cast = False
-                else:
-                    search_value_cast = search_value
-            else:
-                # Para strings, convertir a minúsculas para consistencia con los datos insertados
-                search_value_cast = search_value.strip().lower()
-            avl = self.secondary_indexes.get(search_field)
-            node = avl.search(search_value_cast) if avl else None
+            search_value_cast = self.db.parse_value(self.table_name, search_field, search_value)
+            result = self.db.search(self.table_name, search_field, search_value_cast)
             self.search_results_text.delete(1.0, tk.END)
-            if not node or not node.addresses:
+            if result['method'] == 'scan':
+                self.search_results_text.insert(tk.END, "Campo sin índice: búsqueda por recorrido completo\n\n")
+            if not result['results']:
+                field_type = next(f['type'] for f in self.db.get_schema(self.table_name)['fields']
+                                  if f['name'] == search_field)
                 self.search_results_text.insert(tk.END, f"No se encontró ningún registro con {search_field} = {search_value}\n")
                 self.search_results_text.insert(tk.END, f"Valor buscado (convertido): {search_value_cast}\n")
                 self.search_results_text.insert(tk.END, f"Tipo de campo: {field_type}\n")
                 # Mostrar algunos valores disponibles en el índice para depuración
-                if avl and avl.root:
+                sample = self.db.index_sample(self.table_name, search_field)
+                if sample:
                     self.search_results_text.insert(tk.END, f"Valores disponibles en el índice (primeros 5):\n")
-                    nodes = avl.get_all_nodes()[:5]
-                    for node in nodes:
-                        self.search_results_text.insert(tk.END, f"  - {node.value}\n")
+                    for value in sample:
+                        self.search_results_text.insert(tk.END, f"  - {value}\n")
                 return
-            for idx, (sector_address, offset) in enumerate(node.addresses, 1):
-                data = self.sector_manager.read_record(sector_address, offset)
-                record = self.serializer.deserialize_record(data, self.schema)
+            for idx, match in enumerate(result['results'], 1):
+                sector_address, offset = match['address']
+                physical_location = match['physical_location']
                 self.search_results_text.insert(tk.END, f"Registro {idx} encontrado:\n\n")
                 self.search_results_text.insert(tk.END, f"Ubicación física: Sector lógico {sector_address}, Offset {offset}\n")
-                physical_location = self.disk._get_physical_location(sector_address)
-                self.search_results_text.insert(tk.END, f"Coordenadas físicas:\n")
-                self.search_results_text.insert(tk.END, f"  Plato: {physical_location['platter']}\n")
-                self.search_results_text.insert(tk.END, f"  Superficie: {physical_location['surface']}\n")
-                self.search_results_text.insert(tk.END, f"  Pista: {physical_location['track']}\n")
-                self.search_results_text.insert(tk.END, f"  Sector: {physical_location['sector']}\n\n")
+                if physical_location is None:
+                    self.search_results_text.insert(tk.END, "Coordenadas físicas: pendientes (el grupo comprimido "
+                                                             "todavía no se escribió al disco)\n\n")
+                else:
+                    self.search_results_text.insert(tk.END, f"Coordenadas físicas:\n")
+                    self.search_results_text.insert(tk.END, f"  Plato: {physical_location['platter']}\n")
+                    self.search_results_text.insert(tk.END, f"  Superficie: {physical_location['surface']}\n")
+                    self.search_results_text.insert(tk.END, f"  Pista: {physical_location['track']}\n")
+                    self.search_results_text.insert(tk.END, f"  Sector: {physical_location['sector']}\n\n")
                 self.search_results_text.insert(tk.END, f"Datos del registro:\n")
-                for field_name, value in record.items():
+                for field_name, value in match['record'].items():
                     self.search_results_text.insert(tk.END, f"  {field_name}: {value}\n")
                 self.search_results_text.insert(tk.END, "\n" + "-"*40 + "\n\n")
 
         except Exception as e:
             messagebox.showerror("Error", f"Error en la búsqueda: {str(e)}")
     
+    def run_query(self):
+        # Ejecuta la consulta SQL y muestra las filas (y el plan si se pidió EXPLAIN)
+        if not self.db:
+            messagebox.showerror("Error", "Debe tener un disco creado")
+            return
+        sql = self.sql_var.get().strip()
+        if not sql:
+            messagebox.showerror("Error", "Ingrese una consulta SELECT")
+            return
+        try:
+            result = self.db.query(sql)
+            self.search_results_text.delete(1.0, tk.END)
+            if result.plan.statement.explain:
+                self.search_results_text.insert(tk.END, self.db.explain(result) + "\n\n")
+            self.search_results_text.insert(tk.END, " | ".join(result.columns) + "\n")
+            for row in result.rows:
+                self.search_results_text.insert(tk.END, " | ".join(str(row[c]) for c in result.columns) + "\n")
+            self.search_results_text.insert(tk.END, f"\n{len(result.rows)} registro(s)\n")
+        except Exception as e:
+            messagebox.showerror("Error", f"Error en la consulta: {str(e)}")
+    
     def update_disk_status(self):
         # Actualiza la información del estado del disco
-        if not self.disk:
+        if not self.db:
             self.status_text.delete(1.0, tk.END)
             self.status_text.insert(tk.END, "No hay disco creado")
             return
             
         try:
-            status = self.disk.get_disk_status()
+            status = self.db.status()
             
             self.status_text.delete(1.0, tk.END)
             self.status_text.insert(tk.END, "ESTADO DEL DISCO\n")
@@ -458,15 +487,61 @@ class DiskSimulatorInterface:
             self.status_text.insert(tk.END, f"  Espacio usado: {status['used_space']} bytes ({status['used_space'] / (1024*1024):.2f} MB)\n") #cambios
             self.status_text.insert(tk.END, f"  Espacio libre: {status['free_space']} bytes ({status['free_space'] / (1024*1024):.2f} MB)\n")
             
-            if self.schema:
+            if self.table_name:
+                schema = self.db.get_schema(self.table_name)
                 self.status_text.insert(tk.END, f"\nEsquema cargado:\n")
-                self.status_text.insert(tk.END, f"  Tabla: {self.schema['table_name']}\n")
-                self.status_text.insert(tk.END, f"  Tamaño de registro: {self.schema['record_size']} bytes\n")
+                self.status_text.insert(tk.END, f"  Tabla: {schema['table_name']}\n")
+                self.status_text.insert(tk.END, f"  Tamaño de registro: {schema['record_size']} bytes\n")
+            
+            if status['tables']:
+                self.status_text.insert(tk.END, f"\nCatálogo:\n")
+                for table in status['tables']:
+                    extents = ", ".join(f"{start}-{start + count - 1}" for start, count in table['extents']) or "sin extents"
+                    self.status_text.insert(tk.END, f"  {table['name']}: {table['allocated_sectors']} sectores ({extents})\n")
+                    stats = table.get('compression')
+                    if stats:
+                        ratio = f"{stats['compression_ratio']:.2f}x" if stats['compression_ratio'] else "-"
+                        self.status_text.insert(tk.END, f"    Compresión {stats['algorithm']}: razón {ratio}, "
+                                                        f"{stats['logical_sectors']} sectores lógicos en "
+                                                        f"{stats['physical_sectors']} físicos\n")
+                    for field_name, column in table.get('statistics', {}).items():
+                        self.status_text.insert(tk.END, f"    {field_name}: {column['distinct']:,} distintos (aprox.), "
+                                                        f"{column['nulls']:,} nulos, mín {column['min']}, máx {column['max']}\n")
+                        if column['most_common']:
+                            common = ", ".join(f"{value} ({count})" for value, count in column['most_common'][:5])
+                            self.status_text.insert(tk.END, f"      Más comunes: {common}\n")
+                        if column['histogram']:
+                            bounds = " | ".join(str(bound) for bound in column['histogram'])
+                            self.status_text.insert(tk.END, f"      Histograma: {bounds}\n")
+                
+            cache = status['record_cache']
+            hit_rate = f"{cache['hit_rate']:.1%}" if cache['hit_rate'] is not None else "-"
+            self.status_text.insert(tk.END, f"\nCaché de registros: {cache['entries']:,} registros, "
+                                            f"{cache['used_bytes'] / 1024:.1f} de {cache['max_bytes'] / 1024:.0f} KB, "
+                                            f"aciertos {hit_rate} ({cache['hits']:,}/{cache['hits'] + cache['misses']:,}), "
+                                            f"{cache['evictions']:,} descartes, {cache['invalidations']:,} invalidaciones\n")
+            
+            io = self.db.io_stats()
+            self.status_text.insert(tk.END, f"\nEntrada/salida (desde el último reinicio):\n")
+            for name, value in io['counters'].items():
+                self.status_text.insert(tk.END, f"  {name}: {value:,}\n")
+            for operation, latency in io['latency'].items():
+                self.status_text.insert(tk.END, f"  {operation}: {latency['count']:,} ops, media {latency['mean_ms']:.3f} ms, "
+                                                f"p50 {latency['p50_ms']:.3f} ms, p99 {latency['p99_ms']:.3f} ms, "
+                                                f"máx {latency['max_ms']:.3f} ms\n")
+                buckets = ", ".join(f"{bucket}: {count}" for bucket, count in latency['buckets'].items())
+                self.status_text.insert(tk.END, f"    {buckets}\n")
                 
         except Exception as e:
             self.status_text.delete(1.0, tk.END)
             self.status_text.insert(tk.END, f"Error al obtener estado: {str(e)}")
     
+    def reset_io_stats(self):
+        # Pone en cero los contadores y los histogramas de latencia para medir una nueva corrida
+        if self.db:
+            self.db.reset_io_stats()
+        self.update_disk_status()
+    
     def run(self):
         # Ejecuta la interfaz de usuario
         self.root.mainloop()
@@ -4,14 +4,14 @@ import os
 # Agregar el directorio src al path para importar módulos
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from interface.user_interface import DiskSimulatorInterface
-
 def main():
     print("Iniciando Simulador de Disco...")
     print("Sistema de almacenamiento con indexación AVL para Bases de Datos II")
     print("=" * 60)
     
     try:
+        # tkinter solo se importa al abrir la interfaz gráfica (el motor no depende de él)
+        from interface.user_interface import DiskSimulatorInterface
         app = DiskSimulatorInterface()
         app.run()
     except Exception as e:
@@ -0,0 +1,304 @@
+# Planificación y ejecución de sentencias SELECT sobre los índices AVL y el recorrido de tabla.
+# Cada plan elige un único camino de acceso (índice primario, índice secundario por igualdad o
+# rango, o recorrido completo) según las lecturas de sector estimadas, y evalúa el resto de las
+# condiciones como filtro residual
+
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from indexing.avl_tree import AVL
+from storage.table_scan import NUMERIC_TYPES, Predicate, STRING_TYPES, parse_number
+from .sql_parser import SQLParser, SelectStatement
+
+# Selectividades por defecto cuando la tabla no tiene estadísticas de columna
+DEFAULT_SELECTIVITY = {'=': 0.1, '<': 1 / 3, '>': 1 / 3, '<=': 1 / 3, '>=': 1 / 3,
+                       'BETWEEN': 0.25, 'PREFIX': 0.1}
+
+PK_LOOKUP = 'pk_lookup'
+INDEX_LOOKUP = 'index_lookup'
+INDEX_RANGE = 'index_range'
+FULL_SCAN = 'full_scan'
+
+FETCH_BATCH = 64  # Direcciones de índice que se leen juntas, en orden físico
+
+ACCESS_LABELS = {
+    PK_LOOKUP: "búsqueda en índice primario",
+    INDEX_LOOKUP: "búsqueda en índice secundario",
+    INDEX_RANGE: "rango en índice secundario",
+    FULL_SCAN: "recorrido completo"
+}
+
+@dataclass
+class AccessPath:
+    kind: str
+    estimated_rows: float     # Filas que entrega el camino de acceso (antes del filtro residual)
+    estimated_sectors: float  # Lecturas de sector estimadas
+    predicate: Optional[Predicate] = None
+
+@dataclass
+class QueryPlan:
+    statement: SelectStatement
+    table: str
+    columns: List[str]
+    predicates: List[Predicate]
+    access: AccessPath
+    estimated_output: float
+    table_rows: int
+    table_sectors: int
+    order_by: Optional[str] = None
+    presorted: bool = False  # El camino de acceso ya entrega las filas en el orden pedido
+
+@dataclass
+class QueryResult:
+    plan: QueryPlan
+    columns: List[str]
+    rows: List[Dict[str, Any]] = field(default_factory=list)
+    addresses: List[Tuple[int, int]] = field(default_factory=list)
+    fetched_rows: int = 0  # Filas leídas por el camino de acceso
+    sectors_read: int = 0
+    elapsed_ms: float = 0.0
+
+class QueryPlanner:
+    # Planifica y ejecuta SELECT contra un engine.database.Database
+
+    def __init__(self, db):
+        self.db = db
+
+    def run(self, sql: str) -> QueryResult:
+        return self.execute(self.plan(SQLParser().parse(sql)))
+
+    # ----------------------- Planificación -----------------------
+    def plan(self, statement: SelectStatement) -> QueryPlan:
+        entry = self.db.get_table(statement.table)
+        schema = entry.schema
+        fields = {f['name'].lower(): f for f in schema['fields']}
+
+        def resolve(name: str) -> Dict[str, Any]:
+            if name.lower() not in fields:
+                raise ValueError(f"Campo desconocido en {entry.name}: {name}")
+            return fields[name.lower()]
+
+        columns = [resolve(c)['name'] for c in statement.columns] or [f['name'] for f in schema['fields']]
+        predicates = []
+        for condition in statement.conditions:
+            table_field = resolve(condition.field)
+            convert = lambda value: self._literal(entry.name, table_field, value)
+            upper = convert(condition.upper) if condition.upper is not None else None
+            predicates.append(Predicate(table_field['name'], condition.operator, convert(condition.value),
+                                        upper, ignore_case=table_field['type'] in STRING_TYPES))
+        order_by = resolve(statement.order_by)['name'] if statement.order_by else None
+
+        table_rows = self._row_count(entry)
+        table_sectors = entry.allocated_sectors
+        selectivity = 1.0
+        for predicate in predicates:
+            selectivity *= self._selectivity(entry, predicate, table_rows)
+        estimated_output = table_rows * selectivity
+
+        candidates = [AccessPath(FULL_SCAN, table_rows, table_sectors)]
+        per_row = self._sectors_per_row(entry)
+        for predicate in predicates:
+            kind = self._index_access(entry, predicate)
+            if kind is not None:
+                rows = table_rows * self._selectivity(entry, predicate, table_rows)
+                row_sectors = per_row
+                if kind == INDEX_RANGE and entry.clustered is not None and predicate.field == entry.schema['primary_key']:
+                    # En una tabla agrupada el rango de clave primaria ocupa páginas consecutivas
+                    row_sectors = self._clustered_sectors_per_row(entry)
+                candidates.append(AccessPath(kind, rows, rows * row_sectors, predicate))
+        access = min(candidates, key=lambda path: path.estimated_sectors)
+
+        presorted = order_by is None or (access.kind != FULL_SCAN and access.predicate.field == order_by)
+        if statement.limit is not None and presorted and estimated_output > 0:
+            # Con LIMIT y sin ordenamiento en memoria, la lectura se detiene antes
+            fraction = min(1.0, statement.limit / estimated_output)
+            access.estimated_rows *= fraction
+            access.estimated_sectors *= fraction
+        return QueryPlan(statement, entry.name, columns, predicates, access, estimated_output,
+                         table_rows, table_sectors, order_by, presorted)
+
+    def _literal(self, table: str, field: Dict[str, Any], value: Any) -> Any:
+        # Convierte el literal al tipo de la columna; parse_value deja el texto sin convertir si no puede.
+        # Los numéricos siguen la regla del recorrido de tabla: 3.0 vale como entero y un literal
+        # fraccionario o fuera de rango simplemente no coincide con ninguna fila
+        if field['type'] in NUMERIC_TYPES:
+            number = parse_number(value)
+            if number is None:
+                raise ValueError(f"Valor inválido para la columna {field['name']} ({field['type']}): {value!r}")
+            if field['type'] in ('DECIMAL', 'FLOAT', 'DOUBLE'):
+                return float(number)
+            return int(number) if isinstance(number, float) and number.is_integer() else number
+        converted = self.db.parse_value(table, field['name'], str(value))
+        if field['type'] not in STRING_TYPES and isinstance(converted, str):
+            raise ValueError(f"Valor inválido para la columna {field['name']} ({field['type']}): {value!r}")
+        return converted
+
+    def _row_count(self, entry) -> int:
+        if entry.row_count or entry.primary_index.root is None:
+            return entry.row_count
+        # Catálogos anteriores al contador de filas
+        return sum(len(node.addresses) for node in entry.primary_index.get_all_nodes())
+
+    def _sectors_per_row(self, entry) -> float:
+        # Sectores leídos para traer un registro por su dirección
+        if entry.compression is not None:
+            groups = entry.compression.groups
+            return sum(g[1] for g in groups.values()) / len(groups) if groups else 1.0
+        record_bytes = entry.schema['record_size'] + self.db.disk.record_format.header_size
+        return 1 + (record_bytes - 1) / self.db.disk.sector_size
+
+    def _clustered_sectors_per_row(self, entry) -> float:
+        # Sectores por fila cuando las filas se leen página tras página
+        record_bytes = entry.schema['record_size'] + self.db.disk.record_format.header_size
+        page_bytes = entry.clustered.page_sectors * self.db.disk.sector_size
+        rows_per_page = max(1, int(page_bytes * entry.clustered.fill_factor) // record_bytes)
+        return entry.clustered.page_sectors / rows_per_page
+
+    def _selectivity(self, entry, predicate: Predicate, table_rows: int) -> float:
+        if predicate.operator == '=' and predicate.field == entry.schema['primary_key']:
+            return 1 / table_rows if table_rows else 1.0
+        if entry.statistics is not None:
+            estimate = entry.statistics.selectivity(predicate.field, predicate.operator,
+                                                    predicate.value, predicate.upper)
+            if estimate is not None:
+                return estimate
+        return DEFAULT_SELECTIVITY[predicate.operator]
+
+    def _index_access(self, entry, predicate: Predicate) -> Optional[str]:
+        # Camino de acceso por índice que puede resolver el predicado, si existe
+        string_field = predicate.ignore_case
+        if (predicate.operator == '=' and predicate.field == entry.schema['primary_key']
+                and not string_field and entry.primary_index.root is not None):
+            return PK_LOOKUP
+        avl = entry.secondary_indexes.get(predicate.field)
+        if avl is None or avl.root is None:
+            return None
+        if predicate.operator == '=':
+            return INDEX_LOOKUP
+        if predicate.operator == 'PREFIX' and not string_field:
+            return None
+        return INDEX_RANGE
+
+    # ----------------------- Ejecución -----------------------
+    def execute(self, plan: QueryPlan) -> QueryResult:
+        result = QueryResult(plan=plan, columns=plan.columns)
+        limit = plan.statement.limit
+        reads_before = self.db.disk.sectors_read
+        start = time.perf_counter()
+
+        matches = []
+        for address, record in self._access(plan, result):
+            if all(p.matches(record) for p in plan.predicates):
+                matches.append((address, record))
+                if plan.presorted and limit is not None and len(matches) >= limit:
+                    break
+        if not plan.presorted:
+            # Los NULL van al final en ambos sentidos
+            nulls = [m for m in matches if m[1].get(plan.order_by) is None]
+            matches = sorted((m for m in matches if m[1].get(plan.order_by) is not None),
+                             key=lambda match: _sort_key(match[1][plan.order_by]),
+                             reverse=plan.statement.descending) + nulls
+        if limit is not None:
+            matches = matches[:limit]
+
+        result.addresses = [address for address, _ in matches]
+        result.rows = [{c: record.get(c) for c in plan.columns} for _, record in matches]
+        result.sectors_read = self.db.disk.sectors_read - reads_before
+        result.elapsed_ms = 1000 * (time.perf_counter() - start)
+        return result
+
+    def _access(self, plan: QueryPlan, result: QueryResult) -> Iterator[Tuple[Tuple[int, int], Dict[str, Any]]]:
+        access = plan.access
+        if access.kind == FULL_SCAN:
+            # Los predicados se evalúan sobre los bytes durante el recorrido
+            for address, record in self.db.scan(plan.table, plan.predicates):
+                result.fetched_rows += 1
+                yield address, record
+            return
+        # Las direcciones se leen en lotes para que las contiguas compartan lecturas de sector;
+        # con LIMIT el primer lote no pasa del límite
+        batch_size = FETCH_BATCH
+        if plan.presorted and plan.statement.limit is not None:
+            batch_size = max(1, min(FETCH_BATCH, plan.statement.limit))
+        batch: List[Tuple[int, int]] = []
+        for address in self._index_addresses(plan):
+            batch.append(address)
+            if len(batch) >= batch_size:
+                yield from self._fetch(plan, batch, result)
+                batch = []
+        yield from self._fetch(plan, batch, result)
+
+    def _fetch(self, plan: QueryPlan, addresses: List[Tuple[int, int]],
+               result: QueryResult) -> Iterator[Tuple[Tuple[int, int], Dict[str, Any]]]:
+        if not addresses:
+            return
+        for address, record in zip(addresses, self.db.read_records(plan.table, addresses)):
+            result.fetched_rows += 1
+            yield address, record
+
+    def _index_addresses(self, plan: QueryPlan) -> Iterator[Tuple[int, int]]:
+        entry = self.db.get_table(plan.table)
+        predicate = plan.access.predicate
+        if plan.access.kind == PK_LOOKUP:
+            node = self.db.index_search(entry.primary_index, predicate.value)
+            yield from (node.addresses if node else [])
+            return
+        avl: AVL = entry.secondary_indexes[predicate.field]
+        if plan.access.kind == INDEX_LOOKUP:
+            node = self.db.index_search(avl, predicate.value)
+            yield from (node.addresses if node else [])
+            return
+        nodes = self.db.index_range(avl, *_index_bounds(predicate))
+        if plan.order_by == predicate.field and plan.statement.descending:
+            nodes.reverse()
+        for node in nodes:
+            yield from node.addresses
+
+    # ----------------------- EXPLAIN -----------------------
+    def explain(self, result: QueryResult) -> str:
+        # Plan elegido con las filas y lecturas de sector estimadas frente a las reales
+        plan = result.plan
+        access = plan.access
+        lines = [f"Tabla: {plan.table} ({plan.table_rows} filas, {plan.table_sectors} sectores)"]
+        label = ACCESS_LABELS[access.kind]
+        lines.append(f"Acceso: {label}" + (f" ({access.predicate!r})" if access.predicate else ""))
+        residual = [p for p in plan.predicates if p is not access.predicate]
+        if residual:
+            lines.append("Filtro: " + " AND ".join(repr(p) for p in residual))
+        if plan.order_by:
+            direction = 'DESC' if plan.statement.descending else 'ASC'
+            how = "por el índice" if plan.presorted else "en memoria"
+            lines.append(f"Orden: {plan.order_by} {direction} ({how})")
+        if plan.statement.limit is not None:
+            lines.append(f"Límite: {plan.statement.limit}")
+        lines.append(f"{'':<22}{'Estimado':>10}{'Real':>10}")
+        lines.append(f"{'Filas leídas':<22}{access.estimated_rows:>10.1f}{result.fetched_rows:>10}")
+        output = plan.estimated_output
+        if plan.statement.limit is not None:
+            output = min(output, plan.statement.limit)
+        lines.append(f"{'Filas resultado':<22}{output:>10.1f}{len(result.rows):>10}")
+        lines.append(f"{'Lecturas de sector':<22}{access.estimated_sectors:>10.1f}{result.sectors_read:>10}")
+        lines.append(f"Tiempo: {result.elapsed_ms:.2f} ms")
+        return "\n".join(lines)
+
+def _index_bounds(predicate: Predicate) -> Tuple[Any, Any, bool, bool]:
+    # Límites (bajo, alto, incluir bajo, incluir alto) del rango de claves en el índice.
+    # Las claves de texto vacías corresponden a valores NULL y quedan fuera de los rangos
+    low, high, include_low, include_high = None, None, True, True
+    if predicate.operator in ('>', '>='):
+        low, include_low = predicate.value, predicate.operator == '>='
+    elif predicate.operator in ('<', '<='):
+        high, include_high = predicate.value, predicate.operator == '<='
+    elif predicate.operator == 'BETWEEN':
+        low, high = predicate.value, predicate.upper
+    elif predicate.operator == 'PREFIX':
+        low = predicate.value
+        high, include_high = predicate.value + '\U0010ffff', False
+    if predicate.ignore_case and (low is None or low == ''):
+        low, include_low = '', False
+    return low, high, include_low, include_high
+
+def _sort_key(value: Any) -> Any:
+    # Los textos se ordenan sin distinguir mayúsculas, igual que en los índices
+    return value.lower() if isinstance(value, str) else value
@@ -0,0 +1,154 @@
+# Analizador de sentencias SELECT simples:
+#   [EXPLAIN] SELECT cols FROM tabla [WHERE cond AND ...] [ORDER BY campo [ASC|DESC]] [LIMIT n]
+# Las condiciones admiten =, <, >, <=, >=, BETWEEN a AND b y LIKE 'prefijo%'
+
+import re
+from dataclasses import dataclass, field
+from typing import Any, List, Optional, Tuple
+
+TOKEN_PATTERN = re.compile(r"""
+    \s*(?:
+        (?P<number>-?\d+(?:\.\d+)?)
+      | (?P<string>'(?:[^']|'')*'|"[^"]*")
+      | (?P<op><=|>=|=|<|>|,|\*|;)
+      | (?P<name>[A-Za-z_][A-Za-z0-9_]*)
+    )""", re.VERBOSE)
+
+KEYWORDS = ('EXPLAIN', 'SELECT', 'FROM', 'WHERE', 'AND', 'BETWEEN', 'LIKE', 'ORDER', 'BY',
+            'ASC', 'DESC', 'LIMIT', 'TRUE', 'FALSE')
+
+@dataclass
+class Condition:
+    # Condición tal como se escribió; los valores se convierten al tipo del campo al planificar
+    field: str
+    operator: str
+    value: Any
+    upper: Any = None
+
+@dataclass
+class SelectStatement:
+    table: str
+    columns: List[str] = field(default_factory=list)  # Vacía equivale a '*'
+    conditions: List[Condition] = field(default_factory=list)
+    order_by: Optional[str] = None
+    descending: bool = False
+    limit: Optional[int] = None
+    explain: bool = False
+
+class SQLParser:
+    def parse(self, sql: str) -> SelectStatement:
+        # Convierte el texto SQL en una SelectStatement o lanza ValueError
+        self.tokens = self._tokenize(sql)
+        self.position = 0
+        explain = self._accept_keyword('EXPLAIN')
+        self._expect_keyword('SELECT')
+        columns = self._parse_columns()
+        self._expect_keyword('FROM')
+        statement = SelectStatement(table=self._expect_name(), columns=columns, explain=explain)
+
+        if self._accept_keyword('WHERE'):
+            statement.conditions.append(self._parse_condition())
+            while self._accept_keyword('AND'):
+                statement.conditions.append(self._parse_condition())
+        if self._accept_keyword('ORDER'):
+            self._expect_keyword('BY')
+            statement.order_by = self._expect_name()
+            if self._accept_keyword('DESC'):
+                statement.descending = True
+            else:
+                self._accept_keyword('ASC')
+        if self._accept_keyword('LIMIT'):
+            kind, text = self._next()
+            if kind != 'number' or not text.isdigit():
+                raise ValueError("LIMIT requiere un entero no negativo")
+            statement.limit = int(text)
+
+        self._accept_op(';')
+        if self.position < len(self.tokens):
+            raise ValueError(f"Texto inesperado cerca de '{self.tokens[self.position][1]}'")
+        return statement
+
+    def _tokenize(self, sql: str) -> List[Tuple[str, str]]:
+        tokens = []
+        position = 0
+        sql = sql.rstrip()
+        while position < len(sql):
+            match = TOKEN_PATTERN.match(sql, position)
+            if match is None or match.end() == position:
+                raise ValueError(f"Carácter inesperado en la posición {position}: '{sql[position]}'")
+            kind = match.lastgroup
+            text = match.group(kind)
+            if kind == 'name' and text.upper() in KEYWORDS:
+                kind, text = 'keyword', text.upper()
+            tokens.append((kind, text))
+            position = match.end()
+        return tokens
+
+    def _parse_columns(self) -> List[str]:
+        if self._accept_op('*'):
+            return []
+        columns = [self._expect_name()]
+        while self._accept_op(','):
+            columns.append(self._expect_name())
+        return columns
+
+    def _parse_condition(self) -> Condition:
+        field_name = self._expect_name()
+        if self._accept_keyword('BETWEEN'):
+            low = self._parse_literal()
+            self._expect_keyword('AND')
+            return Condition(field_name, 'BETWEEN', low, self._parse_literal())
+        if self._accept_keyword('LIKE'):
+            pattern = self._parse_literal()
+            if not isinstance(pattern, str) or not pattern.endswith('%') or '%' in pattern[:-1] or '_' in pattern:
+                raise ValueError("LIKE solo admite patrones de prefijo del tipo 'texto%'")
+            return Condition(field_name, 'PREFIX', pattern[:-1])
+        kind, operator = self._next()
+        if kind != 'op' or operator not in ('=', '<', '>', '<=', '>='):
+            raise ValueError(f"Operador no soportado: {operator}")
+        return Condition(field_name, operator, self._parse_literal())
+
+    def _parse_literal(self) -> Any:
+        kind, text = self._next()
+        if kind == 'number':
+            return float(text) if '.' in text else int(text)
+        if kind == 'string':
+            quote = text[0]
+            return text[1:-1].replace(quote * 2, quote)
+        if kind == 'keyword' and text in ('TRUE', 'FALSE'):
+            return text == 'TRUE'
+        raise ValueError(f"Se esperaba un valor y se encontró '{text}'")
+
+    # ----------------------- Tokens -----------------------
+    def _next(self) -> Tuple[str, str]:
+        if self.position >= len(self.tokens):
+            raise ValueError("Fin inesperado de la sentencia")
+        token = self.tokens[self.position]
+        self.position += 1
+        return token
+
+    def _peek(self) -> Optional[Tuple[str, str]]:
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def _accept_keyword(self, keyword: str) -> bool:
+        if self._peek() == ('keyword', keyword):
+            self.position += 1
+            return True
+        return False
+
+    def _expect_keyword(self, keyword: str):
+        if not self._accept_keyword(keyword):
+            found = self._peek()
+            raise ValueError(f"Se esperaba {keyword}" + (f" y se encontró '{found[1]}'" if found else ""))
+
+    def _accept_op(self, op: str) -> bool:
+        if self._peek() == ('op', op):
+            self.position += 1
+            return True
+        return False
+
+    def _expect_name(self) -> str:
+        kind, text = self._next()
+        if kind != 'name':
+            raise ValueError(f"Se esperaba un identificador y se encontró '{text}'")
+        return text
@@ -0,0 +1,68 @@
+# Cliente asyncio del servidor de consultas. Permite varias solicitudes en vuelo por conexión:
+# cada respuesta se asocia a su solicitud por el campo "id"
+
+import asyncio
+import itertools
+import json
+from typing import Any, Dict, Optional
+
+from server.query_server import DEFAULT_HOST, DEFAULT_PORT, STREAM_LIMIT
+
+class QueryClient:
+    def __init__(self):
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._waiting: Dict[int, asyncio.Future] = {}
+        self._ids = itertools.count(1)
+        self._receiver: Optional[asyncio.Task] = None
+
+    async def connect(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                      unix_path: Optional[str] = None) -> "QueryClient":
+        if unix_path:
+            self._reader, self._writer = await asyncio.open_unix_connection(unix_path, limit=STREAM_LIMIT)
+        else:
+            self._reader, self._writer = await asyncio.open_connection(host, port, limit=STREAM_LIMIT)
+        self._receiver = asyncio.ensure_future(self._receive())
+        return self
+
+    async def request(self, op: str, **params) -> Dict[str, Any]:
+        # Envía una solicitud y espera su respuesta; lanza RuntimeError si el servidor reporta error
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._waiting[request_id] = future
+        message = dict(params, op=op, id=request_id)
+        self._writer.write(json.dumps(message).encode('utf-8') + b'\n')
+        await self._writer.drain()
+        response = await future
+        if not response.get('ok'):
+            raise RuntimeError(response.get('error', 'Error desconocido'))
+        return response
+
+    async def lookup(self, table: str, value: Any, field: Optional[str] = None) -> list:
+        return (await self.request('lookup', table=table, field=field, value=value))['results']
+
+    async def _receive(self):
+        try:
+            while True:
+                line = await self._reader.readline()
+                if not line:
+                    break
+                response = json.loads(line)
+                future = self._waiting.pop(response.get('id'), None)
+                if future is not None and not future.done():
+                    future.set_result(response)
+        finally:
+            for future in self._waiting.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("Conexión cerrada por el servidor"))
+            self._waiting.clear()
+
+    async def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            try:
+                await self._writer.wait_closed()
+            except ConnectionError:
+                pass
+        if self._receiver is not None:
+            await asyncio.gather(self._receiver, return_exceptions=True)
@@ -0,0 +1,136 @@
+# Generador de carga para el servidor de consultas: varias conexiones con búsquedas puntuales
+# concurrentes sobre claves al azar. Mide rendimiento, latencias y el tamaño medio de los lotes.
+# Con --spawn levanta en el mismo proceso un servidor sobre un disco temporal con datos sintéticos
+#
+# Uso: python server/load_generator.py --spawn --rows 5000 --connections 8 --requests 5000
+#      python server/load_generator.py --port 7070 --table PRODUCTO
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+# Agregar el directorio src al path para importar módulos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import DEFAULT_SCHEMA, geometry_for, percentile
+from benchmarks.data_generator import DataGenerator, load_schema
+from engine.database import Database
+from server.client import QueryClient
+from server.query_server import DEFAULT_BATCH_WINDOW, DEFAULT_HOST, DEFAULT_PORT, QueryServer
+
+async def _worker(client: QueryClient, table: str, keys: List[Any], requests: int,
+                  concurrency: int, rng: random.Random, latencies: List[float]):
+    # Mantiene `concurrency` búsquedas en vuelo en la conexión hasta completar `requests`
+    remaining = requests
+
+    async def one():
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            start = time.perf_counter()
+            await client.lookup(table, rng.choice(keys))
+            latencies.append(1000 * (time.perf_counter() - start))
+
+    await asyncio.gather(*(one() for _ in range(concurrency)))
+
+async def run_load(host: str, port: int, unix_path: Optional[str], table: str, keys: List[Any],
+                   connections: int, requests: int, concurrency: int, seed: int) -> Dict[str, Any]:
+    clients = [await QueryClient().connect(host, port, unix_path) for _ in range(connections)]
+    before = (await clients[0].request('status'))['status']['server']
+    latencies: List[float] = []
+    rng = random.Random(seed)
+    per_client = [requests // connections + (1 if i < requests % connections else 0) for i in range(connections)]
+    start = time.perf_counter()
+    await asyncio.gather(*(_worker(client, table, keys, count, concurrency, rng, latencies)
+                           for client, count in zip(clients, per_client)))
+    elapsed = time.perf_counter() - start
+    after = (await clients[0].request('status'))['status']['server']
+    for client in clients:
+        await client.close()
+    batches = after['batches'] - before['batches']
+    return {
+        'requests': len(latencies),
+        'connections': connections,
+        'concurrency': concurrency,
+        'seconds': elapsed,
+        'requests_per_sec': len(latencies) / elapsed if elapsed else None,
+        'latency_p50_ms': percentile(latencies, 50),
+        'latency_p99_ms': percentile(latencies, 99),
+        'batches': batches,
+        'avg_batch_size': (after['batched_lookups'] - before['batched_lookups']) / batches if batches else None
+    }
+
+async def spawn_and_run(args) -> Dict[str, Any]:
+    # Servidor en proceso sobre un disco temporal cargado con datos sintéticos
+    schema = load_schema(args.schema)
+    with open(args.schema, 'r', encoding='utf-8') as f:
+        sql = f.read()
+    with tempfile.TemporaryDirectory() as tmp:
+        generator = DataGenerator(schema, seed=args.seed)
+        csv_path = generator.write_csv(os.path.join(tmp, 'data.csv'), args.rows)
+        db = Database(geometry_for(args.rows, schema['record_size'], headroom=2.0), os.path.join(tmp, 'server.bin'))
+        db.create_tables(sql)
+        db.load_csv(schema['table_name'], csv_path)
+        server = QueryServer(db, args.batch_window_ms / 1000)
+        await server.start(args.host, 0)
+        host, port = server.address()[:2]
+        keys = [db.parse_value(schema['table_name'], schema['primary_key'], row[schema['primary_key']])
+                for row in generator.rows(args.rows)]
+        try:
+            return await run_load(host, port, None, schema['table_name'], keys, args.connections,
+                                  args.requests, args.concurrency, args.seed)
+        finally:
+            await server.stop()
+
+async def connect_and_run(args) -> Dict[str, Any]:
+    # Claves tomadas del propio servidor con una consulta por rango sobre la clave primaria
+    client = await QueryClient().connect(args.host, args.port, args.unix)
+    tables = (await client.request('status'))['status']['tables']
+    table = next((t for t in tables if t['name'].lower() == (args.table or tables[0]['name']).lower()), None)
+    if table is None:
+        raise ValueError(f"Tabla desconocida: {args.table}")
+    rows = (await client.request('range', table=table['name'], field=table['primary_key'],
+                                 limit=args.key_sample))['results']
+    await client.close()
+    keys = [row[table['primary_key']] for row in rows]
+    if not keys:
+        raise ValueError("La tabla no tiene registros")
+    return await run_load(args.host, args.port, args.unix, table['name'], keys, args.connections,
+                          args.requests, args.concurrency, args.seed)
+
+def main():
+    parser = argparse.ArgumentParser(description="Generador de carga para el servidor de consultas")
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--unix', help="Socket Unix del servidor")
+    parser.add_argument('--table', help="Tabla a consultar (por defecto la primera)")
+    parser.add_argument('--key-sample', type=int, default=1000, help="Claves a pedir al servidor")
+    parser.add_argument('--spawn', action='store_true', help="Levanta un servidor temporal en el mismo proceso")
+    parser.add_argument('--schema', default=DEFAULT_SCHEMA)
+    parser.add_argument('--rows', type=int, default=5000)
+    parser.add_argument('--batch-window-ms', type=float, default=DEFAULT_BATCH_WINDOW * 1000)
+    parser.add_argument('--connections', type=int, default=8)
+    parser.add_argument('--concurrency', type=int, default=16, help="Solicitudes en vuelo por conexión")
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--json', action='store_true')
+    args = parser.parse_args()
+
+    result = asyncio.run(spawn_and_run(args) if args.spawn else connect_and_run(args))
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+    print(f"{result['requests']:,} búsquedas en {result['seconds']:.2f} s "
+          f"({result['requests_per_sec']:,.0f}/s) con {result['connections']} conexiones")
+    print(f"Latencia p50 {result['latency_p50_ms']:.2f} ms, p99 {result['latency_p99_ms']:.2f} ms")
+    if result['avg_batch_size']:
+        print(f"{result['batches']:,} lotes, {result['avg_batch_size']:.1f} búsquedas por lote en promedio")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+# Servidor asyncio de consultas con protocolo JSON por líneas (TCP o socket Unix).
+#
+# Cada línea es un objeto JSON con "op" y un "id" opcional que se devuelve en la respuesta:
+#   {"id": 1, "op": "lookup", "table": "PRODUCTO", "field": "index", "value": 5}
+#   {"id": 2, "op": "range", "table": "PRODUCTO", "field": "cost", "low": 2, "high": 5, "limit": 10}
+#   {"id": 3, "op": "insert", "table": "PRODUCTO", "record": {"index": 11, "item": "x", ...}}
+#   {"id": 4, "op": "status"}        {"id": 5, "op": "save"}
+# Respuesta: {"id": ..., "ok": true, ...} o {"id": ..., "ok": false, "error": "..."}
+#
+# Las búsquedas puntuales que llegan dentro de una ventana corta se agrupan en una sola llamada
+# a Database.lookup_many: una pasada por el índice y cada sector necesario leído una vez
+#
+# Uso: python server/query_server.py --disk ../data/virtual_disk.bin --port 7070 [--unix ruta]
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+# Agregar el directorio src al path para importar módulos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_management.data_validator import DataValidator
+from engine.database import Database, DEFAULT_DISK_FILE
+from query.planner import QueryPlanner
+from query.sql_parser import Condition, SelectStatement
+from storage.disk import DiskGeometry, read_geometry
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 7070
+DEFAULT_BATCH_WINDOW = 0.002  # Segundos que se esperan para agrupar búsquedas puntuales
+DEFAULT_MAX_BATCH = 256
+STREAM_LIMIT = 1024 * 1024    # Largo máximo de una línea de solicitud
+
+class QueryServer:
+    # Atiende solicitudes sobre un Database. Todas las operaciones corren en el hilo del bucle
+    # de eventos, así que el motor (que no es seguro entre hilos) nunca se usa en paralelo
+
+    def __init__(self, db: Database, batch_window: float = DEFAULT_BATCH_WINDOW,
+                 max_batch: int = DEFAULT_MAX_BATCH):
+        self.db = db
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self._pending: List[Tuple[str, str, Any, asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self.stats = {'connections': 0, 'requests': 0, 'errors': 0, 'batches': 0, 'batched_lookups': 0}
+
+    # ----------------------- Ciclo de vida -----------------------
+    async def start(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                    unix_path: Optional[str] = None) -> asyncio.AbstractServer:
+        if unix_path:
+            self._server = await asyncio.start_unix_server(self._handle_connection, unix_path, limit=STREAM_LIMIT)
+        else:
+            self._server = await asyncio.start_server(self._handle_connection, host, port, limit=STREAM_LIMIT)
+        return self._server
+
+    def address(self) -> Any:
+        return self._server.sockets[0].getsockname() if self._server else None
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        self._flush()
+        self.db.save()
+
+    # ----------------------- Conexiones -----------------------
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.stats['connections'] += 1
+        tasks = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                # Cada solicitud se atiende en su propia tarea para que las búsquedas de una misma
+                # conexión puedan agruparse; las respuestas llevan el id de la solicitud
+                task = asyncio.ensure_future(self._respond(line, writer))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+            writer.close()
+
+    async def _respond(self, line: bytes, writer: asyncio.StreamWriter):
+        request_id = None
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("La solicitud debe ser un objeto JSON")
+            request_id = request.get('id')
+            response = await self.handle(request)
+            response['ok'] = True
+        except Exception as e:
+            self.stats['errors'] += 1
+            response = {'ok': False, 'error': str(e)}
+        response['id'] = request_id
+        writer.write(json.dumps(response, default=str).encode('utf-8') + b'\n')
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+
+    async def handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        # Ejecuta una solicitud ya decodificada y retorna el cuerpo de la respuesta
+        self.stats['requests'] += 1
+        op = request.get('op')
+        if op == 'lookup':
+            table = request['table']
+            field = request.get('field') or self.db.get_schema(table)['primary_key']
+            value = self._typed(table, field, request['value'])
+            return {'results': await self.lookup(table, field, value)}
+        if op == 'range':
+            return {'results': self.range(request['table'], request['field'], request.get('low'),
+                                          request.get('high'), request.get('limit'))}
+        if op == 'insert':
+            return {'address': list(self.insert(request['table'], request['record']))}
+        if op == 'status':
+            status = self.db.status()
+            status['server'] = dict(self.stats)
+            return {'status': status}
+        if op == 'save':
+            self.db.save()
+            return {}
+        raise ValueError(f"Operación desconocida: {op}")
+
+    # ----------------------- Operaciones -----------------------
+    def lookup(self, table: str, field: str, value: Any) -> asyncio.Future:
+        # Encola una búsqueda puntual; se resuelve junto con las demás de la misma ventana
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((table, field, value, future))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(self.batch_window, self._flush)
+        return future
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        pending, self._pending = self._pending, []
+        if not pending:
+            return
+        self.stats['batches'] += 1
+        self.stats['batched_lookups'] += len(pending)
+        groups: Dict[Tuple[str, str], List[Tuple[Any, asyncio.Future]]] = defaultdict(list)
+        for table, field, value, future in pending:
+            groups[(table, field)].append((value, future))
+        for (table, field), requests in groups.items():
+            try:
+                results = self.db.lookup_many(table, field, [value for value, _ in requests])
+            except Exception:
+                # Si el lote falla se repite cada valor por separado, así el error solo llega a la
+                # solicitud que lo causó y no a las demás del mismo lote
+                self._resolve_one_by_one(table, field, requests)
+                continue
+            for value, future in requests:
+                if not future.done():
+                    future.set_result(results.get(value, []))
+
+    def _resolve_one_by_one(self, table: str, field: str, requests: List[Tuple[Any, asyncio.Future]]):
+        for value, future in requests:
+            if future.done():
+                continue
+            try:
+                future.set_result(self.db.lookup_many(table, field, [value]).get(value, []))
+            except Exception as e:
+                future.set_exception(e)
+
+    def range(self, table: str, field: str, low: Any, high: Any, limit: Optional[int]) -> List[Dict[str, Any]]:
+        # Rango inclusivo sobre un campo; un extremo None queda abierto
+        if low is not None and high is not None:
+            conditions = [Condition(field, 'BETWEEN', low, high)]
+        elif low is not None:
+            conditions = [Condition(field, '>=', low)]
+        elif high is not None:
+            conditions = [Condition(field, '<=', high)]
+        else:
+            conditions = []
+        statement = SelectStatement(table=table, conditions=conditions, order_by=field, limit=limit)
+        planner = QueryPlanner(self.db)
+        return planner.execute(planner.plan(statement)).rows
+
+    def insert(self, table: str, record: Dict[str, Any]) -> Tuple[int, int]:
+        schema = self.db.get_schema(table)
+        validated = DataValidator().validate_record({k.lower(): v for k, v in record.items()}, schema)
+        return self.db.insert(table, validated)
+
+    def _typed(self, table: str, field: str, value: Any) -> Any:
+        # Los valores JSON ya tienen tipo; los textos se convierten según el campo. Se valida aquí,
+        # al recibir la solicitud, para que un valor inválido no haga fallar al resto del lote
+        spec = next((f for f in self.db.get_schema(table)['fields'] if f['name'] == field), None)
+        if spec is None:
+            raise ValueError(f"Campo desconocido: {field}")
+        field_type = spec['type']
+        is_bool_field = field_type in ('BOOLEAN', 'BOOL')
+        if value is None or isinstance(value, (list, dict)):
+            raise ValueError(f"Valor de búsqueda inválido para {field}: {json.dumps(value)}")
+        if isinstance(value, bool) and not is_bool_field:
+            raise ValueError(f"El campo {field} ({field_type}) no acepta valores booleanos")
+        if isinstance(value, str):
+            value = self.db.parse_value(table, field, value)
+        if 'INT' in field_type:
+            if isinstance(value, float) and value.is_integer():
+                value = int(value)
+            valid = isinstance(value, int) and not isinstance(value, bool)
+        elif field_type in ('DECIMAL', 'FLOAT', 'DOUBLE'):
+            valid = isinstance(value, (int, float)) and not isinstance(value, bool)
+            value = float(value) if valid else value
+        elif is_bool_field:
+            valid = isinstance(value, bool)
+        else:
+            valid = True
+            value = self.db.parse_value(table, field, str(value))
+        if not valid:
+            raise ValueError(f"Valor de búsqueda inválido para {field} ({field_type}): {json.dumps(value)}")
+        return value
+
+async def serve(db: Database, host: str, port: int, unix_path: Optional[str],
+                batch_window: float, max_batch: int):
+    server = QueryServer(db, batch_window, max_batch)
+    await server.start(host, port, unix_path)
+    print(f"Servidor escuchando en {unix_path or f'{host}:{port}'}", flush=True)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+
+def open_database(args) -> Database:
+    # Un disco existente se abre con la geometría de su superbloque; si no lo tiene (disco nuevo o
+    # anterior al superbloque) se usa la geometría de los argumentos
+    try:
+        read_geometry(args.disk)
+    except ValueError:
+        return Database(DiskGeometry(args.platters, args.tracks, args.sectors, args.sector_size), args.disk)
+    return Database.open(args.disk)
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor de consultas del simulador (JSON por líneas)")
+    parser.add_argument('--disk', default=DEFAULT_DISK_FILE)
+    # La geometría solo se usa al crear un disco (o con discos anteriores al superbloque)
+    parser.add_argument('--platters', type=int, default=2)
+    parser.add_argument('--tracks', type=int, default=4)
+    parser.add_argument('--sectors', type=int, default=8)
+    parser.add_argument('--sector-size', type=int, default=64)
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--unix', help="Ruta de un socket Unix en lugar de TCP")
+    parser.add_argument('--batch-window-ms', type=float, default=DEFAULT_BATCH_WINDOW * 1000)
+    parser.add_argument('--max-batch', type=int, default=DEFAULT_MAX_BATCH)
+    args = parser.parse_args()
+
+    db = open_database(args)
+    try:
+        asyncio.run(serve(db, args.host, args.port, args.unix, args.batch_window_ms / 1000, args.max_batch))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+# Catálogo persistente de tablas: esquema, extents de sectores e índices de cada tabla
+
+import os
+import pickle
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from data_management.column_statistics import TableStatistics
+from indexing.avl_tree import AVL
+from .clustered_store import ClusteredSectorManager, ClusteredState
+from .compressed_store import CompressedExtentState, CompressedSectorManager
+from .disk import Disk
+from .sector_manager import ExtentSectorManager, SectorManager
+from .serialization import create_serializer
+
+DEFAULT_EXTENT_SECTORS = 16  # Sectores contiguos reservados cada vez que una tabla crece
+
+@dataclass
+class TableEntry:
+    # Estado de una tabla dentro del catálogo
+    schema: Dict[str, Any]
+    extent_sectors: int = DEFAULT_EXTENT_SECTORS
+    extents: List[Tuple[int, int]] = field(default_factory=list)  # (sector inicial, cantidad)
+    primary_index: AVL = field(default_factory=AVL)
+    secondary_indexes: Dict[str, AVL] = field(default_factory=dict)
+    compression: Optional[CompressedExtentState] = None  # Solo en tablas con COMPRESSION=ZLIB/LZMA
+    row_count: int = 0
+    statistics: Optional[TableStatistics] = None  # Estadísticas de columna acumuladas en las inserciones
+    clustered: Optional[ClusteredState] = None  # Solo en tablas con ORGANIZATION=CLUSTERED
+
+    @property
+    def name(self) -> str:
+        return self.schema['table_name']
+
+    @property
+    def allocated_sectors(self) -> int:
+        return sum(count for _, count in self.extents)
+
+class Catalog:
+    # Registra varias tablas en un mismo disco. Cada tabla reserva extents propios para que sus
+    # filas queden agrupadas físicamente, y se guarda junto al disco en '<archivo>.catalog'
+
+    def __init__(self, disk: Disk):
+        self.disk = disk
+        self.tables: Dict[str, TableEntry] = {}
+        self._managers: Dict[str, ExtentSectorManager] = {}
+        self._load()
+
+    def _catalog_filename(self) -> str:
+        return self.disk.filename + ".catalog"
+
+    def _load(self):
+        # Carga el catálogo desde archivo si existe
+        if os.path.exists(self._catalog_filename()):
+            with open(self._catalog_filename(), 'rb') as f:
+                self.tables = pickle.load(f)
+
+    def save(self):
+        # Guarda el catálogo (esquemas, extents e índices) después de escribir los grupos comprimidos pendientes
+        for manager in self._managers.values():
+            manager.flush()
+        with open(self._catalog_filename(), 'wb') as f:
+            pickle.dump(self.tables, f)
+
+    def create_table(self, schema: Dict[str, Any], extent_sectors: int = DEFAULT_EXTENT_SECTORS) -> TableEntry:
+        # Registra una tabla nueva con un índice AVL primario y uno secundario por campo
+        name = schema['table_name']
+        if self._find_name(name) is not None:
+            raise ValueError(f"La tabla '{name}' ya existe")
+        if extent_sectors <= 0:
+            raise ValueError("El tamaño de extent debe ser positivo")
+        entry = TableEntry(schema=schema, extent_sectors=extent_sectors, statistics=TableStatistics(schema))
+        if schema.get('compression', 'NONE') != 'NONE':
+            entry.compression = CompressedExtentState(algorithm=schema['compression'])
+        if schema.get('organization', 'HEAP') == 'CLUSTERED':
+            entry.clustered = ClusteredState()
+        for table_field in schema['fields']:
+            entry.secondary_indexes[table_field['name']] = AVL()
+        self.tables[name] = entry
+        self.save()
+        return entry
+
+    def get_table(self, name: str) -> TableEntry:
+        key = self._find_name(name)
+        if key is None:
+            raise ValueError(f"Tabla desconocida: {name}")
+        return self.tables[key]
+
+    def has_table(self, name: str) -> bool:
+        return self._find_name(name) is not None
+
+    def table_names(self) -> List[str]:
+        return list(self.tables.keys())
+
+    def get_sector_manager(self, name: str) -> SectorManager:
+        # Administrador de sectores limitado a los extents de la tabla (comprimidos o agrupados si corresponde)
+        entry = self.get_table(name)
+        if entry.name not in self._managers:
+            if entry.compression is not None:
+                manager = CompressedSectorManager(self.disk, entry.compression, entry.extents)
+            elif entry.clustered is not None:
+                manager = ClusteredSectorManager(self.disk, entry.extents, lambda: self.allocate_extent(entry.name),
+                                                 entry.clustered, self._primary_key_reader(entry))
+            else:
+                manager = ExtentSectorManager(self.disk, entry.extents, lambda: self.allocate_extent(entry.name))
+            self._managers[entry.name] = manager
+        return self._managers[entry.name]
+
+    def _primary_key_reader(self, entry: TableEntry):
+        # Función que extrae la clave primaria de un registro serializado
+        serializer = create_serializer(entry.schema)
+        primary_key = entry.schema['primary_key']
+        return lambda data: serializer.deserialize_record(data, entry.schema)[primary_key]
+
+    def allocate_extent(self, name: str) -> Optional[Tuple[int, int]]:
+        # Reserva un rango contiguo de sectores libres para la tabla. Si no hay un rango del
+        # tamaño preferido se usa el rango libre más grande antes de fallar.
+        # El mapa de sectores se guarda de inmediato; el catálogo se guarda con save() al terminar la carga
+        entry = self.get_table(name)
+        size = min(entry.extent_sectors, self.disk.sector_map.extents.largest())
+        if size == 0:
+            return None
+        extent = (self.disk.allocate_sectors(size), size)
+        entry.extents.append(extent)
+        return extent
+
+    def _find_name(self, name: str) -> Optional[str]:
+        # Los nombres de tabla no distinguen mayúsculas
+        for key in self.tables:
+            if key.lower() == name.lower():
+                return key
+        return None
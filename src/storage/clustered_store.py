@@ -0,0 +1,240 @@
+# Tablas agrupadas (ORGANIZATION=CLUSTERED): las filas se guardan ordenadas por clave primaria en
+# páginas de sectores contiguos. Una inserción reescribe su página y, si no cabe, la divide
+
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from .disk import Disk
+from .record_format import OFFSET_END
+from .sector_manager import ExtentSectorManager
+
+DEFAULT_PAGE_SECTORS = 4    # Sectores contiguos por página
+DEFAULT_FILL_FACTOR = 0.9   # Ocupación de una página durante la carga ordenada antes de abrir otra
+
+# (clave, dirección, datos) de un registro dentro de una página
+PageItem = Tuple[Any, Optional[Tuple[int, int]], bytes]
+# (dirección anterior, dirección nueva, datos) de un registro que cambió de lugar
+Move = Tuple[Tuple[int, int], Tuple[int, int], bytes]
+
+@dataclass
+class ClusteredState:
+    # Directorio persistente de una tabla agrupada: primera clave e inicio de cada página en
+    # orden de clave, y páginas ya reservadas en los extents que todavía no se usan
+    page_sectors: int = DEFAULT_PAGE_SECTORS
+    fill_factor: float = DEFAULT_FILL_FACTOR
+    keys: List[Any] = field(default_factory=list)
+    starts: List[int] = field(default_factory=list)
+    free_pages: List[int] = field(default_factory=list)
+    splits: int = 0
+
+class ClusteredSectorManager(ExtentSectorManager):
+    # Cada página guarda sus registros ordenados por clave con el formato de fragmentos habitual,
+    # y las cadenas nunca salen de la página. Las direcciones cambian cuando se reescribe una
+    # página: insert_record informa los registros movidos para actualizar los índices
+
+    def __init__(self, disk: Disk, extents: List[Tuple[int, int]],
+                 allocate_extent: Callable[[], Optional[Tuple[int, int]]],
+                 state: ClusteredState, key_of: Callable[[bytes], Any]):
+        super().__init__(disk, extents, allocate_extent)
+        self.state = state
+        self._key_of = key_of
+        self._page_cache: Dict[int, List[PageItem]] = {}  # Última página escrita, ya decodificada
+
+    @property
+    def page_bytes(self) -> int:
+        return self.state.page_sectors * self.disk.sector_size
+
+    # ----------------------- Escritura -----------------------
+    def write_record(self, data: bytes) -> Tuple[int, int]:
+        raise ValueError("En una tabla agrupada los registros se escriben con insert_record")
+
+    def free_sectors(self, sector: int, offset: int) -> bool:
+        raise ValueError("Las tablas agrupadas no admiten liberar registros sueltos")
+
+    def insert_record(self, key: Any, data: bytes) -> Tuple[Tuple[int, int], List[Move]]:
+        # Inserta el registro en la página que le corresponde por clave. Retorna su dirección y
+        # los registros que cambiaron de dirección al reescribir o dividir páginas
+        state = self.state
+        if self._layout(0, [data]) is None:
+            raise ValueError("El registro no cabe en una página de la tabla agrupada")
+        if not state.starts:
+            start = self._new_page(None)
+            state.keys.append(key)
+            state.starts.append(start)
+            return self._write_page(start, [(key, None, data)], [], self._layout(start, [data]))
+
+        index = max(0, bisect_right(state.keys, key) - 1)
+        start = state.starts[index]
+        items = self._page_items(start)
+        old = [item[1] for item in items]
+        position = bisect_right([item[0] for item in items], key)
+        items.insert(position, (key, None, data))
+        if index == 0 and key < state.keys[0]:
+            state.keys[0] = key
+
+        appending = index == len(state.starts) - 1 and position == len(items) - 1
+        layout = self._layout(start, [item[2] for item in items])
+        if layout is not None and not (appending and layout[2] > state.fill_factor * self.page_bytes
+                                       and len(items) > 1):
+            return self._write_page(start, items, old, layout)
+
+        # División: al agregar al final (carga ordenada) la página queda como estaba y el registro
+        # abre una página nueva; si no, se corta lo más cerca posible de la mitad donde ambas
+        # partes quepan
+        new_start = self._new_page(start)
+        if appending:
+            middle = len(items) - 1
+            left_layout = None
+            right_layout = self._layout(new_start, [data])
+        else:
+            middle, left_layout, right_layout = self._split_point(start, new_start, items)
+        left, right = items[:middle], items[middle:]
+        state.keys.insert(index + 1, right[0][0])
+        state.starts.insert(index + 1, new_start)
+        if not appending:
+            state.splits += 1
+        address, moves = self._write_page(new_start, right, [item[1] for item in right], right_layout)
+        if left_layout is not None:
+            left_address, left_moves = self._write_page(start, left, old[:middle], left_layout)
+            moves += left_moves
+            if address is None:
+                address = left_address
+        else:
+            self._page_cache[start] = left
+        return address, moves
+
+    def _split_point(self, start: int, new_start: int, items: List[PageItem]):
+        # Índice de corte más cercano a la mitad con el que ambas páginas caben, y sus contenidos
+        half = len(items) // 2
+        for middle in sorted(range(1, len(items)), key=lambda m: abs(m - half)):
+            left = self._layout(start, [item[2] for item in items[:middle]])
+            right = self._layout(new_start, [item[2] for item in items[middle:]])
+            if left is not None and right is not None:
+                return middle, left, right
+        raise ValueError("No se puede dividir la página de la tabla agrupada")
+
+    def _write_page(self, start: int, items: List[PageItem], old: List[Optional[Tuple[int, int]]],
+                    layout) -> Tuple[Optional[Tuple[int, int]], List[Move]]:
+        # Escribe la página completa con una sola operación de E/S. Retorna la dirección del
+        # registro nuevo (el que no tenía dirección) y los movimientos de los demás
+        buffer, addresses, _ = layout
+        for address in old:
+            if address is not None:
+                self._notify(*address)
+        self._write_at(start, 0, bytes(buffer))
+        self.disk.stats.count('fragments_written', len(items))
+        new_address = None
+        moves: List[Move] = []
+        placed: List[PageItem] = []
+        for (key, previous, data), address in zip(items, addresses):
+            if previous is None:
+                new_address = address
+            elif previous != address:
+                moves.append((previous, address, data))
+            placed.append((key, address, data))
+            self._notify(*address)
+        self._page_cache = {start: placed}
+        return new_address, moves
+
+    def _layout(self, start: int, records: List[bytes]) -> Optional[Tuple[bytearray, List[Tuple[int, int]], int]]:
+        # Ubica los registros en la página con las mismas reglas que _write_fragments. Retorna
+        # el contenido de la página, la dirección de cada registro y los bytes ocupados, o None
+        # si no caben
+        size = self.disk.sector_size
+        header_size = self.header_size
+        buffer = bytearray(self.page_bytes)
+        addresses = []
+        sector_index = 0
+        offset = 0
+        for data in records:
+            fragments = []
+            position = 0
+            while True:
+                if size - offset <= header_size:
+                    sector_index += 1
+                    offset = 0
+                if sector_index >= self.state.page_sectors:
+                    return None
+                fragment_size = min(len(data) - position, size - offset - header_size)
+                fragments.append((sector_index, offset, position, fragment_size))
+                position += fragment_size
+                offset += header_size + fragment_size
+                if position >= len(data):
+                    break
+            for i, (index, frag_offset, frag_position, fragment_size) in enumerate(fragments):
+                if i + 1 < len(fragments):
+                    next_sector, next_offset = start + fragments[i + 1][0], fragments[i + 1][1]
+                else:
+                    next_sector, next_offset = self.fragment_end, OFFSET_END
+                base = index * size + frag_offset
+                buffer[base:base + header_size] = self._pack_fragment_header(fragment_size, next_sector, next_offset)
+                buffer[base + header_size:base + header_size + fragment_size] = \
+                    data[frag_position:frag_position + fragment_size]
+            addresses.append((start + fragments[0][0], fragments[0][1]))
+        return buffer, addresses, sector_index * size + offset
+
+    def _page_items(self, start: int) -> List[PageItem]:
+        # Registros de una página en orden de clave, leídos con una sola operación de E/S
+        if start in self._page_cache:
+            return list(self._page_cache[start])
+        size = self.disk.sector_size
+        buffer = self._read_sectors(start, self.state.page_sectors)
+        items: List[PageItem] = []
+        continuations: Set[Tuple[int, int]] = set()
+        for index in range(self.state.page_sectors):
+            sector = start + index
+            for offset, _, _, _ in self._fragments_in_sector(buffer[index * size:(index + 1) * size]):
+                if (sector, offset) in continuations:
+                    continue
+                data, chain = self._read_chain(sector, offset, buffer, start)
+                continuations.update(chain)
+                items.append((self._key_of(data), (sector, offset), data))
+        return items
+
+    def _new_page(self, after: Optional[int]) -> int:
+        # Reserva una página libre; prefiere la contigua a `after` para conservar el orden físico
+        state = self.state
+        if not state.free_pages:
+            extent = self._allocate_extent()
+            if extent is None:
+                raise Exception("No hay suficiente espacio en el disco para el registro")
+            extent_start, count = extent
+            usable = count - count % state.page_sectors
+            state.free_pages.extend(range(extent_start, extent_start + usable, state.page_sectors))
+            state.free_pages.sort()
+            if not state.free_pages:
+                raise Exception("El extent asignado es más chico que una página")
+        preferred = after + state.page_sectors if after is not None else None
+        page = preferred if preferred in state.free_pages else state.free_pages[0]
+        state.free_pages.remove(page)
+        return page
+
+    # ----------------------- Recorridos -----------------------
+    def _scan_ranges(self, start_sector: int, end_sector: Optional[int]) -> List[Tuple[int, int]]:
+        # Páginas en orden de clave; las físicamente consecutivas se leen juntas
+        ranges: List[Tuple[int, int]] = []
+        for start in self.state.starts:
+            if start < start_sector or (end_sector is not None and start >= end_sector):
+                continue
+            if ranges and ranges[-1][0] + ranges[-1][1] == start:
+                ranges[-1] = (ranges[-1][0], ranges[-1][1] + self.state.page_sectors)
+            else:
+                ranges.append((start, self.state.page_sectors))
+        return ranges
+
+    def _continuations_before(self, start_sector: int) -> Set[Tuple[int, int]]:
+        # Las cadenas de fragmentos nunca cruzan el borde de una página
+        return set()
+
+    def get_clustering_stats(self) -> Dict[str, Any]:
+        # Páginas, divisiones y cuántas páginas consecutivas en clave también lo son en el disco
+        starts = self.state.starts
+        contiguous = sum(1 for a, b in zip(starts, starts[1:]) if b == a + self.state.page_sectors)
+        return {
+            'pages': len(starts),
+            'page_sectors': self.state.page_sectors,
+            'splits': self.state.splits,
+            'free_pages': len(self.state.free_pages),
+            'contiguous_ratio': contiguous / (len(starts) - 1) if len(starts) > 1 else 1.0
+        }
@@ -0,0 +1,193 @@
+# Archivo columnar para exportar tablas: las filas se guardan en bloques y, dentro de cada bloque,
+# una columna a continuación de la otra. El pie guarda por bloque y columna dónde empieza, cuántos
+# nulos tiene y su mínimo y máximo, así que un lector puede saltar bloques sin leerlos
+#
+#   magia (8) | versión (H) | largo del encabezado (I) | encabezado JSON (tabla y campos)
+#   bloque 0: columna 0 | columna 1 | ...
+#   bloque 1: ...
+#   pie JSON | offset del pie (Q) | largo del pie (I) | magia (8)
+#
+# Cada columna de un bloque es un mapa de nulos (un bit por fila, solo si hay nulos) seguido de los
+# valores: los numéricos y booleanos como arreglo little-endian del tipo del campo (los nulos como
+# cero), y los textos como offsets '<I' (filas + 1) seguidos de los bytes UTF-8 concatenados
+
+import json
+import struct
+from itertools import accumulate
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+COLUMNAR_MAGIC = b'DBSIMCF\x00'
+COLUMNAR_VERSION = 1
+_PREAMBLE = struct.Struct('<8s H I')
+_TRAILER = struct.Struct('<Q I 8s')
+
+# Tipos SQL -> formato de struct de cada valor (el resto de los tipos se guardan como texto)
+VALUE_FORMATS = {
+    'INTEGER': 'i',
+    'INT': 'i',
+    'BIGINT': 'q',
+    'SMALLINT': 'h',
+    'TINYINT': 'b',
+    'DECIMAL': 'd',
+    'FLOAT': 'f',
+    'DOUBLE': 'd',
+    'BOOLEAN': '?',
+    'BOOL': '?'
+}
+
+def _null_bitmap(values: Sequence[Any]) -> bytes:
+    bitmap = bytearray((len(values) + 7) // 8)
+    for i, value in enumerate(values):
+        if value is None:
+            bitmap[i >> 3] |= 1 << (i & 7)
+    return bytes(bitmap)
+
+def _null_positions(bitmap: bytes, rows: int) -> List[int]:
+    return [i for i in range(rows) if bitmap[i >> 3] & (1 << (i & 7))]
+
+class ColumnarWriter:
+    # Escribe los bloques a medida que llegan; en memoria solo queda el bloque actual y el pie
+
+    def __init__(self, path: str, table: str, fields: List[Dict[str, Any]]):
+        self.fields = [{'name': f['name'], 'type': f['type'], 'size': f['size']} for f in fields]
+        self.blocks: List[Dict[str, Any]] = []
+        self.rows = 0
+        self._file = open(path, 'wb')
+        header = json.dumps({'table': table, 'fields': self.fields}).encode('utf-8')
+        self._file.write(_PREAMBLE.pack(COLUMNAR_MAGIC, COLUMNAR_VERSION, len(header)) + header)
+
+    def __enter__(self) -> 'ColumnarWriter':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def write_block(self, columns: Dict[str, List[Any]]):
+        # Escribe un bloque con una lista de valores por campo (None para los nulos)
+        rows = len(columns[self.fields[0]['name']])
+        if rows == 0:
+            return
+        metadata = []
+        for field in self.fields:
+            values = columns[field['name']]
+            if len(values) != rows:
+                raise ValueError(f"La columna {field['name']} tiene {len(values)} valores en un bloque de {rows} filas")
+            offset = self._file.tell()
+            data, info = self._encode_column(field, values)
+            self._file.write(data)
+            info.update(offset=offset, length=len(data))
+            metadata.append(info)
+        self.blocks.append({'rows': rows, 'columns': metadata})
+        self.rows += rows
+
+    def _encode_column(self, field: Dict[str, Any], values: List[Any]):
+        nulls = values.count(None)
+        present = [v for v in values if v is not None] if nulls else values
+        parts = [_null_bitmap(values)] if nulls else []
+        value_format = VALUE_FORMATS.get(field['type'])
+        if value_format is not None:
+            if nulls:
+                values = [0 if v is None else v for v in values]
+            parts.append(struct.pack(f'<{len(values)}{value_format}', *values))
+        else:
+            encoded = [b'' if v is None else v.encode('utf-8') for v in values]
+            ends = [0]
+            ends.extend(accumulate(map(len, encoded)))
+            parts.append(struct.pack(f'<{len(ends)}I', *ends))
+            parts.append(b''.join(encoded))
+        info = {'nulls': nulls, 'min': min(present) if present else None, 'max': max(present) if present else None}
+        return b''.join(parts), info
+
+    def close(self):
+        if self._file.closed:
+            return
+        footer = json.dumps({'rows': self.rows, 'blocks': self.blocks}).encode('utf-8')
+        footer_offset = self._file.tell()
+        self._file.write(footer + _TRAILER.pack(footer_offset, len(footer), COLUMNAR_MAGIC))
+        self._file.close()
+
+class ColumnarReader:
+    # Lee un archivo columnar bloque por bloque, solo las columnas pedidas
+
+    def __init__(self, path: str):
+        self._file = open(path, 'rb')
+        magic, version, header_length = _PREAMBLE.unpack(self._file.read(_PREAMBLE.size))
+        if magic != COLUMNAR_MAGIC:
+            self._file.close()
+            raise ValueError(f"{path} no es un archivo columnar")
+        if version != COLUMNAR_VERSION:
+            self._file.close()
+            raise ValueError(f"Versión de archivo columnar desconocida: {version}")
+        header = json.loads(self._file.read(header_length))
+        self.table: str = header['table']
+        self.fields: List[Dict[str, Any]] = header['fields']
+        self._file.seek(-_TRAILER.size, 2)
+        footer_offset, footer_length, magic = _TRAILER.unpack(self._file.read(_TRAILER.size))
+        if magic != COLUMNAR_MAGIC:
+            self._file.close()
+            raise ValueError(f"El archivo columnar {path} está incompleto")
+        self._file.seek(footer_offset)
+        footer = json.loads(self._file.read(footer_length))
+        self.rows: int = footer['rows']
+        self.blocks: List[Dict[str, Any]] = footer['blocks']
+
+    def __enter__(self) -> 'ColumnarReader':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self._file.close()
+
+    def read_block(self, index: int, columns: Optional[List[str]] = None) -> Dict[str, List[Any]]:
+        # Valores de las columnas pedidas (todas por defecto) del bloque `index`
+        block = self.blocks[index]
+        names = [f['name'] for f in self.fields]
+        result = {}
+        for name in columns or names:
+            if name not in names:
+                raise ValueError(f"Columna desconocida: {name}")
+            position = names.index(name)
+            info = block['columns'][position]
+            self._file.seek(info['offset'])
+            result[name] = self._decode_column(self.fields[position], block['rows'], info,
+                                               self._file.read(info['length']))
+        return result
+
+    def _decode_column(self, field: Dict[str, Any], rows: int, info: Dict[str, Any], data: bytes) -> List[Any]:
+        start = (rows + 7) // 8 if info['nulls'] else 0
+        value_format = VALUE_FORMATS.get(field['type'])
+        if value_format is not None:
+            values = list(struct.unpack_from(f'<{rows}{value_format}', data, start))
+        else:
+            ends = struct.unpack_from(f'<{rows + 1}I', data, start)
+            text = data[start + 4 * (rows + 1):]
+            values = [text[ends[i]:ends[i + 1]].decode('utf-8') for i in range(rows)]
+        if info['nulls']:
+            for i in _null_positions(data[:start], rows):
+                values[i] = None
+        return values
+
+    def blocks_overlapping(self, field: str, low: Any = None, high: Any = None) -> List[int]:
+        # Bloques cuyo rango [mínimo, máximo] de `field` se cruza con [low, high], según el pie
+        position = next((i for i, f in enumerate(self.fields) if f['name'] == field), None)
+        if position is None:
+            raise ValueError(f"Columna desconocida: {field}")
+        selected = []
+        for index, block in enumerate(self.blocks):
+            info = block['columns'][position]
+            if info['min'] is None:
+                continue
+            if (low is not None and info['max'] < low) or (high is not None and info['min'] > high):
+                continue
+            selected.append(index)
+        return selected
+
+    def iter_rows(self, columns: Optional[List[str]] = None) -> Iterator[Dict[str, Any]]:
+        # Filas completas en el orden del archivo
+        for index in range(len(self.blocks)):
+            block = self.read_block(index, columns)
+            names = list(block)
+            for values in zip(*block.values()):
+                yield dict(zip(names, values))
@@ -0,0 +1,205 @@
+# Extents comprimidos: grupos de sectores lógicos que se comprimen como una unidad (zlib/lzma)
+
+import lzma
+import math
+import time
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .disk import Disk
+from .sector_manager import SectorManager
+
+DEFAULT_GROUP_SECTORS = 8   # Sectores lógicos comprimidos juntos
+DEFAULT_CACHE_GROUPS = 32   # Grupos descomprimidos que se mantienen en memoria
+MAX_DIRTY_GROUPS = 2        # Grupos en escritura antes de comprimirlos al disco
+
+COMPRESSORS = {
+    'ZLIB': (zlib.compress, zlib.decompress),
+    'LZMA': (lzma.compress, lzma.decompress)
+}
+
+@dataclass
+class CompressedExtentState:
+    # Directorio persistente de una tabla comprimida
+    algorithm: str = 'ZLIB'
+    group_sectors: int = DEFAULT_GROUP_SECTORS
+    logical_sectors: int = 0
+    # grupo -> (sector físico inicial, sectores físicos, bytes guardados, comprimido)
+    groups: Dict[int, Tuple[int, int, int, bool]] = field(default_factory=dict)
+
+class CompressedSectorManager(SectorManager):
+    # Administra una tabla en un espacio de sectores lógicos. Cada grupo de `group_sectors`
+    # sectores lógicos se guarda comprimido en un rango contiguo de sectores físicos, y las
+    # lecturas se sirven desde una caché LRU de grupos descomprimidos.
+    # Las direcciones (sector, offset) de los registros son lógicas: physical_sector() las traduce
+
+    def __init__(self, disk: Disk, state: CompressedExtentState, extents: List[Tuple[int, int]],
+                 cache_groups: int = DEFAULT_CACHE_GROUPS):
+        if state.algorithm not in COMPRESSORS:
+            raise ValueError(f"Algoritmo de compresión no soportado: {state.algorithm}")
+        super().__init__(disk)
+        self.state = state
+        self.extents = extents  # Rangos físicos ocupados por los grupos (lista compartida con el catálogo)
+        self.cache_groups = cache_groups
+        self._compress, self._decompress = COMPRESSORS[state.algorithm]
+        self._group_size = state.group_sectors * disk.sector_size
+        self._cache: "OrderedDict[int, bytes]" = OrderedDict()
+        self._dirty: "OrderedDict[int, bytearray]" = OrderedDict()
+        self._stats = {'cache_hits': 0, 'cache_misses': 0, 'cold_read_seconds': 0.0,
+                       'hot_read_seconds': 0.0}
+
+    # ----------------------- Espacio lógico -----------------------
+    def _sector_sequence(self) -> Sequence[int]:
+        return range(self.state.logical_sectors)
+
+    def _grow(self) -> bool:
+        # El espacio lógico crece de a un grupo; el espacio físico se reserva al comprimirlo
+        self.state.logical_sectors += self.state.group_sectors
+        return True
+
+    def _mark_used(self, sector: int):
+        pass
+
+    def _mark_free(self, sector: int):
+        pass
+
+    def _scan_ranges(self, start_sector: int, end_sector: Optional[int]) -> List[Tuple[int, int]]:
+        if end_sector is None or end_sector > self.state.logical_sectors:
+            end_sector = self.state.logical_sectors
+        return [(start_sector, end_sector - start_sector)] if end_sector > start_sector else []
+
+    def physical_sector(self, sector: int) -> Optional[int]:
+        # Primer sector físico del grupo comprimido que contiene al sector lógico, o None si el
+        # grupo tiene cambios en memoria que todavía no se comprimieron al disco
+        group = sector // self.state.group_sectors
+        if group in self._dirty or group not in self.state.groups:
+            return None
+        return self.state.groups[group][0]
+
+    def get_sector_status(self, sector: int) -> bool:
+        return 0 <= sector < self.state.logical_sectors
+
+    # ----------------------- Lectura y escritura -----------------------
+    def _read_sectors(self, start_sector: int, count: int = 1) -> bytes:
+        sector_size = self.disk.sector_size
+        parts = []
+        sector = start_sector
+        end = start_sector + count
+        while sector < end:
+            group, index = divmod(sector, self.state.group_sectors)
+            take = min(self.state.group_sectors - index, end - sector)
+            page = self._load_group(group)
+            parts.append(page[index * sector_size:(index + take) * sector_size])
+            sector += take
+        return b''.join(parts)
+
+    def _write_at(self, sector: int, offset: int, data: bytes):
+        group, index = divmod(sector, self.state.group_sectors)
+        if group not in self._dirty:
+            self._dirty[group] = bytearray(self._load_group(group))
+            self._cache.pop(group, None)
+        self._dirty.move_to_end(group)
+        position = index * self.disk.sector_size + offset
+        self._dirty[group][position:position + len(data)] = data
+        while len(self._dirty) > MAX_DIRTY_GROUPS:
+            self._seal_group(next(iter(self._dirty)))
+
+    def flush(self):
+        # Comprime y escribe al disco todos los grupos pendientes
+        for group in list(self._dirty):
+            self._seal_group(group)
+
+    def clear_cache(self):
+        self._cache.clear()
+
+    def _load_group(self, group: int) -> bytes:
+        # Página descomprimida del grupo: pendiente de escritura, en caché o leída del disco
+        if group in self._dirty:
+            return self._dirty[group]
+        entry = self.state.groups.get(group)
+        if entry is None:
+            return bytes(self._group_size)
+        start = time.perf_counter()
+        if group in self._cache:
+            self._cache.move_to_end(group)
+            self._stats['cache_hits'] += 1
+            self._stats['hot_read_seconds'] += time.perf_counter() - start
+            return self._cache[group]
+        self._stats['cache_misses'] += 1
+        physical_start, physical_sectors, stored_len, compressed = entry
+        blob = self.disk.read_sectors(physical_start, physical_sectors)[:stored_len]
+        page = self._decompress(blob) if compressed else blob
+        self._remember(group, page)
+        self._stats['cold_read_seconds'] += time.perf_counter() - start
+        return page
+
+    def _remember(self, group: int, page: bytes):
+        if self.cache_groups <= 0:
+            return
+        self._cache[group] = page
+        self._cache.move_to_end(group)
+        while len(self._cache) > self.cache_groups:
+            self._cache.popitem(last=False)
+
+    def _seal_group(self, group: int):
+        # Comprime el grupo y lo escribe en un rango contiguo de sectores físicos.
+        # Si no se comprime bien se guarda sin comprimir. El grupo sigue pendiente en memoria y el
+        # rango anterior sigue reservado hasta que la escritura nueva termina
+        page = bytes(self._dirty[group])
+        blob = self._compress(page)
+        compressed = len(blob) < len(page)
+        if not compressed:
+            blob = page
+        sector_size = self.disk.sector_size
+        needed = max(1, math.ceil(len(blob) / sector_size))
+
+        previous = self.state.groups.get(group)
+        if previous is not None and previous[1] >= needed:
+            physical_start, needed = previous[0], previous[1]
+            self.disk.write_at(physical_start, 0, blob.ljust(needed * sector_size, b'\x00'))
+        else:
+            physical_start = self.disk.allocate_sectors(needed)
+            if physical_start is None:
+                raise Exception("No hay suficiente espacio en el disco para el grupo comprimido")
+            try:
+                self.disk.write_at(physical_start, 0, blob.ljust(needed * sector_size, b'\x00'))
+            except Exception:
+                self.disk.release_sectors(physical_start, needed)
+                raise
+            self.extents.append((physical_start, needed))
+            if previous is not None:
+                self._release_run(previous[0], previous[1])
+
+        self.state.groups[group] = (physical_start, needed, len(blob), compressed)
+        del self._dirty[group]
+        self._remember(group, page)
+
+    def _release_run(self, start: int, count: int):
+        self.disk.release_sectors(start, count)
+        if (start, count) in self.extents:
+            self.extents.remove((start, count))
+
+    # ----------------------- Estadísticas -----------------------
+    def get_compression_stats(self) -> Dict:
+        # Razón de compresión y latencias de lectura con y sin caché. Solo cuenta los grupos ya
+        # escritos al disco: los pendientes se informan aparte (flush() los escribe)
+        uncompressed = len(self.state.groups) * self._group_size
+        stored = sum(entry[2] for entry in self.state.groups.values())
+        physical = sum(entry[1] for entry in self.state.groups.values())
+        hits, misses = self._stats['cache_hits'], self._stats['cache_misses']
+        return {
+            'algorithm': self.state.algorithm,
+            'groups': len(self.state.groups),
+            'pending_groups': len(self._dirty),
+            'logical_sectors': self.state.logical_sectors,
+            'physical_sectors': physical,
+            'uncompressed_bytes': uncompressed,
+            'stored_bytes': stored,
+            'compression_ratio': uncompressed / stored if stored else None,
+            'cache_hits': hits,
+            'cache_misses': misses,
+            'avg_cold_read_ms': 1000 * self._stats['cold_read_seconds'] / misses if misses else None,
+            'avg_hot_read_ms': 1000 * self._stats['hot_read_seconds'] / hits if hits else None
+        }
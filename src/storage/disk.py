@@ -6,6 +6,15 @@ from dataclasses import dataclass
 from typing import Dict, List, Optional
 import struct
 
+from diagnostics.io_stats import IOStats
+from .free_extents import SectorMap
+from .record_format import CURRENT_FORMAT, FragmentFormat, format_for
+from .superblock import SUPERBLOCK_BYTES, Superblock, read_superblock
+
+PLATTER_MAJOR = 'platter'    # Llena una superficie pista por pista antes de pasar a la siguiente
+CYLINDER_MAJOR = 'cylinder'  # Llena un cilindro en todos los platos y superficies antes de mover el cabezal
+LBA_MAPPINGS = (PLATTER_MAJOR, CYLINDER_MAJOR)
+
 @dataclass
 class DiskGeometry:
     # Estructura que define la geometría del disco virtual
@@ -13,74 +22,149 @@ class DiskGeometry:
     tracks: int        # Pistas por superficie
     sectors: int       # Sectores por pista
     sector_size: int   # Tamaño de sector en bytes
+    lba_mapping: str = PLATTER_MAJOR  # Orden en que los sectores lógicos recorren la geometría
     
     @property
     def surfaces(self):
         # Siempre 2 superficies por plato
         return 2
 
+def read_geometry(filename: str) -> DiskGeometry:
+    # Geometría guardada en el superbloque de un disco existente
+    superblock = read_superblock(filename)
+    if superblock is None:
+        raise ValueError(f"{filename} no existe o no tiene superbloque: indique la geometría del disco")
+    return DiskGeometry(superblock.platters, superblock.tracks, superblock.sectors,
+                        superblock.sector_size, superblock.lba_mapping)
+
 class Disk:
-    def __init__(self, geometry: DiskGeometry, filename: str = "data/virtual_disk.bin"):
-        # Inicializa el disco virtual con la geometría especificada
+    def __init__(self, geometry: DiskGeometry, filename: str = "data/virtual_disk.bin",
+                 format_version: Optional[int] = None):
+        # Inicializa el disco virtual con la geometría especificada. Los discos nuevos usan el
+        # formato de fragmentos actual salvo que se pida otro; los existentes, el que tienen guardado
+        if geometry.lba_mapping not in LBA_MAPPINGS:
+            raise ValueError(f"Orden de sectores desconocido: {geometry.lba_mapping}")
         self.geometry = geometry
         self.filename = filename
-        self.sector_map = {}
         self.total_sectors = geometry.platters * 2 * geometry.tracks * geometry.sectors
+        self.sector_map = SectorMap(self.total_sectors)  # Estado de cada sector y rangos libres
         self.sector_size = geometry.sector_size
         self.total_capacity = self.total_sectors * self.sector_size
+        self.stats = IOStats()  # Contadores de E/S y latencias
+        self._head_cylinder = 0  # Cilindro donde quedó el cabezal simulado
+        self._requested_format = format_version
+        self.record_format: FragmentFormat = format_for(format_version) if format_version else CURRENT_FORMAT
         
         dirpath = os.path.dirname(filename)
         if dirpath:
             os.makedirs(dirpath, exist_ok=True)
         
         if not os.path.exists(self.filename):
+            self.data_offset = SUPERBLOCK_BYTES  # Los sectores empiezan después del superbloque
             self._initialize_disk()
         else:
+            superblock = read_superblock(self.filename)
+            self.data_offset = SUPERBLOCK_BYTES if superblock is not None else 0
+            if superblock is not None:
+                self._check_superblock(superblock)
             self._load_sector_map()
+        self._check_format()
+
+    @classmethod
+    def open(cls, filename: str) -> 'Disk':
+        # Reabre un disco existente con la geometría guardada en su superbloque
+        return cls(read_geometry(filename), filename)
     
     def _initialize_disk(self):
-        # Crea un nuevo archivo de disco con todos los sectores inicializados a cero como libres
+        # Crea un nuevo archivo de disco con el superbloque y todos los sectores en cero y libres.
+        # El archivo se extiende sin escribir los ceros, así los discos grandes se crean al instante
+        self.stats.count('file_opens')
+        g = self.geometry
+        superblock = Superblock(g.platters, g.tracks, g.sectors, g.sector_size, g.lba_mapping,
+                                self.record_format.version)
         with open(self.filename, 'wb') as f:
-            f.write(b'\x00' * self.total_capacity)
+            f.write(superblock.pack())
+            f.truncate(self.data_offset + self.total_capacity)
         
-        self.sector_map = {i: False for i in range(self.total_sectors)}
+        self.sector_map = SectorMap(self.total_sectors)
         self._save_sector_map()
+
+    def _check_superblock(self, superblock: Superblock):
+        # La geometría pedida tiene que ser la del disco: con otra, los sectores quedarían mezclados
+        stored = DiskGeometry(superblock.platters, superblock.tracks, superblock.sectors,
+                              superblock.sector_size, superblock.lba_mapping)
+        if stored != self.geometry:
+            raise ValueError(f"El disco {self.filename} fue creado con otra geometría: {stored}")
+        self._set_format(superblock.format_version)
+
+    def _set_format(self, version: int):
+        if self._requested_format and self._requested_format != version:
+            raise ValueError(f"El disco {self.filename} usa el formato {version}, "
+                             f"no el {self._requested_format}")
+        self.record_format = format_for(version)
     
     def _save_sector_map(self):
-        # Guarda el mapa de sectores en un archivo separado
+        # Guarda el mapa de sectores (rangos ocupados) en un archivo separado
         map_filename = self.filename + ".map"
+        self.stats.count('file_opens')
+        self.stats.count('map_saves')
         with open(map_filename, 'wb') as f:
-            pickle.dump(self.sector_map, f)
+            pickle.dump({'format_version': self.record_format.version,
+                         'used_runs': self.sector_map.used_runs()}, f)
     
     def _load_sector_map(self):
         # Carga el mapa de sectores desde archivo
         map_filename = self.filename + ".map"
         if os.path.exists(map_filename):
+            self.stats.count('file_opens')
             with open(map_filename, 'rb') as f:
-                self.sector_map = pickle.load(f)
+                saved = pickle.load(f)
+            if 'used_runs' in saved:
+                self._set_format(saved['format_version'])
+                self.sector_map = SectorMap(self.total_sectors, used_runs=saved['used_runs'])
+            elif 'format_version' in saved:
+                # Mapa guardado sector por sector con el marcador de formato
+                self._set_format(saved['format_version'])
+                self.sector_map = SectorMap(self.total_sectors, saved['sectors'])
+            else:
+                self._set_format(1)  # Mapa anterior al marcador de formato
+                self.sector_map = SectorMap(self.total_sectors, saved)
         else:
             # Si no existe el mapa, inicializar todos como libres
-            self.sector_map = {i: False for i in range(self.total_sectors)}
+            self.sector_map = SectorMap(self.total_sectors)
             self._save_sector_map()
     
+    def _check_format(self):
+        # Con más sectores de los que el formato direcciona, las cadenas de fragmentos se romperían
+        if self.total_sectors > self.record_format.max_sectors:
+            raise ValueError(f"El formato {self.record_format.version} direcciona hasta "
+                             f"{self.record_format.max_sectors} sectores y el disco tiene {self.total_sectors}")
+
     def _get_physical_location(self, sector_num: int) -> Dict[str, int]:
-        # Convierte un número de sector lógico en coordenadas físicas (CHS - Cylinder-Head-Sector)
+        # Convierte un número de sector lógico en coordenadas físicas (CHS - Cylinder-Head-Sector).
+        # La pista de la superficie es el cilindro donde debe estar el cabezal
         if sector_num >= self.total_sectors:
             raise ValueError("Número de sector fuera de rango")
         
         sectors_per_track = self.geometry.sectors
         tracks_per_surface = self.geometry.tracks
+        heads = 2 * self.geometry.platters
         
-        sectors_remaining = sector_num
-        
-        platter = sectors_remaining // (2 * tracks_per_surface * sectors_per_track)
-        sectors_remaining %= (2 * tracks_per_surface * sectors_per_track)
-        
-        surface = sectors_remaining // (tracks_per_surface * sectors_per_track)
-        sectors_remaining %= (tracks_per_surface * sectors_per_track)
-        
-        track = sectors_remaining // sectors_per_track
-        sector = sectors_remaining % sectors_per_track
+        if self.geometry.lba_mapping == CYLINDER_MAJOR:
+            track, sectors_remaining = divmod(sector_num, heads * sectors_per_track)
+            head, sector = divmod(sectors_remaining, sectors_per_track)
+            platter, surface = divmod(head, 2)
+        else:
+            sectors_remaining = sector_num
+            
+            platter = sectors_remaining // (2 * tracks_per_surface * sectors_per_track)
+            sectors_remaining %= (2 * tracks_per_surface * sectors_per_track)
+            
+            surface = sectors_remaining // (tracks_per_surface * sectors_per_track)
+            sectors_remaining %= (tracks_per_surface * sectors_per_track)
+            
+            track = sectors_remaining // sectors_per_track
+            sector = sectors_remaining % sectors_per_track
         
         return {
             'platter': platter,
@@ -88,29 +172,77 @@ class Disk:
             'track': track,
             'sector': sector
         }
+
+    def _cylinder(self, sector: int) -> int:
+        # Cilindro (pista) de un sector lógico, sin armar las coordenadas completas
+        if self.geometry.lba_mapping == CYLINDER_MAJOR:
+            return sector // (2 * self.geometry.platters * self.geometry.sectors)
+        return (sector // self.geometry.sectors) % self.geometry.tracks
     
-    def find_free_sectors(self, num_sectors: int = 1) -> Optional[List[int]]:
-        # Encuentra sectores libres secuenciales en el disco
-        consecutive_free = 0
-        start_sector = None
-        
-        for sector in range(self.total_sectors):
-            if not self.sector_map.get(sector, False):
-                if consecutive_free == 0:
-                    start_sector = sector
-                consecutive_free += 1
-                
-                if consecutive_free >= num_sectors and start_sector is not None:
-                    return list(range(start_sector, start_sector + num_sectors))
-            else:
-                consecutive_free = 0
-        
-        return None
+    def read_sectors(self, start_sector: int, count: int = 1) -> bytes:
+        # Lee una región contigua de sectores con una sola operación de E/S
+        if start_sector < 0 or count < 0 or start_sector + count > self.total_sectors:
+            raise ValueError("Rango de sectores fuera del disco")
+        self._count_io('read_ops', 'bytes_read', start_sector, count, count * self.sector_size)
+        self.stats.count('sectors_read', count)
+        with open(self.filename, 'rb') as f:
+            f.seek(self.data_offset + start_sector * self.sector_size)
+            return f.read(count * self.sector_size)
+    
+    def write_at(self, sector: int, offset: int, data: bytes):
+        # Escribe bytes a partir de (sector, offset)
+        if sector < 0 or sector >= self.total_sectors:
+            raise ValueError("Número de sector fuera de rango")
+        end_sector = min(self.total_sectors, sector + (offset + len(data) + self.sector_size - 1) // self.sector_size)
+        self._count_io('write_ops', 'bytes_written', sector, end_sector - sector, len(data))
+        with open(self.filename, 'r+b') as f:
+            f.seek(self.data_offset + sector * self.sector_size + offset)
+            f.write(data)
+    
+    @property
+    def sectors_read(self) -> int:
+        return self.stats.counters['sectors_read']
+
+    def _count_io(self, operations: str, bytes_counter: str, start_sector: int, count: int, size: int):
+        # Registra una operación de E/S y el movimiento del cabezal hasta el primer y el último sector
+        self.stats.count('file_opens')
+        self.stats.count(operations)
+        self.stats.count(bytes_counter, size)
+        self._move_head(start_sector)
+        if count > 1:
+            self._move_head(start_sector + count - 1)
+
+    def _move_head(self, sector: int):
+        cylinder = self._cylinder(sector)
+        if cylinder != self._head_cylinder:
+            self.stats.count('head_moves')
+            self.stats.count('seek_distance', abs(cylinder - self._head_cylinder))
+            self._head_cylinder = cylinder
+
+    def find_free_sectors(self, num_sectors: int = 1, policy: str = 'best') -> Optional[List[int]]:
+        # Encuentra sectores libres secuenciales en el disco (sin reservarlos) usando los rangos libres
+        start = self.sector_map.extents.find(num_sectors, policy)
+        return list(range(start, start + num_sectors)) if start is not None else None
+
+    def allocate_sectors(self, num_sectors: int, policy: str = 'best') -> Optional[int]:
+        # Reserva un rango contiguo de sectores libres, guarda el mapa y retorna el primer sector
+        start = self.sector_map.extents.find(num_sectors, policy)
+        if start is None:
+            return None
+        self.sector_map.mark_run(start, num_sectors, True)
+        self._save_sector_map()
+        return start
+
+    def release_sectors(self, start_sector: int, num_sectors: int):
+        # Devuelve un rango de sectores a los rangos libres (se fusiona con los vecinos)
+        self.sector_map.mark_run(start_sector, num_sectors, False)
+        self._save_sector_map()
     
     def get_disk_status(self) -> Dict:
         # Devuelve estadísticas detalladas del disco
-        used_sectors = sum(1 for occupied in self.sector_map.values() if occupied)
-        free_sectors = self.total_sectors - used_sectors
+        extents = self.sector_map.extents
+        used_sectors = extents.used_count
+        free_sectors = extents.free_count
         
         return {
             'total_sectors': self.total_sectors,
@@ -123,5 +255,9 @@ class Disk:
             'platters': self.geometry.platters,
             'tracks_per_surface': self.geometry.tracks,
             'sectors_per_track': self.geometry.sectors,
-            'surfaces_per_platter': 2
+            'surfaces_per_platter': 2,
+            'lba_mapping': self.geometry.lba_mapping,
+            'format_version': self.record_format.version,
+            'free_extents': extents.run_count,
+            'largest_free_extent': extents.largest()
         }
\ No newline at end of file
@@ -0,0 +1,315 @@
+# Rangos de sectores libres ordenados por inicio y por largo, para asignar sectores contiguos
+# sin recorrer todo el mapa de sectores
+
+import threading
+import time
+from bisect import bisect_left, bisect_right, insort
+from typing import Dict, Iterable, Iterator, List, Mapping, MutableMapping, Optional, Tuple
+
+ALLOCATION_POLICIES = ('best', 'first')
+SECTOR_MAP_PAGE = 1024  # Sectores por página del mapa que se copia antes de modificarla
+
+class _RunTree:
+    # Árbol de segmentos disperso sobre las direcciones del disco: cada hoja es el inicio de un
+    # rango libre con su largo, y cada nodo guarda el largo máximo de su subárbol. Solo existen
+    # los nodos con rangos debajo, así que la memoria crece con la cantidad de rangos y no con la
+    # del disco. Actualizar y buscar el primer rango que alcanza cuesta O(log total de sectores)
+
+    def __init__(self, size: int):
+        self._leaves = 1
+        while self._leaves < size:
+            self._leaves *= 2
+        self._max: Dict[int, int] = {}  # nodo (1 es la raíz; los hijos de n son 2n y 2n + 1) -> largo máximo
+
+    def build(self, runs: List[Tuple[int, int]]):
+        # Carga los rangos (inicio, largo) de una vez, nivel por nivel
+        level = {start + self._leaves: length for start, length in runs if length}
+        self._max = dict(level)
+        while level:
+            parents: Dict[int, int] = {}
+            for node, length in level.items():
+                parent = node >> 1
+                if parent and length > parents.get(parent, 0):
+                    parents[parent] = length
+            self._max.update(parents)
+            level = parents
+
+    def set(self, position: int, length: int):
+        # Fija el largo del rango que empieza en `position` (0 lo quita)
+        node = position + self._leaves
+        while True:
+            if length:
+                self._max[node] = length
+            else:
+                self._max.pop(node, None)
+            node >>= 1
+            if node == 0:
+                return
+            length = max(self._max.get(2 * node, 0), self._max.get(2 * node + 1, 0))
+            if self._max.get(node, 0) == length:
+                return  # Los ancestros ya tienen el valor correcto
+
+    def first(self, count: int) -> Optional[int]:
+        # Menor posición con un rango de al menos `count`, bajando por el hijo izquierdo si alcanza
+        if self._max.get(1, 0) < count:
+            return None
+        node = 1
+        while node < self._leaves:
+            node *= 2
+            if self._max.get(node, 0) < count:
+                node += 1
+        return node - self._leaves
+
+class FreeExtentMap:
+    # Mantiene los rangos libres (inicio, largo) en dos listas ordenadas: por inicio, para ubicar
+    # y fusionar vecinos, y por (largo, inicio), para el mejor ajuste con una búsqueda binaria.
+    # El primer ajuste usa un árbol de segmentos por dirección con el largo máximo de cada subárbol.
+    # Los contadores de sectores libres se actualizan en cada operación
+
+    def __init__(self, total_sectors: int, used: Iterable[int] = (),
+                 used_runs: Iterable[Tuple[int, int]] = ()):
+        # Los sectores ocupados pueden venir sueltos (`used`) o como rangos (inicio, largo)
+        self.total_sectors = total_sectors
+        runs = sorted(list(used_runs) + [(sector, 1) for sector in set(used)])
+        free: List[Tuple[int, int]] = []
+        previous = 0
+        for start, count in runs + [(total_sectors, 0)]:
+            if start > previous:
+                free.append((previous, start - previous))
+            previous = max(previous, start + count)
+        # Carga en bloque: los rangos ya salen ordenados por inicio
+        self._starts: List[int] = [start for start, _ in free]               # Inicios, ordenados
+        self._lengths: Dict[int, int] = dict(free)                           # inicio -> largo
+        self._by_length = sorted((length, start) for start, length in free)  # (largo, inicio), ordenados
+        self._by_address = _RunTree(total_sectors)                           # Primer ajuste
+        self._by_address.build(free)
+        self.free_count = sum(length for _, length in free)
+
+    @property
+    def used_count(self) -> int:
+        return self.total_sectors - self.free_count
+
+    @property
+    def run_count(self) -> int:
+        return len(self._starts)
+
+    def runs(self) -> List[Tuple[int, int]]:
+        return [(start, self._lengths[start]) for start in self._starts]
+
+    def largest(self) -> int:
+        return self._by_length[-1][0] if self._by_length else 0
+
+    def is_free(self, sector: int) -> bool:
+        return self._run_containing(sector) is not None
+
+    def find(self, count: int, policy: str = 'best') -> Optional[int]:
+        # Inicio de un rango libre de al menos `count` sectores sin reservarlo.
+        # 'best': el rango más corto que alcanza (búsqueda binaria por largo);
+        # 'first': el de menor dirección entre los que alcanzan (bajando por el árbol de segmentos)
+        if count <= 0:
+            raise ValueError("La cantidad de sectores debe ser positiva")
+        if policy not in ALLOCATION_POLICIES:
+            raise ValueError(f"Política de asignación desconocida: {policy}")
+        if policy == 'first':
+            return self._by_address.first(count)
+        position = bisect_left(self._by_length, (count, -1))
+        if position == len(self._by_length):
+            return None
+        return self._by_length[position][1]
+
+    def allocate(self, count: int, policy: str = 'best') -> Optional[int]:
+        # Reserva `count` sectores contiguos y retorna el primero (None si no hay un rango que alcance)
+        start = self.find(count, policy)
+        if start is not None:
+            self.reserve(start, count)
+        return start
+
+    def reserve(self, start: int, count: int = 1):
+        # Marca como usados los sectores [start, start + count), que deben estar libres
+        run = self._run_containing(start)
+        if run is None or start + count > run + self._lengths[run]:
+            raise ValueError(f"Los sectores {start}..{start + count - 1} no están libres")
+        length = self._lengths[run]
+        self._remove_run(run)
+        if start > run:
+            self._add_run(run, start - run)
+        end = start + count
+        if end < run + length:
+            self._add_run(end, run + length - end)
+
+    def release(self, start: int, count: int = 1):
+        # Marca como libres los sectores [start, start + count) y fusiona los rangos vecinos
+        if start < 0 or start + count > self.total_sectors:
+            raise ValueError(f"Sectores fuera de rango: {start}..{start + count - 1}")
+        position = bisect_right(self._starts, start)
+        if position > 0:
+            previous = self._starts[position - 1]
+            if previous + self._lengths[previous] > start:
+                raise ValueError(f"El sector {start} ya está libre")
+            if previous + self._lengths[previous] == start:
+                start, count = previous, self._lengths[previous] + count
+                self._remove_run(previous)
+        following = start + count
+        if following in self._lengths:
+            count += self._lengths[following]
+            self._remove_run(following)
+        elif position < len(self._starts) and self._starts[position] < following:
+            raise ValueError(f"El sector {self._starts[position]} ya está libre")
+        self._add_run(start, count)
+
+    def _run_containing(self, sector: int) -> Optional[int]:
+        position = bisect_right(self._starts, sector)
+        if position == 0:
+            return None
+        start = self._starts[position - 1]
+        return start if sector < start + self._lengths[start] else None
+
+    def _add_run(self, start: int, length: int):
+        insort(self._starts, start)
+        self._lengths[start] = length
+        insort(self._by_length, (length, start))
+        self._by_address.set(start, length)
+        self.free_count += length
+
+    def _remove_run(self, start: int):
+        length = self._lengths.pop(start)
+        del self._starts[bisect_left(self._starts, start)]
+        del self._by_length[bisect_left(self._by_length, (length, start))]
+        self._by_address.set(start, 0)
+        self.free_count -= length
+
+class SectorMap(MutableMapping):
+    # Mapa sector -> ocupado que mantiene al día un FreeExtentMap. Se usa igual que el diccionario
+    # que reemplaza, pero guarda un byte por sector, se persiste como rangos ocupados y cada
+    # cambio actualiza los rangos libres.
+    # pin() fija el estado actual para un lector: mientras esté fijado, cada página de
+    # SECTOR_MAP_PAGE sectores se copia al lector antes de que el escritor la modifique
+    modifications = 0  # Impar mientras hay un cambio en curso
+
+    def __init__(self, total_sectors: int, states: Optional[Dict[int, bool]] = None,
+                 used_runs: Iterable[Tuple[int, int]] = ()):
+        # `states` es el diccionario sector -> ocupado de los mapas guardados antes de los rangos
+        self._states = bytearray(total_sectors)
+        used_runs = list(used_runs)
+        for start, count in used_runs:
+            self._states[start:start + count] = b'\x01' * count
+        used = [sector for sector, state in (states or {}).items() if state]
+        for sector in used:
+            self._states[sector] = 1
+        self.extents = FreeExtentMap(total_sectors, used, used_runs)
+        self._snapshots: List['SectorMapSnapshot'] = []
+        self._pin_lock = threading.Lock()
+
+    def __getitem__(self, sector: int) -> bool:
+        return self._states[sector] == 1
+
+    def __setitem__(self, sector: int, used: bool):
+        used = bool(used)
+        if (self._states[sector] == 1) == used:
+            return
+        self.modifications += 1
+        try:
+            self._preserve(sector, 1)
+            if used:
+                self.extents.reserve(sector)
+            else:
+                self.extents.release(sector)
+            self._states[sector] = used
+        finally:
+            self.modifications += 1
+
+    def mark_run(self, start: int, count: int, used: bool):
+        # Cambia el estado de un rango contiguo con una sola operación sobre los rangos libres
+        self.modifications += 1
+        try:
+            self._preserve(start, count)
+            if used:
+                self.extents.reserve(start, count)
+            else:
+                self.extents.release(start, count)
+            self._states[start:start + count] = (b'\x01' if used else b'\x00') * count
+        finally:
+            self.modifications += 1
+
+    # ----------------------- Lecturas fijadas -----------------------
+    def _preserve(self, start: int, count: int):
+        # Copia las páginas que se van a modificar a los lectores fijados que aún no las tienen
+        snapshots = self._snapshots
+        if not snapshots:
+            return
+        for page in range(start // SECTOR_MAP_PAGE, (start + count - 1) // SECTOR_MAP_PAGE + 1):
+            missing = [snapshot for snapshot in snapshots if page not in snapshot.pages]
+            if missing:
+                first = page * SECTOR_MAP_PAGE
+                copy = bytes(self._states[first:first + SECTOR_MAP_PAGE])
+                for snapshot in missing:
+                    snapshot.pages[page] = copy
+
+    def pin(self) -> 'SectorMapSnapshot':
+        # Fija el estado actual sin detener al escritor: se espera a que no haya un cambio a medias
+        while True:
+            seen = self.modifications
+            if seen % 2 == 0:
+                snapshot = SectorMapSnapshot(self)
+                with self._pin_lock:
+                    self._snapshots = self._snapshots + [snapshot]
+                snapshot.used_count = self.extents.used_count
+                if self.modifications == seen:
+                    return snapshot
+                self.unpin(snapshot)
+            time.sleep(0)
+
+    def unpin(self, snapshot: 'SectorMapSnapshot'):
+        # Suelta un lector; sus páginas copiadas se liberan con él
+        with self._pin_lock:
+            self._snapshots = [s for s in self._snapshots if s is not snapshot]
+
+    def __delitem__(self, sector: int):
+        self[sector] = False
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(range(len(self._states)))
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def used_runs(self) -> List[Tuple[int, int]]:
+        # Rangos (inicio, largo) de sectores ocupados: lo que se guarda del mapa
+        runs = []
+        position = 0
+        for start, length in self.extents.runs():
+            if start > position:
+                runs.append((position, start - position))
+            position = start + length
+        if position < len(self._states):
+            runs.append((position, len(self._states) - position))
+        return runs
+
+class SectorMapSnapshot(Mapping):
+    # Estado del mapa de sectores en el momento de SectorMap.pin(). Las páginas que el escritor
+    # modificó después se leen de la copia; las demás, del mapa vivo
+
+    def __init__(self, sector_map: SectorMap):
+        self._map = sector_map
+        self.pages: Dict[int, bytes] = {}
+        self.used_count = 0
+
+    def __getitem__(self, sector: int) -> bool:
+        page, index = divmod(sector, SECTOR_MAP_PAGE)
+        copy = self.pages.get(page)
+        if copy is None:
+            used = self._map[sector]
+            # La página pudo copiarse entre la consulta y la lectura: la copia es la que vale
+            copy = self.pages.get(page)
+            if copy is None:
+                return used
+        return copy[index] == 1
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(range(len(self._map)))
+
+    def __len__(self) -> int:
+        return len(self._map)
+
+    def release(self):
+        self._map.unpin(self)
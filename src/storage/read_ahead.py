@@ -0,0 +1,123 @@
+# Lectura anticipada de sectores. Cuando una lectura empieza justo donde terminó la anterior
+# (el siguiente fragmento de una cadena, el siguiente bloque de un recorrido o la siguiente
+# página de un rango agrupado) se leen además `window` sectores más en la misma operación y se
+# guardan en una caché de sectores. La ventana crece si los sectores anticipados se usan y se
+# achica si se descartan sin usar
+
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List
+
+DEFAULT_READ_AHEAD = 8         # Ventana inicial en sectores (0 desactiva la lectura anticipada)
+MAX_READ_AHEAD = 64
+READ_AHEAD_CACHE_SECTORS = 256
+ADAPT_EVERY = 64               # Sectores anticipados entre cada ajuste de la ventana
+
+class ReadAhead:
+    # Caché de los últimos sectores leídos con detección de acceso secuencial. `read` es la lectura real del disco y
+    # `run_end(sector)` el primer sector después del tramo contiguo que contiene a `sector` (no se
+    # anticipa más allá). Las escrituras deben avisar con invalidate()
+
+    def __init__(self, read: Callable[[int, int], bytes], run_end: Callable[[int], int], stats,
+                 sector_size: int, window: int = DEFAULT_READ_AHEAD, max_window: int = MAX_READ_AHEAD,
+                 cache_sectors: int = READ_AHEAD_CACHE_SECTORS):
+        self._read = read
+        self._run_end = run_end
+        self.stats = stats
+        self.sector_size = sector_size
+        self.window = max(1, window)
+        self.min_window = 1
+        self.max_window = max(self.window, max_window)
+        self.cache_sectors = cache_sectors
+        self._cache: "OrderedDict[int, bytes]" = OrderedDict()
+        self._prefetched: Dict[int, bool] = {}  # Sector anticipado -> todavía no usado
+        self._next = -1                          # Sector siguiente a la última lectura del disco
+        self._generation = 0                     # Cambia con cada invalidación
+        self._lock = threading.Lock()            # Solo protege las estructuras en memoria
+        self._used = 0
+        self._wasted = 0
+
+    def read_sectors(self, start: int, count: int = 1) -> bytes:
+        size = self.sector_size
+        parts: List[bytes] = []
+        sector = start
+        end = start + count
+        with self._lock:
+            while sector < end and sector in self._cache:
+                parts.append(self._take(sector))
+                sector += 1
+        if sector == end:
+            return b''.join(parts)
+
+        # Falta el resto: se lee de una vez, con ventana extra si la lectura continúa la anterior
+        extra = 0
+        if sector == self._next:
+            extra = max(0, min(self.window, self._run_end(end - 1) - end))
+        generation = self._generation
+        data = self._read(sector, end - sector + extra)
+        self._next = end + extra
+        parts.append(data[:(end - sector) * size])
+        if extra:
+            self.stats.count('readahead_sectors', extra)
+        with self._lock:
+            # Los sectores pedidos también quedan: una cadena que cruza el borde de un bloque
+            # vuelve a pedir el sector siguiente al recorrerlo
+            for i in range(end - sector + extra):
+                self._store(sector + i, data[i * size:(i + 1) * size], sector + i >= end)
+        # Si hubo una escritura mientras se leía, lo guardado puede estar viejo
+        if self._generation != generation:
+            self.invalidate(sector, end - sector + extra)
+        return b''.join(parts)
+
+    def invalidate(self, start: int, count: int = 1):
+        self._generation += 1
+        with self._lock:
+            for sector in range(start, start + count):
+                if sector in self._cache:
+                    del self._cache[sector]
+                    self._discard(sector)
+
+    def clear(self):
+        with self._lock:
+            for sector in list(self._cache):
+                self._discard(sector)
+            self._cache.clear()
+
+    # ----------------------- Caché y ventana -----------------------
+    def _take(self, sector: int) -> bytes:
+        self._cache.move_to_end(sector)
+        if self._prefetched.pop(sector, False):
+            self.stats.count('readahead_hits')
+            self._used += 1
+            self._adapt()
+        return self._cache[sector]
+
+    def _store(self, sector: int, data: bytes, prefetched: bool):
+        self._cache[sector] = data
+        self._cache.move_to_end(sector)
+        if prefetched:
+            self._prefetched[sector] = True
+        while len(self._cache) > self.cache_sectors:
+            oldest, _ = self._cache.popitem(last=False)
+            self._discard(oldest)
+
+    def _discard(self, sector: int):
+        if self._prefetched.pop(sector, False):
+            self.stats.count('readahead_wasted')
+            self._wasted += 1
+            self._adapt()
+
+    def _adapt(self):
+        # Con tres cuartos o más de aciertos la ventana se duplica; con menos de un cuarto se achica
+        total = self._used + self._wasted
+        if total < ADAPT_EVERY:
+            return
+        hit_rate = self._used / total
+        if hit_rate >= 0.75:
+            self.window = min(self.max_window, self.window * 2)
+        elif hit_rate < 0.25:
+            self.window = max(self.min_window, self.window // 2)
+        self._used = self._wasted = 0
+
+    def report(self) -> Dict[str, int]:
+        return {'window': self.window, 'cached_sectors': len(self._cache)}
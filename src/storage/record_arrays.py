@@ -0,0 +1,212 @@
+# Vistas de arreglos estructurados de NumPy sobre los registros binarios de longitud fija
+
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional: solo lo necesitan los recorridos analíticos
+    np = None
+
+from .sector_manager import SectorManager, SCAN_CHUNK_SECTORS
+
+# Tipos SQL -> tipos NumPy con el mismo orden de bytes que RecordSerializer ('<')
+NUMPY_TYPES = {
+    'INTEGER': '<i4',
+    'INT': '<i4',
+    'BIGINT': '<i8',
+    'SMALLINT': '<i2',
+    'TINYINT': 'i1',
+    'DECIMAL': '<f8',
+    'FLOAT': '<f4',
+    'DOUBLE': '<f8',
+    'BOOLEAN': '?',
+    'BOOL': '?'
+}
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("NumPy no está instalado: instale 'numpy' para usar los recorridos con arreglos")
+
+def schema_to_dtype(schema: Dict[str, Any]) -> "np.dtype":
+    # Convierte el esquema en un dtype estructurado empaquetado (sin alineación),
+    # idéntico byte a byte al formato de RecordSerializer.
+    # Los campos de texto (CHAR, VARCHAR, TEXT, DATE, DATETIME) se mapean a 'S<tamaño>'
+    _require_numpy()
+    if schema.get('row_format', 'FIXED') != 'FIXED':
+        raise ValueError("Los arreglos estructurados requieren registros de longitud fija (ROW_FORMAT=FIXED)")
+    names = []
+    formats = []
+    for field in schema['fields']:
+        names.append(field['name'])
+        formats.append(NUMPY_TYPES.get(field['type'], f"S{field['size']}"))
+    dtype = np.dtype({'names': names, 'formats': formats})
+    if dtype.itemsize != schema['record_size']:
+        raise ValueError(
+            f"El dtype ({dtype.itemsize} bytes) no coincide con el tamaño de registro "
+            f"del esquema ({schema['record_size']} bytes)")
+    return dtype
+
+class RecordArrayScanner:
+    # Lee rangos de registros como columnas de NumPy en lugar de un diccionario por fila.
+    # Los sectores se leen en bloques contiguos y los registros de cada bloque se decodifican
+    # de una sola vez con np.frombuffer.
+
+    def __init__(self, sector_manager: SectorManager, schema: Dict[str, Any]):
+        _require_numpy()
+        self.sector_manager = sector_manager
+        self.schema = schema
+        self.dtype = schema_to_dtype(schema)
+        # Encabezado de fragmento: tamaño (H), siguiente sector (H o I según el formato), siguiente offset (H)
+        self._header_dtype = np.dtype([('size', '<u2'), ('next', f'<u{sector_manager.header_size - 4}'),
+                                       ('next_offset', '<u2')])
+
+    def iter_batches(self, start_sector: int = 0, end_sector: Optional[int] = None,
+                     batch_sectors: int = SCAN_CHUNK_SECTORS) -> Iterator["np.ndarray"]:
+        # Produce un arreglo estructurado por cada bloque de aproximadamente `batch_sectors` sectores.
+        # La memoria usada queda acotada por el tamaño del bloque
+        manager = self.sector_manager
+        if self.dtype.itemsize + manager.header_size > manager.disk.sector_size:
+            # Cada registro ocupa varios sectores: se sigue la cadena de cada uno
+            yield from self._iter_chained_batches(start_sector, end_sector, batch_sectors)
+            return
+        # Los extents contiguos en el disco se leen como un solo tramo
+        ranges: List[List[int]] = []
+        for range_start, range_count in manager._scan_ranges(start_sector, end_sector):
+            if ranges and sum(ranges[-1]) == range_start:
+                ranges[-1][1] += range_count
+            else:
+                ranges.append([range_start, range_count])
+        batch_records = max(1, batch_sectors * manager.disk.sector_size // self.dtype.itemsize)
+        pending: List["np.ndarray"] = []
+        pending_records = 0
+        for range_start, range_count in ranges:
+            for chunk_start in range(range_start, range_start + range_count, batch_sectors):
+                count = min(batch_sectors, range_start + range_count - chunk_start)
+                batch = self._decode_chunk(chunk_start, manager._read_sectors(chunk_start, count), count)
+                pending.append(batch)
+                pending_records += len(batch)
+                if pending_records >= batch_records:
+                    yield np.concatenate(pending)
+                    pending = []
+                    pending_records = 0
+        if pending_records:
+            yield np.concatenate(pending)
+
+    def _header_fields(self, raw: "np.ndarray", offsets: "np.ndarray") -> Tuple["np.ndarray", ...]:
+        # (tamaño, siguiente sector, vacío) de los encabezados que empiezan en cada offset del búfer
+        header_size = self.sector_manager.header_size
+        headers = np.ascontiguousarray(raw[offsets[..., None] + np.arange(header_size)])
+        fields = headers.view(self._header_dtype)[..., 0]
+        return fields['size'], fields['next'], ~headers.any(axis=-1)
+
+    def _decode_chunk(self, chunk_start: int, buffer: bytes, count: int) -> "np.ndarray":
+        # Decodifica los registros cuyo primer fragmento está en los sectores del búfer.
+        # Como el registro entra en un sector, cada fragmento es un registro completo (tamaño del
+        # registro y marca de fin), el final de uno partido (más chico, con marca de fin) o el comienzo
+        # de uno partido (con siguiente sector). En un sector hay a lo sumo un final al principio,
+        # luego registros completos uno detrás de otro y a lo sumo un comienzo al final: las
+        # posiciones de los completos se calculan para todos los sectores a la vez y se copian con
+        # una sola indexación. Solo los registros partidos se leen siguiendo su cadena
+        manager = self.sector_manager
+        sector_size = manager.disk.sector_size
+        header_size = manager.header_size
+        record_size = self.dtype.itemsize
+        end = manager.fragment_end
+        slot = header_size + record_size
+        raw = np.frombuffer(buffer, dtype=np.uint8)
+        bases = np.arange(count) * sector_size
+
+        first_size, first_next, first_empty = self._header_fields(raw, bases)
+        first_tail = (first_next == end) & (first_size < record_size) & ~first_empty
+        lead = np.where(first_tail, header_size + first_size.astype(np.int64), 0)
+        # Sector que no empieza vacío, ni con un registro completo, ni con un final: se recorre aparte
+        irregular = ~first_empty & ~first_tail & ~((first_size == record_size) & (first_next == end))
+
+        slots = lead[:, None] + np.arange(sector_size // slot) * slot
+        fits = slots + slot <= sector_size
+        size, next_sector, _ = self._header_fields(raw, bases[:, None] + np.where(fits, slots, 0))
+        complete = np.logical_and.accumulate(fits & (size == record_size) & (next_sector == end), axis=1)
+        complete &= ~(first_empty | irregular)[:, None]
+
+        # Fragmento que sigue a los registros completos: vacío, sin lugar o el comienzo de un partido
+        after = lead + complete.sum(axis=1) * slot
+        room = after + header_size <= sector_size
+        size, next_sector, empty = self._header_fields(raw, bases + np.where(room, after, 0))
+        pending = room & ~empty & ~first_empty & ~irregular
+        chained = pending & (next_sector != end)
+        irregular |= pending & (next_sector == end)
+        complete &= ~irregular[:, None]
+        manager.disk.stats.count('fragments_read', int(complete.sum()))
+
+        starts = (bases[:, None] + slots + header_size)[complete]
+        records = np.ascontiguousarray(raw[starts[:, None] + np.arange(record_size)]).view(self.dtype)[:, 0]
+        extra: List[Tuple[int, bytes]] = []
+        for i in np.flatnonzero(chained).tolist():
+            data, _ = manager._read_chain(chunk_start + i, int(after[i]), buffer, chunk_start)
+            extra.append((i * sector_size + int(after[i]), data))
+        for i in np.flatnonzero(irregular).tolist():
+            extra.extend((i * sector_size + offset, data)
+                         for offset, data in self._walk_sector(chunk_start + i, buffer, chunk_start))
+        if not extra:
+            return records
+        # Los registros partidos se intercalan en su posición física
+        for _, data in extra:
+            if len(data) != record_size:
+                raise ValueError(f"Registro con tamaño inesperado ({len(data)} bytes)")
+        keys = np.concatenate([starts - header_size, np.array([key for key, _ in extra], dtype=np.int64)])
+        extra_records = np.frombuffer(b''.join(data for _, data in extra), dtype=self.dtype)
+        return np.concatenate([records, extra_records])[np.argsort(keys, kind='stable')]
+
+    def _walk_sector(self, sector: int, buffer: bytes, buffer_start: int) -> Iterator[Tuple[int, bytes]]:
+        # Recorre fragmento por fragmento un sector con una disposición inesperada
+        manager = self.sector_manager
+        sector_size = manager.disk.sector_size
+        base = (sector - buffer_start) * sector_size
+        sector_data = buffer[base:base + sector_size]
+        for offset, fragment_size, next_sector, _ in manager._fragments_in_sector(sector_data):
+            if next_sector != manager.fragment_end:
+                yield offset, manager._read_chain(sector, offset, buffer, buffer_start)[0]
+            elif fragment_size == self.dtype.itemsize:
+                manager.disk.stats.count('fragments_read')
+                start = offset + manager.header_size
+                yield offset, sector_data[start:start + fragment_size]
+
+    def _iter_chained_batches(self, start_sector: int, end_sector: Optional[int],
+                              batch_sectors: int) -> Iterator["np.ndarray"]:
+        # Registros más grandes que un sector: se leen uno a uno con iter_records
+        record_size = self.dtype.itemsize
+        batch_records = max(1, batch_sectors * self.sector_manager.disk.sector_size // record_size)
+        payload = bytearray()
+        count = 0
+        for sector, _, data in self.sector_manager.iter_records(start_sector, end_sector, batch_sectors):
+            if len(data) != record_size:
+                raise ValueError(f"Registro en el sector {sector} con tamaño inesperado ({len(data)} bytes)")
+            payload += data
+            count += 1
+            if count == batch_records:
+                yield np.frombuffer(payload, dtype=self.dtype)
+                payload = bytearray()
+                count = 0
+        if payload:
+            yield np.frombuffer(payload, dtype=self.dtype)
+
+    def scan(self, start_sector: int = 0, end_sector: Optional[int] = None,
+             batch_sectors: int = SCAN_CHUNK_SECTORS) -> "np.ndarray":
+        # Retorna un arreglo estructurado con todos los registros del rango de sectores
+        batches = list(self.iter_batches(start_sector, end_sector, batch_sectors))
+        if not batches:
+            return np.empty(0, dtype=self.dtype)
+        return np.concatenate(batches)
+
+    def scan_columns(self, columns: Optional[List[str]] = None, start_sector: int = 0,
+                     end_sector: Optional[int] = None,
+                     batch_sectors: int = SCAN_CHUNK_SECTORS) -> Dict[str, "np.ndarray"]:
+        # Retorna un arreglo por columna. Los textos quedan como bytes con relleno de espacios
+        # (usar np.char.rstrip / np.char.decode si se necesitan como str)
+        if columns is None:
+            columns = list(self.dtype.names)
+        unknown = set(columns) - set(self.dtype.names)
+        if unknown:
+            raise ValueError(f"Columnas desconocidas: {unknown}")
+        records = self.scan(start_sector, end_sector, batch_sectors)
+        return {name: np.ascontiguousarray(records[name]) for name in columns}
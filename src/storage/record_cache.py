@@ -0,0 +1,76 @@
+# Caché LRU de registros ya decodificados, indexada por (tabla, sector, offset)
+
+import sys
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+DEFAULT_CACHE_BYTES = 4 * 1024 * 1024  # Presupuesto de memoria por defecto (4 MB)
+
+def record_footprint(record: Dict[str, Any]) -> int:
+    # Tamaño aproximado en memoria de un registro decodificado (el diccionario y sus valores)
+    return sys.getsizeof(record) + sum(sys.getsizeof(value) for value in record.values())
+
+class RecordCache:
+    # Guarda registros decodificados hasta `max_bytes` y descarta los usados hace más tiempo.
+    # Las entradas se invalidan cuando se escribe o libera un registro en la misma dirección
+
+    def __init__(self, max_bytes: int = DEFAULT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, Dict[str, Any]]" = OrderedDict()
+        self._sizes: Dict[Hashable, int] = {}
+        self.used_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key: Hashable) -> Optional[Dict[str, Any]]:
+        # Copia del registro en caché (para que el llamador pueda modificarla) o None
+        record = self._entries.get(key)
+        if record is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return dict(record)
+
+    def put(self, key: Hashable, record: Dict[str, Any]):
+        size = record_footprint(record)
+        if size > self.max_bytes:
+            return
+        self.invalidate(key, count=False)
+        self._entries[key] = dict(record)
+        self._sizes[key] = size
+        self.used_bytes += size
+        while self.used_bytes > self.max_bytes:
+            oldest, _ = self._entries.popitem(last=False)
+            self.used_bytes -= self._sizes.pop(oldest)
+            self.evictions += 1
+
+    def invalidate(self, key: Hashable, count: bool = True):
+        if key in self._entries:
+            del self._entries[key]
+            self.used_bytes -= self._sizes.pop(key)
+            if count:
+                self.invalidations += 1
+
+    def clear(self):
+        self._entries.clear()
+        self._sizes.clear()
+        self.used_bytes = 0
+
+    def reset_stats(self):
+        self.hits = self.misses = self.evictions = self.invalidations = 0
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'used_bytes': self.used_bytes,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else None,
+            'evictions': self.evictions,
+            'invalidations': self.invalidations
+        }
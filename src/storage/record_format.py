@@ -0,0 +1,43 @@
+# Formatos en disco de los fragmentos de registro. Cada fragmento empieza con un encabezado
+# (tamaño, siguiente sector, siguiente offset); el siguiente sector del último fragmento de una
+# cadena es la marca de fin. La versión del formato se guarda junto al mapa de sectores del disco
+#
+#   Versión 1: '<H H H' (6 bytes), sectores de 16 bits: hasta 65.535 sectores por disco
+#   Versión 2: '<H I H' (8 bytes), sectores de 32 bits: hasta 4.294.967.295 sectores
+
+import struct
+from dataclasses import dataclass
+from typing import Dict
+
+LINK_OFFSET = 2       # El enlace (siguiente sector, siguiente offset) sigue al tamaño del fragmento
+OFFSET_END = 0xFFFF   # Siguiente offset del último fragmento
+
+@dataclass(frozen=True)
+class FragmentFormat:
+    version: int
+    header: struct.Struct  # Tamaño, siguiente sector, siguiente offset
+    link: struct.Struct    # Siguiente sector, siguiente offset
+    end: int               # Siguiente sector del último fragmento de la cadena
+
+    @property
+    def header_size(self) -> int:
+        return self.header.size
+
+    @property
+    def max_sectors(self) -> int:
+        # Los sectores direccionables van de 0 a end - 1
+        return self.end
+
+    @property
+    def empty_header(self) -> bytes:
+        return b'\x00' * self.header.size
+
+FORMAT_V1 = FragmentFormat(1, struct.Struct('<H H H'), struct.Struct('<H H'), 0xFFFF)
+FORMAT_V2 = FragmentFormat(2, struct.Struct('<H I H'), struct.Struct('<I H'), 0xFFFFFFFF)
+FORMATS: Dict[int, FragmentFormat] = {f.version: f for f in (FORMAT_V1, FORMAT_V2)}
+CURRENT_FORMAT = FORMAT_V2  # Formato de los discos nuevos
+
+def format_for(version: int) -> FragmentFormat:
+    if version not in FORMATS:
+        raise ValueError(f"Formato de disco desconocido: {version}")
+    return FORMATS[version]
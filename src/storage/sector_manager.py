@@ -1,54 +1,126 @@
-from typing import List, Optional, Tuple
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
 from .disk import Disk
-import struct
+from .read_ahead import ReadAhead, DEFAULT_READ_AHEAD, MAX_READ_AHEAD
+from .record_format import CURRENT_FORMAT, LINK_OFFSET, OFFSET_END
+from diagnostics.tracing import span
 
-FRAGMENT_HEADER_SIZE = 6  # 2 bytes tamaño, 2 bytes sector, 2 bytes offset
-FRAGMENT_END = 0xFFFF
+FRAGMENT_HEADER_SIZE = CURRENT_FORMAT.header_size  # Encabezado en los discos nuevos (para estimaciones)
+EMPTY_HEADER = CURRENT_FORMAT.empty_header
+SCAN_CHUNK_SECTORS = 64  # Sectores leídos por operación de E/S durante un recorrido
 
 class SectorManager:
     # Administra la asignación y liberación de sectores con soporte para fragmentación de registros
-    
+
     def __init__(self, disk: Disk):
         self.disk = disk
+        self.format = disk.record_format  # Encabezado de los fragmentos según la versión del disco
+        self.header_size = self.format.header_size
+        self.fragment_end = self.format.end
+        self._fill_hint = 0  # Posición del primer sector candidato que puede tener espacio libre
+        self._listeners: List[Callable[[int, int], None]] = []
+        self.read_ahead: Optional[ReadAhead] = None
+
+    def enable_read_ahead(self, window: int = DEFAULT_READ_AHEAD, max_window: int = MAX_READ_AHEAD):
+        # Activa la lectura anticipada de sectores (window=0 la desactiva)
+        self.read_ahead = (ReadAhead(self.disk.read_sectors, self._run_end, self.disk.stats,
+                                     self.disk.sector_size, window, max_window)
+                           if window > 0 else None)
+
+    def _run_end(self, sector: int) -> int:
+        # Primer sector después del tramo contiguo que contiene a `sector`
+        return self.disk.total_sectors
 
-    def _pack_pointer(self, sector: int, offset: int) -> bytes:
-        return struct.pack('<IH', sector, offset)
+    def add_listener(self, callback: Callable[[int, int], None]):
+        # Registra una función que recibe (sector, offset) de cada registro escrito o liberado
+        self._listeners.append(callback)
 
-    def _unpack_pointer(self, data: bytes) -> Tuple[int, int]:
-        sector, offset = struct.unpack('<IH', data)
-        return sector, offset
+    def _notify(self, sector: int, offset: int):
+        for callback in self._listeners:
+            callback(sector, offset)
+
+    def _check_address(self, sector: int):
+        if sector >= self.fragment_end:
+            raise ValueError(f"El sector {sector} no entra en el formato {self.format.version} del disco; "
+                             f"migre el disco al formato actual")
 
     def _pack_fragment_header(self, fragment_size: int, next_sector: int, next_offset: int) -> bytes:
-        return struct.pack('<H H H', fragment_size, next_sector, next_offset)
+        if next_sector != self.fragment_end:
+            self._check_address(next_sector)
+        return self.format.header.pack(fragment_size, next_sector, next_offset)
 
     def _unpack_fragment_header(self, data: bytes) -> Tuple[int, int, int]:
-        fragment_size, next_sector, next_offset = struct.unpack('<H H H', data)
+        fragment_size, next_sector, next_offset = self.format.header.unpack(data)
         return fragment_size, next_sector, next_offset
 
     def find_free_space_for_record(self, record_size: int) -> Optional[Tuple[int, int, int]]:
         # Busca el primer sector y offset donde quepa el registro completo.
         # Si el registro es más grande que un sector, retorna el primer sector y offset con espacio disponible.
+        # Los sectores anteriores a la pista de llenado ya se vieron llenos y no se vuelven a leer.
         # Returns (sector, offset, espacio_restante)
-        for sector in range(self.disk.total_sectors):
-            with open(self.disk.filename, 'rb') as f:
-                f.seek(sector * self.disk.sector_size)
-                data = f.read(self.disk.sector_size)
-            offset = 0
-            while offset + FRAGMENT_HEADER_SIZE <= self.disk.sector_size:
-                header = data[offset:offset+FRAGMENT_HEADER_SIZE]
-                if all(b == 0 for b in header):
-                    break
-                fragment_size = int.from_bytes(header[:2], 'little')
-                offset += FRAGMENT_HEADER_SIZE + fragment_size
-            espacio_restante = self.disk.sector_size - offset
-            if espacio_restante >= FRAGMENT_HEADER_SIZE + record_size:
-                return (sector, offset, espacio_restante)
-            elif espacio_restante > FRAGMENT_HEADER_SIZE:
-                return (sector, offset, espacio_restante)
-        return None
+        while True:
+            sequence = self._sector_sequence()
+            for position in range(self._fill_hint, len(sequence)):
+                sector = sequence[position]
+                data = self._read_sectors(sector)
+                offset = 0
+                while offset + self.header_size <= self.disk.sector_size:
+                    header = data[offset:offset+self.header_size]
+                    if all(b == 0 for b in header):
+                        break
+                    fragment_size = int.from_bytes(header[:2], 'little')
+                    offset += self.header_size + fragment_size
+                espacio_restante = self.disk.sector_size - offset
+                if espacio_restante > self.header_size:
+                    self._fill_hint = position
+                    return (sector, offset, espacio_restante)
+            self._fill_hint = len(sequence)
+            if not self._grow():
+                return None
+
+    def _read_sectors(self, start_sector: int, count: int = 1) -> bytes:
+        # Punto único de lectura de sectores (las subclases pueden redirigirlo)
+        if self.read_ahead is not None:
+            return self.read_ahead.read_sectors(start_sector, count)
+        return self.disk.read_sectors(start_sector, count)
+
+    def _write_at(self, sector: int, offset: int, data: bytes):
+        # Punto único de escritura dentro de un sector (las subclases pueden redirigirlo)
+        self.disk.write_at(sector, offset, data)
+        if self.read_ahead is not None:
+            size = self.disk.sector_size
+            self.read_ahead.invalidate(sector, max(1, (offset + len(data) + size - 1) // size))
+
+    def flush(self):
+        # Los sectores se escriben directamente al disco: no hay nada pendiente
+        pass
+
+    def physical_sector(self, sector: int) -> int:
+        # Sector físico del disco que contiene al sector `sector` del administrador
+        return sector
+
+    def _sector_sequence(self) -> Sequence[int]:
+        # Sectores candidatos en el orden en que se llenan
+        return range(self.disk.total_sectors)
+
+    def _grow(self) -> bool:
+        # Intenta obtener más sectores cuando los candidatos están llenos
+        return False
+
+    def _mark_used(self, sector: int):
+        self.disk.sector_map[sector] = True
+        self.disk._save_sector_map()
+
+    def _mark_free(self, sector: int):
+        self.disk.sector_map[sector] = False
 
     def write_record(self, data: bytes) -> Tuple[int, int]:
         # Escribe un registro secuencialmente en sectores, llenando un sector antes de pasar al siguiente.
+        with span('write_record'), self.disk.stats.timer('write_record'):
+            address = self._write_fragments(data)
+        self._notify(*address)
+        return address
+
+    def _write_fragments(self, data: bytes) -> Tuple[int, int]:
         total_size = len(data)
         bytes_written = 0
         first_sector = None
@@ -60,29 +132,25 @@ class SectorManager:
             if pos is None:
                 raise Exception("No hay suficiente espacio en el disco para el registro")
             sector, offset, espacio_restante = pos
-            max_fragment_size = espacio_restante - FRAGMENT_HEADER_SIZE
+            max_fragment_size = espacio_restante - self.header_size
             fragment_size = min(total_size - bytes_written, max_fragment_size)
             if bytes_written + fragment_size < total_size:
                 next_sector = 0
                 next_offset = 0
             else:
-                next_sector = FRAGMENT_END
-                next_offset = FRAGMENT_END
+                next_sector = self.fragment_end
+                next_offset = OFFSET_END
             header = self._pack_fragment_header(fragment_size, next_sector, next_offset)
             fragment_data = data[bytes_written:bytes_written+fragment_size]
-            with open(self.disk.filename, 'r+b') as f:
-                f.seek(sector * self.disk.sector_size + offset)
-                f.write(header)
-                f.write(fragment_data)
-            self.disk.sector_map[sector] = True  # <-- Marca el sector como usado
-            self.disk._save_sector_map()
+            self._write_at(sector, offset, header + fragment_data)
+            self._mark_used(sector)
+            self.disk.stats.count('fragments_written')
             if first_sector is None:
                 first_sector = sector
                 first_offset = offset
             if prev_sector is not None:
-                with open(self.disk.filename, 'r+b') as f:
-                    f.seek(prev_sector * self.disk.sector_size + prev_offset + 2)
-                    f.write(struct.pack('<H H', sector, offset))
+                self._check_address(sector)
+                self._write_at(prev_sector, prev_offset + LINK_OFFSET, self.format.link.pack(sector, offset))
             prev_sector = sector
             prev_offset = offset
             bytes_written += fragment_size
@@ -90,40 +158,157 @@ class SectorManager:
 
     def read_record(self, sector: int, offset: int) -> bytes:
         # Lee un registro fragmentado a partir de (sector, offset)
-        result = b''
+        with span('read_record'), self.disk.stats.timer('read_record'):
+            data, _ = self._read_chain(sector, offset)
+        return data
+
+    def read_records(self, addresses: Iterable[Tuple[int, int]],
+                     max_run: int = SCAN_CHUNK_SECTORS) -> Dict[Tuple[int, int], bytes]:
+        # Lee varios registros leyendo cada sector necesario una sola vez: los sectores iniciales
+        # se piden en orden ascendente, agrupando los contiguos (hasta `max_run`) en una sola
+        # operación de E/S, y los registros que comparten sector se extraen del mismo búfer
+        with span('read_records'), self.disk.stats.timer('read_records'):
+            pending = sorted({(sector, offset) for sector, offset in addresses})
+            loaded: Dict[int, bytes] = {}
+            for start, count in self._sector_runs(sorted({sector for sector, _ in pending}), max_run):
+                buffer = self._read_sectors(start, count)
+                size = self.disk.sector_size
+                for i in range(count):
+                    loaded[start + i] = buffer[i * size:(i + 1) * size]
+            return {address: self._read_chain(*address, loaded=loaded)[0] for address in pending}
+
+    def _sector_runs(self, sectors: List[int], max_run: int) -> List[Tuple[int, int]]:
+        # Agrupa sectores ordenados en rangos (inicio, cantidad) de sectores consecutivos
+        runs: List[Tuple[int, int]] = []
+        for sector in sectors:
+            if runs and runs[-1][0] + runs[-1][1] == sector and runs[-1][1] < max_run:
+                runs[-1] = (runs[-1][0], runs[-1][1] + 1)
+            else:
+                runs.append((sector, 1))
+        return runs
+
+    def _read_chain(self, sector: int, offset: int, buffer: bytes = b'', buffer_start: int = 0,
+                    loaded: Optional[Dict[int, bytes]] = None) -> Tuple[bytes, List[Tuple[int, int]]]:
+        # Sigue la cadena de fragmentos desde (sector, offset). Los sectores contenidos en
+        # `buffer` (que empieza en `buffer_start`) se leen de memoria en lugar del disco, igual
+        # que los de `loaded` (sector -> datos), donde además se guardan los que se lean.
+        # Retorna los datos del registro y las direcciones de los fragmentos de continuación
+        result = []
+        continuations = []
+        buffered_sectors = len(buffer) // self.disk.sector_size
         while True:
-            with open(self.disk.filename, 'rb') as f:
-                f.seek(sector * self.disk.sector_size + offset)
-                header = f.read(FRAGMENT_HEADER_SIZE)
-                if len(header) < FRAGMENT_HEADER_SIZE:
-                    break
-                fragment_size, next_sector, next_offset = self._unpack_fragment_header(header)
-                fragment_data = f.read(fragment_size)
-                result += fragment_data
-            if next_sector == FRAGMENT_END:
+            if buffer_start <= sector < buffer_start + buffered_sectors:
+                base = (sector - buffer_start) * self.disk.sector_size
+                sector_data = buffer[base:base + self.disk.sector_size]
+            elif loaded is not None:
+                sector_data = loaded.get(sector)
+                if sector_data is None:
+                    sector_data = loaded[sector] = self._read_sectors(sector)
+            else:
+                sector_data = self._read_sectors(sector)
+            header = sector_data[offset:offset + self.header_size]
+            if len(header) < self.header_size:
+                break
+            fragment_size, next_sector, next_offset = self._unpack_fragment_header(header)
+            start = offset + self.header_size
+            result.append(sector_data[start:start + fragment_size])
+            self.disk.stats.count('fragments_read')
+            if next_sector == self.fragment_end:
                 break
             sector = next_sector
             offset = next_offset
-        return result
+            continuations.append((sector, offset))
+        return b''.join(result), continuations
+
+    def _fragments_in_sector(self, sector_data: bytes) -> Iterator[Tuple[int, int, int, int]]:
+        # Recorre los fragmentos de un sector: (offset, tamaño, siguiente sector, siguiente offset)
+        offset = 0
+        while offset + self.header_size <= len(sector_data):
+            header = sector_data[offset:offset + self.header_size]
+            if header == self.format.empty_header:
+                break
+            fragment_size, next_sector, next_offset = self._unpack_fragment_header(header)
+            yield offset, fragment_size, next_sector, next_offset
+            offset += self.header_size + fragment_size
+
+    def _continuations_before(self, start_sector: int) -> Set[Tuple[int, int]]:
+        # Detecta fragmentos de continuación en start_sector o después cuyo registro empieza antes.
+        # Solo el último fragmento de un sector lleno puede encadenar, así que se retrocede
+        # mientras los sectores anteriores estén llenos.
+        continuations = set()
+        sector = self._previous_sector(start_sector)
+        while sector is not None:
+            sector_data = self._read_sectors(sector)
+            last = None
+            end = 0
+            for fragment in self._fragments_in_sector(sector_data):
+                last = fragment
+                end = fragment[0] + self.header_size + fragment[1]
+            if last is not None and last[2] != self.fragment_end:
+                _, chain = self._read_chain(sector, last[0])
+                continuations.update(chain)
+            if self.disk.sector_size - end > self.header_size:
+                break
+            sector = self._previous_sector(sector)
+        return continuations
+
+    def _previous_sector(self, sector: int) -> Optional[int]:
+        # Sector que precede a `sector` en el orden de llenado
+        return sector - 1 if sector > 0 else None
+
+    def _scan_ranges(self, start_sector: int, end_sector: Optional[int]) -> List[Tuple[int, int]]:
+        # Rangos (inicio, cantidad) de sectores contiguos a recorrer, en orden de llenado
+        if end_sector is None:
+            end_sector = self.disk.total_sectors
+        return [(start_sector, end_sector - start_sector)] if end_sector > start_sector else []
+
+    def iter_records(self, start_sector: int = 0, end_sector: Optional[int] = None,
+                     chunk_sectors: int = SCAN_CHUNK_SECTORS) -> Iterator[Tuple[int, int, bytes]]:
+        # Recorre en orden físico los registros cuyo primer fragmento está en [start_sector, end_sector).
+        # Lee bloques contiguos de sectores y sigue las cadenas de fragmentos.
+        # Produce (sector, offset, datos) de forma perezosa
+        sector_size = self.disk.sector_size
+        ranges = self._scan_ranges(start_sector, end_sector)
+        if not ranges:
+            return
+        continuations = self._continuations_before(ranges[0][0])
+        for range_start, range_count in ranges:
+            for chunk_start in range(range_start, range_start + range_count, chunk_sectors):
+                count = min(chunk_sectors, range_start + range_count - chunk_start)
+                buffer = self._read_sectors(chunk_start, count)
+                for i in range(count):
+                    sector = chunk_start + i
+                    sector_data = buffer[i * sector_size:(i + 1) * sector_size]
+                    for offset, fragment_size, next_sector, _ in self._fragments_in_sector(sector_data):
+                        if continuations and (sector, offset) in continuations:
+                            continuations.discard((sector, offset))
+                            continue
+                        if next_sector == self.fragment_end:
+                            start = offset + self.header_size
+                            self.disk.stats.count('fragments_read')
+                            yield sector, offset, sector_data[start:start + fragment_size]
+                        else:
+                            data, chain = self._read_chain(sector, offset, buffer, chunk_start)
+                            continuations.update(chain)
+                            yield sector, offset, data
 
     def free_sectors(self, sector: int, offset: int) -> bool:
         # Libera los sectores ocupados por un registro fragmentado
+        self._notify(sector, offset)
         try:
             while True:
-                with open(self.disk.filename, 'r+b') as f:
-                    f.seek(sector * self.disk.sector_size + offset)
-                    header = f.read(FRAGMENT_HEADER_SIZE)
-                    if len(header) < FRAGMENT_HEADER_SIZE:
-                        break
-                    fragment_size, next_sector, next_offset = self._unpack_fragment_header(header)
-                    f.seek(sector * self.disk.sector_size + offset)
-                    f.write(b'\x00' * (FRAGMENT_HEADER_SIZE + fragment_size))
-                self.disk.sector_map[sector] = False
-                if next_sector == FRAGMENT_END:
+                header = self._read_sectors(sector)[offset:offset + self.header_size]
+                if len(header) < self.header_size:
+                    break
+                fragment_size, next_sector, next_offset = self._unpack_fragment_header(header)
+                self._write_at(sector, offset, b'\x00' * (self.header_size + fragment_size))
+                self._mark_free(sector)
+                if next_sector == self.fragment_end:
                     break
                 sector = next_sector
                 offset = next_offset
             self.disk._save_sector_map()
+            self._fill_hint = 0
             return True
         except Exception as e:
             print(f"Error al liberar sectores: {e}")
@@ -137,4 +322,69 @@ class SectorManager:
 
     def get_contiguous_free_sectors(self, num_sectors: int) -> Optional[List[int]]:
         # Obtiene sectores libres contiguos
-        return self.disk.find_free_sectors(num_sectors)
\ No newline at end of file
+        return self.disk.find_free_sectors(num_sectors)
+
+
+class ExtentSectorManager(SectorManager):
+    # Administra los registros de una tabla dentro de sus propios extents (rangos contiguos de sectores).
+    # Las filas de la tabla quedan agrupadas físicamente y los recorridos nunca leen sectores ajenos
+
+    def __init__(self, disk: Disk, extents: List[Tuple[int, int]],
+                 allocate_extent: Callable[[], Optional[Tuple[int, int]]]):
+        super().__init__(disk)
+        self.extents = extents  # Lista compartida con el catálogo: (sector inicial, cantidad)
+        self._allocate_extent = allocate_extent
+        self._sequence: List[int] = []
+        self._sequence_extents = 0
+
+    def _sector_sequence(self) -> Sequence[int]:
+        if self._sequence_extents != len(self.extents):
+            self._sequence = [s for start, count in self.extents for s in range(start, start + count)]
+            self._sequence_extents = len(self.extents)
+        return self._sequence
+
+    def _grow(self) -> bool:
+        return self._allocate_extent() is not None
+
+    def _mark_used(self, sector: int):
+        # Los sectores del extent ya quedaron reservados para la tabla al asignarlo
+        pass
+
+    def _mark_free(self, sector: int):
+        # El sector sigue perteneciendo al extent de la tabla aunque quede vacío
+        pass
+
+    def _run_end(self, sector: int) -> int:
+        # La lectura anticipada no sale de los extents contiguos: el siguiente puede estar lejos
+        end = None
+        for start, count in self.extents:
+            if end is None and start <= sector < start + count:
+                end = start + count
+            elif end is not None:
+                if start != end:
+                    break
+                end += count
+        return end if end is not None else sector + 1
+
+    def _previous_sector(self, sector: int) -> Optional[int]:
+        for index, (start, count) in enumerate(self.extents):
+            if start <= sector < start + count:
+                if sector > start:
+                    return sector - 1
+                if index == 0:
+                    return None
+                prev_start, prev_count = self.extents[index - 1]
+                return prev_start + prev_count - 1
+        return None
+
+    def _scan_ranges(self, start_sector: int, end_sector: Optional[int]) -> List[Tuple[int, int]]:
+        # Los extents se recorren en orden de asignación: las cadenas de fragmentos siempre avanzan en ese orden
+        if end_sector is None:
+            end_sector = self.disk.total_sectors
+        ranges = []
+        for start, count in self.extents:
+            low = max(start, start_sector)
+            high = min(start + count, end_sector)
+            if high > low:
+                ranges.append((low, high - low))
+        return ranges
@@ -5,6 +5,7 @@ from typing import Dict, Any, List, Optional
 
 class RecordSerializer:
     # Convierte registros a formato binario de longitud fija y viceversa
+    fixed_layout = True  # Cada campo ocupa siempre el mismo offset dentro del registro
     
     def __init__(self):
         self.type_formats = {
@@ -88,6 +89,15 @@ class RecordSerializer:
         # Serializa un booleano
         return struct.pack('<?', value)
     
+    def get_field_offsets(self, schema: Dict[str, Any]) -> Dict[str, int]:
+        # Calcula el offset de cada campo dentro del registro de longitud fija
+        offsets = {}
+        offset = 0
+        for field in schema['fields']:
+            offsets[field['name']] = offset
+            offset += field['size']
+        return offsets
+    
     def deserialize_record(self, data: bytes, schema: Dict[str, Any]) -> Dict[str, Any]:
         # Deserializa un registro desde formato binario
         record = {}
@@ -145,4 +155,77 @@ class RecordSerializer:
     
     def _deserialize_boolean(self, data: bytes) -> bool:
         # Deserializa un booleano
-        return struct.unpack('<?', data)[0]
\ No newline at end of file
+        return struct.unpack('<?', data)[0]
+
+
+ROW_FORMAT_FIXED = 'FIXED'
+ROW_FORMAT_VARIABLE = 'VARIABLE'
+VARIABLE_TYPES = ('VARCHAR', 'TEXT')
+LENGTH_PREFIX_SIZE = 2  # Longitud de los campos variables en 2 bytes
+
+class VariableRecordSerializer(RecordSerializer):
+    # Formato de registro compacto: mapa de bits de NULL seguido solo de los campos no nulos.
+    # VARCHAR y TEXT se guardan con un prefijo de longitud en lugar de rellenarse hasta su tamaño
+    # declarado; el resto de tipos conserva su codificación de longitud fija.
+    fixed_layout = False
+
+    def serialize_record(self, record: Dict[str, Any], schema: Dict[str, Any]) -> bytes:
+        # Serializa un registro a formato binario de longitud variable
+        fields = schema['fields']
+        bitmap = bytearray(self.null_bitmap_size(schema))
+        serialized_parts = []
+        
+        for i, field in enumerate(fields):
+            value = record.get(field['name'])
+            
+            if value is None:
+                bitmap[i // 8] |= 1 << (i % 8)
+            elif field['type'] in VARIABLE_TYPES:
+                value_bytes = str(value).encode('utf-8')[:field['size']]
+                serialized_parts.append(struct.pack('<H', len(value_bytes)))
+                serialized_parts.append(value_bytes)
+            else:
+                serialized_parts.append(self._serialize_field(value, field['type'], field['size']))
+        
+        return bytes(bitmap) + b''.join(serialized_parts)
+    
+    def deserialize_record(self, data: bytes, schema: Dict[str, Any]) -> Dict[str, Any]:
+        # Deserializa un registro desde formato binario de longitud variable
+        record = {}
+        offset = self.null_bitmap_size(schema)
+        
+        for i, field in enumerate(schema['fields']):
+            if data[i // 8] & (1 << (i % 8)):
+                record[field['name']] = None
+            elif field['type'] in VARIABLE_TYPES:
+                length = struct.unpack_from('<H', data, offset)[0]
+                offset += LENGTH_PREFIX_SIZE
+                record[field['name']] = data[offset:offset + length].decode('utf-8', errors='ignore')
+                offset += length
+            else:
+                field_data = data[offset:offset + field['size']]
+                offset += field['size']
+                record[field['name']] = self._deserialize_field(field_data, field['type'], field['size'])
+        
+        return record
+    
+    def get_field_offsets(self, schema: Dict[str, Any]) -> Dict[str, int]:
+        raise ValueError("El formato variable no tiene offsets de campo fijos")
+    
+    def null_bitmap_size(self, schema: Dict[str, Any]) -> int:
+        return (len(schema['fields']) + 7) // 8
+    
+    def max_record_size(self, schema: Dict[str, Any]) -> int:
+        # Tamaño máximo que puede ocupar un registro con este formato
+        size = self.null_bitmap_size(schema)
+        for field in schema['fields']:
+            size += field['size']
+            if field['type'] in VARIABLE_TYPES:
+                size += LENGTH_PREFIX_SIZE
+        return size
+
+def create_serializer(schema: Dict[str, Any]) -> RecordSerializer:
+    # Elige el serializador según el formato de registro declarado en el esquema (ROW_FORMAT)
+    if schema.get('row_format', ROW_FORMAT_FIXED) == ROW_FORMAT_VARIABLE:
+        return VariableRecordSerializer()
+    return RecordSerializer()
@@ -0,0 +1,55 @@
+# Superbloque: región fija al comienzo del archivo del disco con la geometría y la versión del
+# formato de fragmentos, para reabrir un disco sin volver a indicarlos. Los sectores empiezan
+# después de esta región. Los discos anteriores al superbloque no la tienen y sus sectores
+# empiezan en el byte 0
+#
+#   magia (8) | versión del superbloque (H) | formato de fragmentos (H) | platos (I) | pistas (I) |
+#   sectores por pista (I) | bytes por sector (I) | orden de sectores lógicos (16s) | CRC32 (I)
+
+import os
+import struct
+import zlib
+from dataclasses import dataclass
+from typing import Optional
+
+SUPERBLOCK_MAGIC = b'DBSIMSB\x00'
+SUPERBLOCK_VERSION = 1
+SUPERBLOCK_BYTES = 512  # Región reservada; los sectores del disco empiezan después
+_LAYOUT = struct.Struct('<8s H H I I I I 16s')
+_CHECKSUM = struct.Struct('<I')
+
+@dataclass
+class Superblock:
+    # Los mismos campos que DiskGeometry más la versión del formato de fragmentos
+    platters: int
+    tracks: int
+    sectors: int
+    sector_size: int
+    lba_mapping: str
+    format_version: int
+
+    def pack(self) -> bytes:
+        body = _LAYOUT.pack(SUPERBLOCK_MAGIC, SUPERBLOCK_VERSION, self.format_version, self.platters,
+                            self.tracks, self.sectors, self.sector_size, self.lba_mapping.encode('ascii'))
+        return (body + _CHECKSUM.pack(zlib.crc32(body))).ljust(SUPERBLOCK_BYTES, b'\x00')
+
+    @classmethod
+    def unpack(cls, data: bytes) -> Optional['Superblock']:
+        # None si los bytes no son un superbloque (por ejemplo, el sector 0 de un disco anterior)
+        end = _LAYOUT.size + _CHECKSUM.size
+        if len(data) < end or not data.startswith(SUPERBLOCK_MAGIC):
+            return None
+        body = data[:_LAYOUT.size]
+        if _CHECKSUM.unpack(data[_LAYOUT.size:end])[0] != zlib.crc32(body):
+            raise ValueError("El superbloque del disco está dañado")
+        _, version, format_version, platters, tracks, sectors, sector_size, mapping = _LAYOUT.unpack(body)
+        if version != SUPERBLOCK_VERSION:
+            raise ValueError(f"Versión de superbloque desconocida: {version}")
+        return cls(platters, tracks, sectors, sector_size, mapping.rstrip(b'\x00').decode('ascii'), format_version)
+
+def read_superblock(filename: str) -> Optional[Superblock]:
+    # Superbloque del archivo de disco, o None si el archivo no existe o es anterior al superbloque
+    if not os.path.exists(filename):
+        return None
+    with open(filename, 'rb') as f:
+        return Superblock.unpack(f.read(SUPERBLOCK_BYTES))
@@ -0,0 +1,182 @@
+# Recorrido secuencial de tabla con evaluación de predicados sobre los bytes crudos
+
+import struct
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+from .sector_manager import SectorManager
+from .serialization import RecordSerializer
+
+NUMERIC_TYPES = ('INTEGER', 'INT', 'BIGINT', 'SMALLINT', 'TINYINT', 'DECIMAL', 'FLOAT', 'DOUBLE')
+STRING_TYPES = ('CHAR', 'VARCHAR', 'TEXT', 'DATE', 'DATETIME')
+BOOLEAN_TYPES = ('BOOLEAN', 'BOOL')
+
+def parse_number(value: Any) -> Optional[Any]:
+    # Número de un literal que puede llegar como texto (por ejemplo "3.7" para un campo INTEGER);
+    # None si no es numérico. Los textos enteros se mantienen enteros para no perder precisión
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return value
+    if isinstance(value, str):
+        for convert in (int, float):
+            try:
+                return convert(value)
+            except ValueError:
+                pass
+    return None
+
+def _never(data: bytes) -> bool:
+    return False
+
+class Predicate:
+    # Condición simple sobre un campo: =, <, >, <=, >=, BETWEEN (inclusivo) o PREFIX
+    OPERATORS = ('=', '<', '>', '<=', '>=', 'BETWEEN', 'PREFIX')
+
+    def __init__(self, field: str, operator: str, value: Any, upper: Any = None, ignore_case: bool = False):
+        operator = operator.upper()
+        if operator not in self.OPERATORS:
+            raise ValueError(f"Operador no soportado: {operator}")
+        if operator == 'BETWEEN' and upper is None:
+            raise ValueError("BETWEEN requiere un límite superior")
+        self.field = field
+        self.operator = operator
+        self.value = value
+        self.upper = upper
+        self.ignore_case = ignore_case
+
+    def __repr__(self) -> str:
+        if self.operator == 'BETWEEN':
+            return f"{self.field} BETWEEN {self.value!r} AND {self.upper!r}"
+        return f"{self.field} {self.operator} {self.value!r}"
+
+    def compile(self, schema: Dict[str, Any], serializer: RecordSerializer) -> Callable[[bytes], bool]:
+        # Genera una función que evalúa el predicado sobre el registro serializado,
+        # leyendo solo los bytes del campo en su offset conocido
+        field = next((f for f in schema['fields'] if f['name'] == self.field), None)
+        if field is None:
+            raise ValueError(f"Campo desconocido: {self.field}")
+        start = serializer.get_field_offsets(schema)[self.field]
+        end = start + field['size']
+        field_type = field['type']
+
+        if field_type in NUMERIC_TYPES or field_type in BOOLEAN_TYPES:
+            if self.operator == 'PREFIX':
+                raise ValueError(f"PREFIX solo aplica a campos de texto, no a {field_type}")
+            value, upper = self.value, self.upper
+            if field_type in NUMERIC_TYPES:
+                value = self._number(value)
+                upper = self._number(upper) if upper is not None else None
+            if self.operator == '=' and field_type not in ('DECIMAL', 'FLOAT', 'DOUBLE'):
+                if field_type in NUMERIC_TYPES:
+                    # Un literal que el campo no puede representar (con decimales o fuera de rango)
+                    # no coincide con ningún registro
+                    if isinstance(value, float):
+                        if not value.is_integer():
+                            return _never
+                        value = int(value)
+                    bits = struct.calcsize('<' + serializer.type_formats.get(field_type, 'i')) * 8
+                    if not -(1 << (bits - 1)) <= value < (1 << (bits - 1)):
+                        return _never
+                # Igualdad exacta de bytes: no hace falta decodificar el campo
+                expected = serializer._serialize_field(value, field_type, field['size'])
+                return lambda data: data[start:end] == expected
+            unpack_from = struct.Struct('<' + serializer.type_formats.get(field_type, 'i')).unpack_from
+            compare = self._comparator(value, upper)
+            return lambda data: compare(unpack_from(data, start)[0])
+
+        # Texto: los valores se guardan con relleno de espacios y los NULL como ceros
+        null_field = b'\x00' * field['size']
+        if self.operator == '=':
+            if len(str(self.value).encode('utf-8')) > field['size']:
+                # Se truncaría al tamaño del campo y podría coincidir con otro valor
+                return _never
+            expected = serializer._serialize_string(str(self.value), field['size'])
+            if self.ignore_case:
+                expected = expected.lower()
+                return lambda data: data[start:end].lower() == expected
+            return lambda data: data[start:end] == expected
+        if self.operator == 'PREFIX':
+            prefix = self._encode(self.value)
+            return lambda data: self._normalize(data[start:end]).startswith(prefix)
+        compare = self._comparator(self._encode(self.value),
+                                   self._encode(self.upper) if self.upper is not None else None)
+
+        def check(data: bytes) -> bool:
+            raw = data[start:end]
+            return raw != null_field and compare(self._normalize(raw))
+        return check
+
+    def matches(self, record: Dict[str, Any]) -> bool:
+        # Evalúa el predicado sobre un registro ya decodificado (formatos sin offsets fijos)
+        value = record.get(self.field)
+        if value is None:
+            return False
+        low, high = self.value, self.upper
+        if isinstance(value, str):
+            value = value.lower() if self.ignore_case else value
+            low = self._text(low)
+            high = self._text(high) if high is not None else None
+            if self.operator == 'PREFIX':
+                return value.startswith(low)
+        elif self.operator == 'PREFIX':
+            raise ValueError("PREFIX solo aplica a campos de texto")
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            # Mismas conversiones que compile(): un literal fraccionario o fuera de rango nunca es
+            # igual a un entero, y los rangos comparan contra el número
+            low = self._number(low)
+            high = self._number(high) if high is not None else None
+        return self._comparator(low, high)(value)
+
+    def _number(self, value: Any) -> Any:
+        number = parse_number(value)
+        if number is None:
+            raise ValueError(f"Valor no numérico para el campo {self.field}: {value!r}")
+        return number
+
+    def _text(self, value: Any) -> str:
+        return str(value).lower() if self.ignore_case else str(value)
+
+    def _encode(self, value: Any) -> bytes:
+        encoded = str(value).encode('utf-8')
+        return encoded.lower() if self.ignore_case else encoded
+
+    def _normalize(self, raw: bytes) -> bytes:
+        raw = raw.rstrip(b' ')
+        return raw.lower() if self.ignore_case else raw
+
+    def _comparator(self, value: Any, upper: Any) -> Callable[[Any], bool]:
+        if self.operator == '=':
+            return lambda x: x == value
+        if self.operator == '<':
+            return lambda x: x < value
+        if self.operator == '>':
+            return lambda x: x > value
+        if self.operator == '<=':
+            return lambda x: x <= value
+        if self.operator == '>=':
+            return lambda x: x >= value
+        return lambda x: value <= x <= upper
+
+class TableScan:
+    # Operador de recorrido completo: lee los sectores en orden físico, siguiendo las cadenas
+    # de fragmentos, y solo decodifica los registros que cumplen todos los predicados
+
+    def __init__(self, sector_manager: SectorManager, schema: Dict[str, Any],
+                 serializer: Optional[RecordSerializer] = None):
+        self.sector_manager = sector_manager
+        self.schema = schema
+        self.serializer = serializer or RecordSerializer()
+
+    def scan(self, predicates: Iterable[Predicate] = (), start_sector: int = 0,
+             end_sector: Optional[int] = None) -> Iterator[Tuple[Tuple[int, int], Dict[str, Any]]]:
+        # Produce de forma perezosa los pares ((sector, offset), registro) que cumplen los predicados
+        predicates = list(predicates)
+        if not self.serializer.fixed_layout:
+            # Sin offsets fijos no hay evaluación sobre bytes crudos: se decodifica y luego se filtra
+            for sector, offset, data in self.sector_manager.iter_records(start_sector, end_sector):
+                record = self.serializer.deserialize_record(data, self.schema)
+                if all(p.matches(record) for p in predicates):
+                    yield (sector, offset), record
+            return
+        checks = [p.compile(self.schema, self.serializer) for p in predicates]
+        for sector, offset, data in self.sector_manager.iter_records(start_sector, end_sector):
+            if all(check(data) for check in checks):
+                yield (sector, offset), self.serializer.deserialize_record(data, self.schema)
@@ -0,0 +1,263 @@
+# Volúmenes formados por varios discos virtuales. Se usan en lugar de un Disk: exponen la misma
+# interfaz de sectores (lectura, escritura, mapa de sectores, estado) y reparten la E/S entre
+# los discos miembro, cada uno en su propio archivo
+
+import os
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Tuple
+
+from diagnostics.io_stats import IOStats
+from .disk import Disk, DiskGeometry
+from .free_extents import SectorMap
+from .record_format import CURRENT_FORMAT
+
+DEFAULT_STRIPE_UNIT = 8  # Sectores consecutivos de un mismo disco antes de pasar al siguiente
+MEMBER_COUNTERS = ('file_opens', 'head_moves', 'seek_distance')  # Se suman al volumen
+
+def member_filename(filename: str, index: int) -> str:
+    return f"{filename}.d{index}"
+
+class MemberVolume(Disk):
+    # Base de los volúmenes: discos miembro con la misma geometría, mapa de sectores propio sobre
+    # el espacio lógico, grupo de hilos para operar en varios miembros y disposición persistente
+    kind = ''
+
+    def __init__(self, geometry: DiskGeometry, filename: str, members: int):
+        if members < 1:
+            raise ValueError("El volumen necesita al menos un disco")
+        self.geometry = geometry
+        self.filename = filename
+        self.stats = IOStats()
+        self._head_cylinder = 0
+        self._requested_format = None
+        self.record_format = CURRENT_FORMAT  # El volumen guarda su propio formato junto a su mapa
+        self.members = [Disk(geometry, member_filename(filename, i)) for i in range(members)]
+        self.sector_size = geometry.sector_size
+        self.total_sectors = self._logical_sectors()
+        self.total_capacity = self.total_sectors * self.sector_size
+        self.sector_map = SectorMap(self.total_sectors)
+        self._executor = ThreadPoolExecutor(max_workers=members, thread_name_prefix='volume')
+        self._check_layout()
+        self._load_sector_map()
+        self._check_format()
+
+    def _logical_sectors(self) -> int:
+        raise NotImplementedError
+
+    def _layout(self) -> Dict[str, Any]:
+        return {'kind': self.kind, 'members': len(self.members)}
+
+    def _check_layout(self):
+        # La disposición se guarda junto al volumen; reabrirlo con otra daría sectores mezclados
+        layout = self._layout()
+        layout_filename = self.filename + ".volume"
+        if os.path.exists(layout_filename):
+            with open(layout_filename, 'rb') as f:
+                saved = pickle.load(f)
+            if saved != layout:
+                raise ValueError(f"El volumen {self.filename} fue creado con otra disposición: {saved}")
+        else:
+            with open(layout_filename, 'wb') as f:
+                pickle.dump(layout, f)
+
+    def _parallel(self, calls: Dict[int, Callable[[], Any]]) -> Dict[int, Any]:
+        # Ejecuta una operación por miembro (en paralelo si hay más de una) y suma al volumen
+        # las aperturas de archivo y movimientos de cabezal de los miembros
+        before = {m: [self.members[m].stats.counters[c] for c in MEMBER_COUNTERS] for m in calls}
+        if len(calls) == 1:
+            member, call = next(iter(calls.items()))
+            results = {member: call()}
+        else:
+            futures = {member: self._executor.submit(call) for member, call in calls.items()}
+            results = {member: future.result() for member, future in futures.items()}
+        for member, counts in before.items():
+            for counter, previous in zip(MEMBER_COUNTERS, counts):
+                self.stats.count(counter, self.members[member].stats.counters[counter] - previous)
+        return results
+
+    def _initialize_disk(self):
+        self.sector_map = SectorMap(self.total_sectors)
+        self._save_sector_map()
+
+    def _load_sector_map(self):
+        if os.path.exists(self.filename + ".map"):
+            super()._load_sector_map()
+        else:
+            self._initialize_disk()
+
+    def get_disk_status(self) -> Dict:
+        status = super().get_disk_status()
+        status['volume'] = self.kind
+        status['members'] = [{
+            'file': member.filename,
+            'read_ops': member.stats.counters['read_ops'],
+            'write_ops': member.stats.counters['write_ops'],
+            'sectors_read': member.stats.counters['sectors_read']
+        } for member in self.members]
+        return status
+
+class StripedVolume(MemberVolume):
+    # Volumen RAID-0: el sector lógico L pertenece a la franja L // stripe_unit, y las franjas se
+    # reparten en rueda entre los discos miembro. Cada operación se divide en un tramo contiguo
+    # por miembro y los tramos se leen o escriben en paralelo desde un grupo de hilos.
+    # `geometry` es la de cada miembro: la capacidad del volumen es la suma de todos
+    kind = 'striped'
+
+    def __init__(self, geometry: DiskGeometry, filename: str, members: int = 2,
+                 stripe_unit: int = DEFAULT_STRIPE_UNIT):
+        if stripe_unit < 1:
+            raise ValueError("La unidad de franja debe ser positiva")
+        self.stripe_unit = stripe_unit
+        super().__init__(geometry, filename, members)
+
+    def _logical_sectors(self) -> int:
+        return len(self.members) * self.members[0].total_sectors
+
+    def _layout(self) -> Dict[str, Any]:
+        return dict(super()._layout(), stripe_unit=self.stripe_unit)
+
+    # ----------------------- Ubicación -----------------------
+    def _locate(self, sector: int) -> Tuple[int, int]:
+        # (miembro, sector dentro del miembro) de un sector lógico
+        stripe, within = divmod(sector, self.stripe_unit)
+        return stripe % len(self.members), (stripe // len(self.members)) * self.stripe_unit + within
+
+    def _split(self, position: int, length: int) -> Tuple[List[Tuple[int, int]], Dict[int, Tuple[int, int]]]:
+        # Divide los bytes [position, position + length) del volumen en trozos por franja.
+        # Retorna los trozos en orden lógico (miembro, largo) y, por miembro, su tramo contiguo
+        # (posición en bytes dentro del miembro, largo total). Las franjas sucesivas de un mismo
+        # miembro son contiguas dentro de él, así que cada miembro recibe una sola operación
+        unit_bytes = self.stripe_unit * self.sector_size
+        pieces: List[Tuple[int, int]] = []
+        spans: Dict[int, Tuple[int, int]] = {}
+        end = position + length
+        while position < end:
+            stripe, within = divmod(position, unit_bytes)
+            take = min(unit_bytes - within, end - position)
+            member = stripe % len(self.members)
+            member_position = (stripe // len(self.members)) * unit_bytes + within
+            pieces.append((member, take))
+            if member in spans:
+                spans[member] = (spans[member][0], spans[member][1] + take)
+            else:
+                spans[member] = (member_position, take)
+            position += take
+        return pieces, spans
+
+    # ----------------------- Lectura y escritura -----------------------
+    def read_sectors(self, start_sector: int, count: int = 1) -> bytes:
+        if start_sector < 0 or count < 0 or start_sector + count > self.total_sectors:
+            raise ValueError("Rango de sectores fuera del disco")
+        size = self.sector_size
+        self.stats.count('read_ops')
+        self.stats.count('sectors_read', count)
+        self.stats.count('bytes_read', count * size)
+        pieces, spans = self._split(start_sector * size, count * size)
+        buffers = self._parallel({
+            member: (lambda disk=self.members[member], span=span: disk.read_sectors(span[0] // size, span[1] // size))
+            for member, span in spans.items()
+        })
+        positions = dict.fromkeys(buffers, 0)
+        parts = []
+        for member, take in pieces:
+            parts.append(buffers[member][positions[member]:positions[member] + take])
+            positions[member] += take
+        return b''.join(parts)
+
+    def write_at(self, sector: int, offset: int, data: bytes):
+        if sector < 0 or sector >= self.total_sectors:
+            raise ValueError("Número de sector fuera de rango")
+        size = self.sector_size
+        position = sector * size + offset
+        length = min(len(data), self.total_capacity - position)
+        self.stats.count('write_ops')
+        self.stats.count('bytes_written', length)
+        pieces, spans = self._split(position, length)
+        chunks: Dict[int, List[bytes]] = {member: [] for member in spans}
+        consumed = 0
+        for member, take in pieces:
+            chunks[member].append(data[consumed:consumed + take])
+            consumed += take
+        self._parallel({
+            member: (lambda disk=self.members[member], span=span, payload=b''.join(chunks[member]):
+                     disk.write_at(span[0] // size, span[0] % size, payload))
+            for member, span in spans.items()
+        })
+
+    # ----------------------- Estado -----------------------
+    def _get_physical_location(self, sector_num: int) -> Dict[str, int]:
+        # Disco miembro y coordenadas físicas dentro de él
+        if sector_num >= self.total_sectors:
+            raise ValueError("Número de sector fuera de rango")
+        member, member_sector = self._locate(sector_num)
+        location = self.members[member]._get_physical_location(member_sector)
+        location['disk'] = member
+        return location
+
+    def get_disk_status(self) -> Dict:
+        status = super().get_disk_status()
+        status['stripe_unit'] = self.stripe_unit
+        return status
+
+class MirroredVolume(MemberVolume):
+    # Volumen RAID-1: cada miembro es una réplica completa. Las escrituras van a todas las réplicas
+    # (en paralelo) y cada lectura a la réplica cuyo cabezal simulado está más cerca de la pista
+    # pedida. Para medir el ahorro se sigue también el cabezal de un disco único que atendiera
+    # todas las operaciones
+    kind = 'mirrored'
+
+    def __init__(self, geometry: DiskGeometry, filename: str, members: int = 2):
+        super().__init__(geometry, filename, members)
+        self._single_head = 0
+        self.mirror_stats = {'reads_per_replica': [0] * members, 'read_seek_distance': 0,
+                             'single_disk_read_seek_distance': 0}
+
+    def _logical_sectors(self) -> int:
+        return self.members[0].total_sectors
+
+    def _travel(self, head: int, start_sector: int, count: int) -> Tuple[int, int]:
+        # Distancia (en pistas) hasta el primer sector y de ahí al último, y la pista final
+        first = self._cylinder(start_sector)
+        last = self._cylinder(start_sector + count - 1) if count > 1 else first
+        return abs(first - head) + abs(last - first), last
+
+    def read_sectors(self, start_sector: int, count: int = 1) -> bytes:
+        if start_sector < 0 or count < 0 or start_sector + count > self.total_sectors:
+            raise ValueError("Rango de sectores fuera del disco")
+        self.stats.count('read_ops')
+        self.stats.count('sectors_read', count)
+        self.stats.count('bytes_read', count * self.sector_size)
+        if count == 0:
+            return b''
+        distances = [self._travel(member._head_cylinder, start_sector, count)[0] for member in self.members]
+        replica = min(range(len(self.members)), key=lambda i: (distances[i], i))
+        single_distance, self._single_head = self._travel(self._single_head, start_sector, count)
+        self.mirror_stats['reads_per_replica'][replica] += 1
+        self.mirror_stats['read_seek_distance'] += distances[replica]
+        self.mirror_stats['single_disk_read_seek_distance'] += single_distance
+        disk = self.members[replica]
+        return self._parallel({replica: lambda: disk.read_sectors(start_sector, count)})[replica]
+
+    def write_at(self, sector: int, offset: int, data: bytes):
+        if sector < 0 or sector >= self.total_sectors:
+            raise ValueError("Número de sector fuera de rango")
+        self.stats.count('write_ops')
+        self.stats.count('bytes_written', len(data))
+        end_sector = min(self.total_sectors, sector + (offset + len(data) + self.sector_size - 1) // self.sector_size)
+        _, self._single_head = self._travel(self._single_head, sector, max(1, end_sector - sector))
+        self._parallel({i: (lambda disk=member: disk.write_at(sector, offset, data))
+                        for i, member in enumerate(self.members)})
+
+    def get_disk_status(self) -> Dict:
+        status = super().get_disk_status()
+        status['mirror'] = self.mirror_report()
+        return status
+
+    def mirror_report(self) -> Dict[str, Any]:
+        # Lecturas por réplica y distancia de búsqueda de las lecturas frente a un disco único
+        report = dict(self.mirror_stats, reads_per_replica=list(self.mirror_stats['reads_per_replica']))
+        baseline = report['single_disk_read_seek_distance']
+        report['seek_saved'] = baseline - report['read_seek_distance']
+        report['seek_saved_ratio'] = report['seek_saved'] / baseline if baseline else None
+        return report
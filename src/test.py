@@ -1,6 +1,7 @@
 import sys
 import os
 import struct
+import tempfile
 
 # Agregar el directorio src al path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
@@ -117,16 +118,16 @@ def test_fragmented_write_read():
         total_read = 0
         while True:
             with open(disk.filename, 'rb') as f:
-                f.seek(current_sector * disk.sector_size + current_offset)
-                header = f.read(6)
-                if len(header) < 6:
+                f.seek(disk.data_offset + current_sector * disk.sector_size + current_offset)
+                header = f.read(8)
+                if len(header) < 8:
                     break
-                fragment_size, next_sector, next_offset = struct.unpack('<H H H', header)
+                fragment_size, next_sector, next_offset = struct.unpack('<H I H', header)
                 fragment_data = f.read(fragment_size)
                 fragments.append((current_sector, current_offset, fragment_size, fragment_data))
                 total_read += fragment_size
             print(f"  Fragmento en sector {current_sector}, offset {current_offset}, tamaño {fragment_size}, next=({next_sector},{next_offset})")
-            if next_sector == 0xFFFF:
+            if next_sector == 0xFFFFFFFF:
                 break
             current_sector, current_offset = next_sector, next_offset
         print(f"Total leído en fragmentos: {total_read} bytes")
@@ -139,6 +140,1094 @@ def test_fragmented_write_read():
         print(f"✗ Error en fragmentación: {e}")
         return False
 
+def test_record_arrays():
+    print("\nProbando recorrido con arreglos de NumPy")
+    try:
+        from storage.disk import Disk, DiskGeometry
+        from storage.sector_manager import SectorManager
+        from storage.serialization import RecordSerializer
+        from storage import record_arrays
+
+        if record_arrays.np is None:
+            print("- NumPy no instalado, prueba omitida")
+            return True
+
+        schema = {
+            'fields': [
+                {'name': 'id', 'type': 'INTEGER', 'size': 4},
+                {'name': 'name', 'type': 'VARCHAR', 'size': 20},
+                {'name': 'cost', 'type': 'DECIMAL', 'size': 8}
+            ],
+            'record_size': 32
+        }
+        with tempfile.TemporaryDirectory() as tmp:
+            geometry = DiskGeometry(platters=1, tracks=2, sectors=8, sector_size=50)
+            manager = SectorManager(Disk(geometry, os.path.join(tmp, "arrays.bin")))
+            serializer = RecordSerializer()
+            for i in range(10):
+                record = {'id': i, 'name': f'item {i}', 'cost': i * 1.5}
+                manager.write_record(serializer.serialize_record(record, schema))
+
+            scanner = record_arrays.RecordArrayScanner(manager, schema)
+            columns = scanner.scan_columns(['id', 'cost'])
+            tail = scanner.scan(start_sector=5)
+
+        if list(columns['id']) == list(range(10)) and columns['cost'].sum() == 67.5 \
+                and 0 < len(tail) < 10 and list(tail['id']) == list(range(10 - len(tail), 10)):
+            print("✓ Recorrido con arreglos funciona correctamente")
+            return True
+        print("✗ Error en el recorrido con arreglos")
+        return False
+    except Exception as e:
+        print(f"✗ Error en recorrido con arreglos: {e}")
+        return False
+
+def test_table_scan():
+    print("\nProbando recorrido completo con predicados")
+    try:
+        from storage.disk import Disk, DiskGeometry
+        from storage.sector_manager import SectorManager
+        from storage.serialization import RecordSerializer
+        from storage.table_scan import Predicate, TableScan
+
+        schema = {
+            'fields': [
+                {'name': 'id', 'type': 'INTEGER', 'size': 4},
+                {'name': 'name', 'type': 'VARCHAR', 'size': 20},
+                {'name': 'cost', 'type': 'DECIMAL', 'size': 8}
+            ],
+            'record_size': 32
+        }
+        with tempfile.TemporaryDirectory() as tmp:
+            geometry = DiskGeometry(platters=1, tracks=2, sectors=8, sector_size=50)
+            manager = SectorManager(Disk(geometry, os.path.join(tmp, "scan.bin")))
+            serializer = RecordSerializer()
+            for i in range(10):
+                record = {'id': i, 'name': f'Item {i}', 'cost': i * 1.5}
+                manager.write_record(serializer.serialize_record(record, schema))
+
+            scan = TableScan(manager, schema, serializer)
+            equal = [r['id'] for _, r in scan.scan([Predicate('id', '=', 7)])]
+            between = [r['id'] for _, r in scan.scan([Predicate('cost', 'BETWEEN', 3.0, 6.0)])]
+            prefix = [r['id'] for _, r in scan.scan([Predicate('name', 'PREFIX', 'item 1', ignore_case=True)])]
+            combined = [r['id'] for _, r in scan.scan([Predicate('id', '>', 2), Predicate('name', '<', 'Item 5')])]
+            address, record = next(scan.scan([Predicate('id', '=', 4)]))
+            same = serializer.deserialize_record(manager.read_record(*address), schema) == record
+            # Literales que el campo no puede representar no coinciden con nada, sin errores de struct
+            unrepresentable = [list(scan.scan([p])) for p in (Predicate('id', '=', 99999999999),
+                                                              Predicate('id', '=', 3.7),
+                                                              Predicate('name', '=', 'Item 1' + ' x' * 20))]
+            textual = [r['id'] for _, r in scan.scan([Predicate('id', '=', '3.0')])]
+            try:
+                list(scan.scan([Predicate('id', '=', 'abc')]))
+                rejected = False
+            except ValueError:
+                rejected = True
+
+        if equal == [7] and between == [2, 3, 4] and prefix == [1] and combined == [3, 4] and same \
+                and unrepresentable == [[], [], []] and textual == [3] and rejected:
+            print("✓ Recorrido completo funciona correctamente")
+            return True
+        print("✗ Error en el recorrido completo")
+        return False
+    except Exception as e:
+        print(f"✗ Error en recorrido completo: {e}")
+        return False
+
+def test_catalog():
+    print("\nProbando catálogo con varias tablas")
+    try:
+        from data_management.schema_parser import SchemaParser
+        from storage.disk import Disk, DiskGeometry
+        from storage.catalog import Catalog
+        from storage.serialization import RecordSerializer
+        from storage.table_scan import TableScan
+
+        schemas = SchemaParser().parse_create_tables("""
+        CREATE TABLE CLIENTE(id INTEGER PRIMARY KEY, nombre VARCHAR(20) NOT NULL);
+        CREATE TABLE PEDIDO(id INTEGER PRIMARY KEY, cliente INTEGER NOT NULL, total DECIMAL(10, 2));
+        """)
+        serializer = RecordSerializer()
+        with tempfile.TemporaryDirectory() as tmp:
+            geometry = DiskGeometry(platters=1, tracks=4, sectors=16, sector_size=64)
+            disk = Disk(geometry, os.path.join(tmp, "catalog.bin"))
+            catalog = Catalog(disk)
+            for schema in schemas:
+                catalog.create_table(schema, extent_sectors=4)
+            clientes = catalog.get_sector_manager('cliente')
+            pedidos = catalog.get_sector_manager('PEDIDO')
+            for i in range(20):
+                address = clientes.write_record(serializer.serialize_record({'id': i, 'nombre': f'c{i}'}, schemas[0]))
+                catalog.get_table('CLIENTE').primary_index.insert(i, address)
+                pedidos.write_record(serializer.serialize_record({'id': i, 'cliente': i, 'total': 1.0}, schemas[1]))
+            catalog.save()
+
+            reopened = Catalog(Disk(geometry, os.path.join(tmp, "catalog.bin")))
+            entry = reopened.get_table('CLIENTE')
+            own_sectors = {s for start, count in entry.extents for s in range(start, start + count)}
+            other = reopened.get_table('PEDIDO')
+            other_sectors = {s for start, count in other.extents for s in range(start, start + count)}
+            scanned = list(TableScan(reopened.get_sector_manager('CLIENTE'), schemas[0], serializer).scan())
+            node = entry.primary_index.search(7)
+
+        if len(scanned) == 20 and not own_sectors & other_sectors \
+                and all(address[0] in own_sectors for address, _ in scanned) \
+                and [r['id'] for _, r in scanned] == list(range(20)) and node and node.addresses:
+            print("✓ Catálogo funciona correctamente")
+            return True
+        print("✗ Error en el catálogo")
+        return False
+    except Exception as e:
+        print(f"✗ Error en catálogo: {e}")
+        return False
+
+def test_variable_format():
+    print("\nProbando formato de registro variable")
+    try:
+        from data_management.schema_parser import SchemaParser
+        from storage.disk import Disk, DiskGeometry
+        from storage.sector_manager import SectorManager
+        from storage.serialization import RecordSerializer, create_serializer
+        from storage.table_scan import Predicate, TableScan
+
+        sql = """
+        CREATE TABLE PRODUCTO(
+            index INTEGER(10) PRIMARY KEY,
+            item VARCHAR(40),
+            cost DECIMAL(10, 2) NOT NULL
+        ) ROW_FORMAT=VARIABLE;
+        """
+        schema = SchemaParser().parse_create_table(sql)
+        serializer = create_serializer(schema)
+        record = {'index': 1, 'item': 'Socks', 'cost': 7.97}
+        with_null = {'index': 2, 'item': None, 'cost': 1.5}
+        data = serializer.serialize_record(record, schema)
+        null_data = serializer.serialize_record(with_null, schema)
+        fixed_size = len(RecordSerializer().serialize_record(record, schema))
+
+        # Los literales numéricos en texto se evalúan igual que en el formato fijo
+        fixed_schema = SchemaParser().parse_create_table(sql.replace(' ROW_FORMAT=VARIABLE', ''))
+        predicates = [Predicate('index', '<', '3.7'), Predicate('index', '=', '3'), Predicate('index', '=', 3.5),
+                      Predicate('index', '=', 99999999999), Predicate('index', 'BETWEEN', '2', 4.0)]
+        results = {}
+        with tempfile.TemporaryDirectory() as tmp:
+            for name, table_schema in (('variable', schema), ('fixed', fixed_schema)):
+                manager = SectorManager(Disk(DiskGeometry(platters=1, tracks=2, sectors=8, sector_size=64),
+                                             os.path.join(tmp, f"{name}.bin")))
+                table_serializer = create_serializer(table_schema)
+                for i in range(6):
+                    manager.write_record(table_serializer.serialize_record(
+                        {'index': i, 'item': f'Item {i}', 'cost': i * 1.5}, table_schema))
+                scan = TableScan(manager, table_schema, table_serializer)
+                results[name] = [[r['index'] for _, r in scan.scan([p])] for p in predicates]
+
+        if schema['row_format'] == 'VARIABLE' and len(data) < fixed_size \
+                and results['variable'] == results['fixed'] == [[0, 1, 2, 3], [3], [], [], [2, 3, 4]] \
+                and serializer.deserialize_record(data, schema) == record \
+                and serializer.deserialize_record(null_data, schema) == with_null \
+                and Predicate('item', 'PREFIX', 'soc', ignore_case=True).matches(record):
+            print(f"✓ Formato variable funciona correctamente ({len(data)} vs {fixed_size} bytes)")
+            return True
+        print("✗ Error en el formato variable")
+        return False
+    except Exception as e:
+        print(f"✗ Error en formato variable: {e}")
+        return False
+
+def test_compressed_table():
+    print("\nProbando tabla con extents comprimidos")
+    try:
+        from data_management.schema_parser import SchemaParser
+        from storage.disk import Disk, DiskGeometry
+        from storage.catalog import Catalog
+        from storage.serialization import RecordSerializer
+        from storage.table_scan import TableScan
+
+        schema = SchemaParser().parse_create_table(
+            "CREATE TABLE LOG(id INTEGER PRIMARY KEY, mensaje VARCHAR(60) NOT NULL) COMPRESSION=ZLIB;")
+        serializer = RecordSerializer()
+        with tempfile.TemporaryDirectory() as tmp:
+            geometry = DiskGeometry(platters=1, tracks=4, sectors=16, sector_size=64)
+            catalog = Catalog(Disk(geometry, os.path.join(tmp, "compressed.bin")))
+            catalog.create_table(schema)
+            manager = catalog.get_sector_manager('LOG')
+            addresses = [manager.write_record(serializer.serialize_record(
+                {'id': i, 'mensaje': f'evento repetido numero {i % 3}'}, schema)) for i in range(100)]
+            catalog.save()
+            stats = manager.get_compression_stats()
+
+            reopened = Catalog(Disk(geometry, os.path.join(tmp, "compressed.bin")))
+            reader = reopened.get_sector_manager('LOG')
+            record = serializer.deserialize_record(reader.read_record(*addresses[57]), schema)
+            scanned = [r['id'] for _, r in TableScan(reader, schema, serializer).scan()]
+
+            # Búsqueda justo después de insertar, con el grupo todavía en memoria
+            from engine.database import Database
+            db = Database(DiskGeometry(platters=2, tracks=8, sectors=16, sector_size=128), os.path.join(tmp, "engine.bin"))
+            db.create_tables("CREATE TABLE T(id INTEGER PRIMARY KEY, name VARCHAR(10) NOT NULL) COMPRESSION=ZLIB;")
+            db.insert('T', {'id': 1, 'name': 'abc'})
+            pending = db.search('T', 'id', 1)['results']
+            pending_stats = db.get_sector_manager('T').get_compression_stats()
+            db.save()
+            written = db.search('T', 'id', 1)['results']
+
+            # Con el disco lleno, un grupo que crece al reescribirse no pierde sus datos
+            full_disk = Disk(DiskGeometry(platters=1, tracks=2, sectors=16, sector_size=64), os.path.join(tmp, "full.bin"))
+            full_catalog = Catalog(full_disk)
+            full_catalog.create_table(schema)
+            full = full_catalog.get_sector_manager('LOG')
+            first = full.write_record(serializer.serialize_record({'id': 0, 'mensaje': 'a' * 60}, schema))
+            full.flush()
+            old_run = full.state.groups[0][:2]
+            while full_disk.allocate_sectors(1) is not None:
+                pass
+            noisy = {'id': 1, 'mensaje': os.urandom(30).hex()}
+            second = full.write_record(serializer.serialize_record(noisy, schema))
+            try:
+                full.flush()
+                disk_full = False
+            except Exception:
+                disk_full = True
+            kept = full.state.groups[0][:2] == old_run and full_disk.sector_map[old_run[0]] \
+                and serializer.deserialize_record(full.read_record(*second), schema) == noisy \
+                and serializer.deserialize_record(full.read_record(*first), schema)['id'] == 0
+
+        if record['id'] == 57 and scanned == list(range(100)) and stats['compression_ratio'] > 2 \
+                and stats['physical_sectors'] < stats['logical_sectors'] \
+                and [m['record'] for m in pending] == [{'id': 1, 'name': 'abc'}] \
+                and pending[0]['physical_location'] is None and pending_stats['pending_groups'] == 1 \
+                and written[0]['physical_location'] is not None and disk_full and kept:
+            print(f"✓ Compresión funciona correctamente (razón {stats['compression_ratio']:.1f}x)")
+            return True
+        print("✗ Error en la tabla comprimida")
+        return False
+    except Exception as e:
+        print(f"✗ Error en tabla comprimida: {e}")
+        return False
+
+def test_database_engine():
+    print("\nProbando motor sin interfaz gráfica")
+    try:
+        from engine.database import Database
+        from storage.disk import DiskGeometry
+
+        data_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+        with tempfile.TemporaryDirectory() as tmp:
+            geometry = DiskGeometry(platters=2, tracks=10, sectors=8, sector_size=64)
+            db = Database(geometry, os.path.join(tmp, "engine.bin"))
+            tables = db.load_schema(os.path.join(data_dir, 'struct_table.txt'))
+            written = db.load_csv('PRODUCTO', os.path.join(data_dir, 'a.csv'))
+            by_index = db.search('PRODUCTO', 'item', db.parse_value('PRODUCTO', 'item', 'Deadpool DVD'))
+
+            reopened = Database(geometry, os.path.join(tmp, "engine.bin"))
+            by_key = reopened.search('PRODUCTO', 'index', 4)
+
+        if tables == ['PRODUCTO'] and written == 10 and by_index['method'] == 'index' \
+                and [m['record']['index'] for m in by_index['results']] == [4] \
+                and by_key['results'][0]['record']['item'] == 'Deadpool DVD' \
+                and 'tkinter' not in sys.modules:
+            print("✓ Motor sin interfaz gráfica funciona correctamente")
+            return True
+        print("✗ Error en el motor")
+        return False
+    except Exception as e:
+        print(f"✗ Error en motor: {e}")
+        return False
+
+def test_sql_query():
+    print("\nProbando consultas SELECT con planificación por índices")
+    try:
+        from engine.database import Database
+        from storage.disk import DiskGeometry
+
+        data_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+        with tempfile.TemporaryDirectory() as tmp:
+            db = Database(DiskGeometry(platters=2, tracks=10, sectors=8, sector_size=64),
+                          os.path.join(tmp, "query.bin"))
+            db.load_schema(os.path.join(data_dir, 'struct_table.txt'))
+            db.load_csv('PRODUCTO', os.path.join(data_dir, 'a.csv'))
+
+            by_key = db.query("SELECT item FROM PRODUCTO WHERE index = 4")
+            by_range = db.query("SELECT index, cost FROM PRODUCTO WHERE cost BETWEEN 2 AND 8 "
+                                "ORDER BY cost DESC LIMIT 3")
+            full = db.query("SELECT index FROM PRODUCTO WHERE cost > 0 ORDER BY index")
+            db.record_cache.clear()
+            explained = db.query("EXPLAIN SELECT * FROM PRODUCTO WHERE item LIKE 'dead%'")
+            scanned = [r['cost'] for _, r in db.scan('PRODUCTO') if 2 <= r['cost'] <= 8]
+            try:
+                db.query("SELECT * FROM PRODUCTO WHERE cost >= 'abc'")
+                mistyped = None
+            except ValueError as e:
+                mistyped = str(e)
+            # Mismas reglas numéricas que el recorrido de tabla: 3.0 es el entero 3
+            integral = db.query("SELECT item FROM PRODUCTO WHERE index = 3.0")
+            no_match = [len(db.query(f"SELECT * FROM PRODUCTO WHERE index = {v}").rows)
+                        for v in ('3.7', '99999999999')]
+
+        costs = [row['cost'] for row in by_range.rows]
+        if by_key.plan.access.kind == 'pk_lookup' and by_key.rows == [{'item': 'Deadpool DVD'}] \
+                and by_range.plan.access.kind == 'index_range' and by_range.plan.presorted \
+                and costs == sorted(scanned, reverse=True)[:3] \
+                and [row['index'] for row in full.rows] == list(range(1, 11)) \
+                and explained.plan.statement.explain and explained.sectors_read > 0 \
+                and [row['item'] for row in explained.rows] == ['Deadpool DVD'] \
+                and 'Lecturas de sector' in db.explain(explained) \
+                and mistyped is not None and 'cost' in mistyped \
+                and len(integral.rows) == 1 and no_match == [0, 0]:
+            print("✓ Consultas SELECT funcionan correctamente")
+            return True
+        print("✗ Error en las consultas SELECT")
+        return False
+    except Exception as e:
+        print(f"✗ Error en consultas SELECT: {e}")
+        return False
+
+def test_column_statistics():
+    print("\nProbando estadísticas de columna")
+    try:
+        from data_management.column_statistics import ColumnStatistics
+        from engine.database import Database
+        from storage.disk import DiskGeometry
+
+        column = ColumnStatistics('valor')
+        for i in range(5000):
+            column.add(7 if i % 4 == 0 else (i % 1000 if i % 10 else None))
+        distinct = column.distinct()
+        below = column.selectivity('<', 500)
+        common = column.most_common(1)
+        # La muestra ordenada se reutiliza entre estimaciones y se rehace cuando la muestra cambia
+        cached = column.sorted_sample() is column.sorted_sample()
+        column.add(-1)
+        column.add(-1)
+        refreshed = column.sorted_sample() == sorted(column.sample)
+
+        data_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+        with tempfile.TemporaryDirectory() as tmp:
+            db = Database(DiskGeometry(platters=2, tracks=10, sectors=8, sector_size=64),
+                          os.path.join(tmp, "stats.bin"))
+            db.load_schema(os.path.join(data_dir, 'struct_table.txt'))
+            db.load_csv('PRODUCTO', os.path.join(data_dir, 'a.csv'))
+            reopened = Database(db.disk.geometry, os.path.join(tmp, "stats.bin"))
+            item_stats = reopened.status()['tables'][0]['statistics']['item']
+            plan = reopened.query("SELECT * FROM PRODUCTO WHERE cost > 100").plan
+
+        if 650 <= distinct <= 750 and common == [(7, 1255)] and column.null_count == 250 \
+                and cached and refreshed and 0.5 < below < 0.7 and item_stats['distinct'] == 10 and item_stats['nulls'] == 0 \
+                and plan.estimated_output == 0 and plan.access.kind == 'index_range':
+            print(f"✓ Estadísticas de columna funcionan correctamente ({distinct} distintos estimados)")
+            return True
+        print("✗ Error en las estadísticas de columna")
+        return False
+    except Exception as e:
+        print(f"✗ Error en estadísticas de columna: {e}")
+        return False
+
+def test_io_stats():
+    print("\nProbando contadores de E/S")
+    try:
+        from engine.database import Database
+        from storage.disk import DiskGeometry
+
+        data_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+        with tempfile.TemporaryDirectory() as tmp:
+            db = Database(DiskGeometry(platters=2, tracks=10, sectors=8, sector_size=64),
+                          os.path.join(tmp, "io.bin"))
+            db.load_schema(os.path.join(data_dir, 'struct_table.txt'))
+            db.load_csv('PRODUCTO', os.path.join(data_dir, 'a.csv'))
+            loaded = db.io_stats()
+            db.reset_io_stats()
+            db.search('PRODUCTO', 'index', 7)
+            searched = db.io_stats()
+
+        counters = searched['counters']
+        latency = searched['latency']
+        if loaded['counters']['fragments_written'] >= 10 and loaded['latency']['write_record']['count'] == 10 \
+                and counters['write_ops'] == 0 and counters['sectors_read'] == counters['read_ops'] > 0 \
+                and counters['fragments_read'] >= 1 and counters['index_nodes_visited'] >= 1 \
+                and latency['search']['count'] == 1 and latency['read_record']['count'] == 1:
+            print("✓ Contadores de E/S funcionan correctamente")
+            return True
+        print("✗ Error en los contadores de E/S")
+        return False
+    except Exception as e:
+        print(f"✗ Error en contadores de E/S: {e}")
+        return False
+
+def test_tracing_profiling():
+    print("\nProbando trazado y perfilado")
+    try:
+        from diagnostics.profiling import profile_call
+        from diagnostics.tracing import span, tracing
+        from engine.database import Database
+        from storage.disk import DiskGeometry
+
+        data_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+        with tempfile.TemporaryDirectory() as tmp:
+            db = Database(DiskGeometry(platters=2, tracks=10, sectors=8, sector_size=64),
+                          os.path.join(tmp, "trace.bin"))
+            db.load_schema(os.path.join(data_dir, 'struct_table.txt'))
+            disabled = span('write_record')
+            with tracing() as tracer:
+                db.load_csv('PRODUCTO', os.path.join(data_dir, 'a.csv'))
+            profile = profile_call(db.search, 'PRODUCTO', 'index', 3)
+
+        summary = tracer.summary()
+        collapsed = tracer.collapsed().splitlines()
+        if type(disabled).__name__ == '_NullSpan' and summary['write_record']['count'] == 10 \
+                and summary['avl_insert']['count'] == 10 and 'csv_parse' in summary \
+                and any(line.startswith('load_csv;insert;write_record ') for line in collapsed) \
+                and profile.value['results'][0]['record']['index'] == 3 \
+                and any('_search_recursive' in stack for stack in profile.stacks):
+            print("✓ Trazado y perfilado funcionan correctamente")
+            return True
+        print("✗ Error en trazado y perfilado")
+        return False
+    except Exception as e:
+        print(f"✗ Error en trazado y perfilado: {e}")
+        return False
+
+def test_record_cache():
+    print("\nProbando caché de registros decodificados")
+    try:
+        from engine.database import Database
+        from storage.disk import DiskGeometry
+        from storage.record_cache import record_footprint
+
+        data_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+        with tempfile.TemporaryDirectory() as tmp:
+            db = Database(DiskGeometry(platters=2, tracks=10, sectors=8, sector_size=64),
+                          os.path.join(tmp, "cache.bin"))
+            db.load_schema(os.path.join(data_dir, 'struct_table.txt'))
+            db.load_csv('PRODUCTO', os.path.join(data_dir, 'a.csv'))
+            first = db.search('PRODUCTO', 'index', 5)['results'][0]
+            reads = db.disk.sectors_read
+            again = db.search('PRODUCTO', 'index', 5)['results'][0]
+            hot_reads = db.disk.sectors_read - reads
+            again['record']['item'] = 'modificado'
+            cached = db.read_record('PRODUCTO', first['address'])
+
+            db.get_sector_manager('PRODUCTO').free_sectors(*first['address'])
+            invalidated = db.record_cache.stats()['invalidations']
+
+            small = Database(db.disk.geometry, os.path.join(tmp, "cache.bin"),
+                             record_cache_bytes=2 * record_footprint(cached))
+            for key in range(1, 8):
+                small.search('PRODUCTO', 'index', key)
+            small_stats = small.record_cache.stats()
+
+        if hot_reads == 0 and cached['item'] == first['record']['item'] and invalidated == 1 \
+                and db.record_cache.stats()['hits'] >= 2 and small_stats['entries'] <= 2 \
+                and small_stats['evictions'] >= 4 and small_stats['used_bytes'] <= small_stats['max_bytes']:
+            print("✓ Caché de registros funciona correctamente")
+            return True
+        print("✗ Error en la caché de registros")
+        return False
+    except Exception as e:
+        print(f"✗ Error en caché de registros: {e}")
+        return False
+
+def test_query_server():
+    print("\nProbando servidor de consultas con agrupación de búsquedas")
+    try:
+        import asyncio
+        from engine.database import Database
+        from storage.disk import DiskGeometry
+        from server.client import QueryClient
+        from server.query_server import QueryServer
+
+        data_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+
+        async def scenario(db):
+            server = QueryServer(db, batch_window=0.01)
+            await server.start('127.0.0.1', 0)
+            host, port = server.address()[:2]
+            clients = [await QueryClient().connect(host, port) for _ in range(3)]
+            keys = [1 + i % 10 for i in range(30)]
+            lookups = [clients[i % 3].lookup('PRODUCTO', key) for i, key in enumerate(keys)]
+            found = await asyncio.gather(*lookups)
+            # Una búsqueda mal formada en el mismo lote solo hace fallar su propia solicitud
+            mixed = [clients[0].lookup('PRODUCTO', 3), clients[1].request('lookup', table='PRODUCTO', value=[1]),
+                     clients[2].lookup('PRODUCTO', 4), clients[1].request('lookup', table='PRODUCTO', value=None),
+                     clients[1].request('lookup', table='PRODUCTO', value=True), clients[0].lookup('PRODUCTO', '5')]
+            mixed = await asyncio.gather(*mixed, return_exceptions=True)
+            by_cost = await clients[0].request('range', table='PRODUCTO', field='cost', low=2, high=5, limit=5)
+            inserted = await clients[1].request('insert', table='PRODUCTO',
+                                                record={'Index': 9001, 'Item': 'Servidor', 'Cost': '1.00',
+                                                        'Tax': '0.10', 'Total': '1.10'})
+            new = await clients[2].lookup('PRODUCTO', '9001')
+            try:
+                await clients[0].request('lookup', table='NO_EXISTE', value=1)
+                bad_table = False
+            except RuntimeError:
+                bad_table = True
+            status = (await clients[0].request('status'))['status']
+            for client in clients:
+                await client.close()
+            await server.stop()
+            return keys, found, mixed, by_cost['results'], inserted, new, bad_table, status
+
+        with tempfile.TemporaryDirectory() as tmp:
+            db = Database(DiskGeometry(platters=2, tracks=10, sectors=8, sector_size=64),
+                          os.path.join(tmp, "server.bin"))
+            db.load_schema(os.path.join(data_dir, 'struct_table.txt'))
+            db.load_csv('PRODUCTO', os.path.join(data_dir, 'a.csv'))
+            keys, found, mixed, by_cost, inserted, new, bad_table, status = asyncio.run(scenario(db))
+
+        server_stats = status['server']
+        valid_mixed = [mixed[0], mixed[2], mixed[5]]
+        if all(len(rows) == 1 and rows[0]['index'] == key for key, rows in zip(keys, found)) \
+                and all(len(rows) == 1 and rows[0]['index'] == key for key, rows in zip((3, 4, 5), valid_mixed)) \
+                and all(isinstance(mixed[i], RuntimeError) for i in (1, 3, 4)) \
+                and by_cost and all(2 <= row['cost'] <= 5 for row in by_cost) \
+                and [row['cost'] for row in by_cost] == sorted(row['cost'] for row in by_cost) \
+                and len(inserted['address']) == 2 and new and new[0]['item'] == 'Servidor' \
+                and bad_table and server_stats['batches'] < server_stats['batched_lookups']:
+            print(f"✓ Servidor funciona correctamente ({server_stats['batched_lookups']} búsquedas "
+                  f"en {server_stats['batches']} lotes)")
+            return True
+        print("✗ Error en el servidor de consultas")
+        return False
+    except Exception as e:
+        print(f"✗ Error en servidor de consultas: {e}")
+        return False
+
+def test_lookup_many():
+    print("\nProbando búsqueda de muchas claves con lecturas en orden físico")
+    try:
+        from engine.database import Database
+        from storage.disk import DiskGeometry
+        from benchmarks.data_generator import DataGenerator, load_schema
+
+        data_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+        schema_path = os.path.join(data_dir, 'struct_table.txt')
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_path = DataGenerator(load_schema(schema_path), seed=7).write_csv(os.path.join(tmp, 'rows.csv'), 2000)
+            db = Database(DiskGeometry(platters=4, tracks=64, sectors=32, sector_size=512),
+                          os.path.join(tmp, "many.bin"), record_cache_bytes=0)
+            db.load_schema(schema_path)
+            db.load_csv('PRODUCTO', csv_path)
+            keys = list(range(1, 2001)) + [99999]
+
+            db.reset_io_stats()
+            single = {key: [match['record'] for match in db.search('PRODUCTO', 'index', key)['results']]
+                      for key in keys}
+            single_reads = db.io_stats()['counters']['sectors_read']
+
+            db.reset_io_stats()
+            batched = db.lookup_many('PRODUCTO', 'index', keys)
+            batched_reads = db.io_stats()['counters']['sectors_read']
+            batched_ops = db.io_stats()['counters']['read_ops']
+
+            by_cost = db.lookup_many('PRODUCTO', 'tax', [single[1][0]['tax']])
+
+        print(f"Lecturas de sectores: {single_reads} una por una, {batched_reads} en lote ({batched_ops} operaciones)")
+        if batched == single and batched[99999] == [] and batched_reads * 4 < single_reads \
+                and batched_ops < len(keys) / 10 and single[1][0] in next(iter(by_cost.values())):
+            print("✓ Búsqueda de muchas claves funciona correctamente")
+            return True
+        print("✗ Error en la búsqueda de muchas claves")
+        return False
+    except Exception as e:
+        print(f"✗ Error en búsqueda de muchas claves: {e}")
+        return False
+
+def test_free_extents():
+    print("\nProbando asignación de rangos libres")
+    try:
+        from storage.disk import Disk, DiskGeometry
+        from storage.free_extents import FreeExtentMap
+
+        extents = FreeExtentMap(100, used=[10, 50])
+        first = extents.allocate(5, 'first')
+        best = extents.allocate(38)          # Solo el rango 11..49 alcanza
+        extents.release(first, 5)
+        extents.release(best, 38)
+        merged = extents.runs()
+        try:
+            extents.release(0, 1)
+            double_free = False
+        except ValueError:
+            double_free = True
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "extents.bin")
+            disk = Disk(DiskGeometry(platters=2, tracks=16, sectors=16, sector_size=64), path)
+            start = disk.allocate_sectors(40)
+            disk.sector_map[start + 45] = True
+            disk.release_sectors(start + 10, 10)
+            status = disk.get_disk_status()
+            reopened = Disk(disk.geometry, path).get_disk_status()
+
+        if (first, best) == (0, 11) and merged == [(0, 10), (11, 39), (51, 49)] and double_free \
+                and extents.run_count == len(merged) \
+                and extents.free_count == 98 and status['used_sectors'] == 31 \
+                and status['free_extents'] == 3 and status['largest_free_extent'] == 1024 - 46 \
+                and reopened == status:
+            print("✓ Rangos libres funcionan correctamente")
+            return True
+        print("✗ Error en los rangos libres")
+        return False
+    except Exception as e:
+        print(f"✗ Error en rangos libres: {e}")
+        return False
+
+def test_striped_volume():
+    print("\nProbando volumen en franjas sobre varios discos")
+    try:
+        from engine.database import Database
+        from storage.disk import DiskGeometry
+
+        data_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+        geometry = DiskGeometry(platters=1, tracks=4, sectors=8, sector_size=64)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "striped.bin")
+            db = Database(geometry, path, stripes=3, stripe_unit=2)
+            db.load_schema(os.path.join(data_dir, 'struct_table.txt'))
+            db.load_csv('PRODUCTO', os.path.join(data_dir, 'a.csv'))
+            rows = [record['index'] for _, record in db.scan('PRODUCTO')]
+            members = db.status()['members']
+
+            reopened = Database(geometry, path, stripes=3, stripe_unit=2)
+            found = reopened.search('PRODUCTO', 'item', 'deadpool dvd')['results']
+            location = reopened.physical_location('PRODUCTO', found[0]['address'])
+            try:
+                Database(geometry, path, stripes=2, stripe_unit=2)
+                layout_checked = False
+            except ValueError:
+                layout_checked = True
+
+        if rows == list(range(1, 11)) and len(members) == 3 and all(m['write_ops'] > 0 for m in members) \
+                and reopened.disk.total_sectors == 3 * 64 and len(found) == 1 and found[0]['record']['index'] == 4 \
+                and 'disk' in location and layout_checked:
+            print("✓ Volumen en franjas funciona correctamente")
+            return True
+        print("✗ Error en el volumen en franjas")
+        return False
+    except Exception as e:
+        print(f"✗ Error en volumen en franjas: {e}")
+        return False
+
+def test_mirrored_volume():
+    print("\nProbando volumen espejado con lectura de la réplica más cercana")
+    try:
+        import random
+        from engine.database import Database
+        from storage.disk import DiskGeometry
+
+        data_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+        geometry = DiskGeometry(platters=1, tracks=32, sectors=4, sector_size=64)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "mirror.bin")
+            db = Database(geometry, path, record_cache_bytes=0, mirrors=3)
+            db.load_schema(os.path.join(data_dir, 'struct_table.txt'))
+            db.load_csv('PRODUCTO', os.path.join(data_dir, 'a.csv'))
+            replicas_equal = len({member.read_sectors(0, member.total_sectors) for member in db.disk.members}) == 1
+
+            rng = random.Random(3)
+            for _ in range(500):
+                db.disk.read_sectors(rng.randrange(db.disk.total_sectors))
+            report = db.status()['mirror']
+
+            found = db.search('PRODUCTO', 'index', 7)['results']
+            try:
+                Database(geometry, path, stripes=2, mirrors=2)
+                combined = True
+            except ValueError:
+                combined = False
+
+        print(f"Distancia de búsqueda: {report['read_seek_distance']} balanceada, "
+              f"{report['single_disk_read_seek_distance']} con un disco")
+        if replicas_equal and db.disk.total_sectors == 256 and all(report['reads_per_replica']) \
+                and report['seek_saved'] > 0 and report['read_seek_distance'] < report['single_disk_read_seek_distance'] \
+                and found and found[0]['record']['index'] == 7 and not combined:
+            print("✓ Volumen espejado funciona correctamente")
+            return True
+        print("✗ Error en el volumen espejado")
+        return False
+    except Exception as e:
+        print(f"✗ Error en volumen espejado: {e}")
+        return False
+
+def test_lba_mapping():
+    print("\nProbando orden de sectores por cilindro")
+    try:
+        from storage.disk import Disk, DiskGeometry, CYLINDER_MAJOR
+
+        with tempfile.TemporaryDirectory() as tmp:
+            platter = Disk(DiskGeometry(platters=2, tracks=8, sectors=4, sector_size=64),
+                           os.path.join(tmp, "platter.bin"))
+            cylinder = Disk(DiskGeometry(platters=2, tracks=8, sectors=4, sector_size=64, lba_mapping=CYLINDER_MAJOR),
+                            os.path.join(tmp, "cylinder.bin"))
+            locations = [cylinder._get_physical_location(s) for s in (0, 4, 15, 16)]
+            covered = {tuple(cylinder._get_physical_location(s).values()) for s in range(cylinder.total_sectors)}
+            for disk in (platter, cylinder):
+                disk.stats.reset()
+                for sector in range(disk.total_sectors):
+                    disk.read_sectors(sector)
+
+        expected = [
+            {'platter': 0, 'surface': 0, 'track': 0, 'sector': 0},
+            {'platter': 0, 'surface': 1, 'track': 0, 'sector': 0},
+            {'platter': 1, 'surface': 1, 'track': 0, 'sector': 3},
+            {'platter': 0, 'surface': 0, 'track': 1, 'sector': 0}
+        ]
+        platter_moves = platter.stats.counters['head_moves']
+        cylinder_moves = cylinder.stats.counters['head_moves']
+        print(f"Movimientos de cabezal en lectura secuencial: {platter_moves} por plato, {cylinder_moves} por cilindro")
+        if locations == expected and len(covered) == cylinder.total_sectors \
+                and cylinder_moves == 7 and platter_moves > cylinder_moves:
+            print("✓ Orden por cilindro funciona correctamente")
+            return True
+        print("✗ Error en el orden por cilindro")
+        return False
+    except Exception as e:
+        print(f"✗ Error en orden por cilindro: {e}")
+        return False
+
+def test_clustered_table():
+    print("\nProbando tablas agrupadas por clave primaria")
+    try:
+        import random
+        from engine.database import Database
+        from storage.disk import DiskGeometry
+        from benchmarks.data_generator import DataGenerator, load_schema
+        from data_management.data_validator import DataValidator
+
+        data_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+        schema = load_schema(os.path.join(data_dir, 'struct_table.txt'))
+        rows = DataValidator().validate_data(list(DataGenerator(schema, seed=3).rows(1500)), schema)
+        random.Random(3).shuffle(rows)
+        geometry = DiskGeometry(platters=4, tracks=64, sectors=32, sector_size=512)
+        reads = {}
+        with tempfile.TemporaryDirectory() as tmp:
+            with open(os.path.join(data_dir, 'struct_table.txt'), 'r', encoding='utf-8') as f:
+                sql = f.read().strip().rstrip(';')
+            for organization in ('HEAP', 'CLUSTERED'):
+                schema_path = os.path.join(tmp, f"{organization}.txt")
+                with open(schema_path, 'w', encoding='utf-8') as f:
+                    f.write(f"{sql} ORGANIZATION={organization};")
+                filename = os.path.join(tmp, f"{organization}.bin")
+                db = Database(geometry, filename, record_cache_bytes=0)
+                db.load_schema(schema_path)
+                # Carga desordenada de a una: obliga a dividir páginas y mover registros
+                for record in rows:
+                    db.insert('PRODUCTO', record)
+                db.save()
+                db = Database(geometry, filename, record_cache_bytes=0)
+                result = db.query("SELECT * FROM PRODUCTO WHERE index BETWEEN 500 AND 699")
+                reads[organization] = result.sectors_read
+                if organization == 'CLUSTERED':
+                    clustered_rows = sorted(result.rows, key=lambda r: r['index'])
+                    scanned = [record['index'] for _, record in db.scan('PRODUCTO')]
+                    found = all(db.search('PRODUCTO', 'index', r['index'])['results'][0]['record'] == r
+                                and r in [m['record'] for m in db.search('PRODUCTO', 'item', r['item'])['results']]
+                                for r in rows[::25])
+                    stats = db.status()['tables'][0]['clustering']
+                else:
+                    heap_rows = sorted(result.rows, key=lambda r: r['index'])
+
+        print(f"Sectores leídos por el rango: {reads['HEAP']} común, {reads['CLUSTERED']} agrupada "
+              f"({stats['pages']} páginas, {stats['splits']} divisiones)")
+        if clustered_rows == heap_rows and len(heap_rows) == 200 and scanned == sorted(scanned) \
+                and len(scanned) == 1500 and found and stats['splits'] > 0 \
+                and reads['CLUSTERED'] * 3 < reads['HEAP']:
+            print("✓ Tablas agrupadas funcionan correctamente")
+            return True
+        print("✗ Error en las tablas agrupadas")
+        return False
+    except Exception as e:
+        print(f"✗ Error en tablas agrupadas: {e}")
+        return False
+
+def test_snapshot_reads():
+    print("\nProbando lecturas instantáneas durante una carga")
+    try:
+        import threading
+        import time
+        from engine.database import Database
+        from storage.disk import DiskGeometry
+        from benchmarks.data_generator import DataGenerator, load_schema
+
+        data_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+        schema_path = os.path.join(data_dir, 'struct_table.txt')
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_path = DataGenerator(load_schema(schema_path), seed=5).write_csv(os.path.join(tmp, 'rows.csv'), 3000)
+            db = Database(DiskGeometry(platters=4, tracks=64, sectors=32, sector_size=512),
+                          os.path.join(tmp, "snapshot.bin"))
+            db.load_schema(schema_path)
+            loader = threading.Thread(target=db.load_csv, args=('PRODUCTO', csv_path))
+            loader.start()
+            counts = []
+            consistent = True
+            while loader.is_alive():
+                with db.snapshot() as view:
+                    before = view.status()
+                    scanned = [record for _, record in view.scan('PRODUCTO')]
+                    queried = view.query("SELECT * FROM PRODUCTO WHERE index >= 1").rows
+                    by_item = all(record in [m['record'] for m in view.search('PRODUCTO', 'item', record['item'])['results']]
+                                  for record in scanned[::100])
+                    time.sleep(0.01)
+                    after = view.status()
+                    consistent &= before == after and by_item and len(scanned) == len(queried) \
+                        == before['tables'][0]['rows']
+                    counts.append(len(scanned))
+            loader.join()
+            versions = db.versions.stats()
+
+        print(f"Vistas abiertas durante la carga: {len(counts)}, filas vistas: {counts[:3]} ... {counts[-1]}")
+        if consistent and any(0 < n < 3000 for n in counts) and versions['committed'] == 3000 \
+                and versions['stamps'] == 0 and versions['open_views'] == 0:
+            print("✓ Lecturas instantáneas funcionan correctamente")
+            return True
+        print("✗ Error en las lecturas instantáneas")
+        return False
+    except Exception as e:
+        print(f"✗ Error en lecturas instantáneas: {e}")
+        return False
+
+def test_deferred_indexes():
+    print("\nProbando construcción diferida de índices secundarios")
+    try:
+        from engine.database import Database
+        from storage.disk import DiskGeometry
+        from benchmarks.data_generator import DataGenerator, load_schema
+
+        data_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+        schema_path = os.path.join(data_dir, 'struct_table.txt')
+        indexes = {}
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_path = DataGenerator(load_schema(schema_path), seed=11).write_csv(os.path.join(tmp, 'rows.csv'), 800)
+            for mode, workers in (('inline', None), ('deferred', 2)):
+                db = Database(DiskGeometry(platters=4, tracks=64, sectors=32, sector_size=512),
+                              os.path.join(tmp, f"{mode}.bin"))
+                db.load_schema(schema_path)
+                # La segunda carga reconstruye los índices junto con las entradas de la primera
+                for _ in range(2):
+                    db.load_csv('PRODUCTO', csv_path, defer_indexes=mode == 'deferred', index_workers=workers)
+                entry = db.get_table('PRODUCTO')
+                indexes[mode] = {name: [(node.value, node.addresses) for node in avl.get_all_nodes()]
+                                 for name, avl in entry.secondary_indexes.items()}
+                balanced = all(abs(avl.balance_factor(node)) <= 1 for avl in entry.secondary_indexes.values()
+                               for node in avl.get_all_nodes())
+                item = db.search('PRODUCTO', 'item', indexes[mode]['item'][0][0])
+            db.save()
+            reopened = Database(DiskGeometry(platters=4, tracks=64, sectors=32, sector_size=512),
+                                os.path.join(tmp, "deferred.bin"))
+            reloaded = reopened.search('PRODUCTO', 'item', indexes['deferred']['item'][0][0])
+
+        print(f"Índices comparados: {len(indexes['deferred'])}, claves de item: {len(indexes['deferred']['item'])}")
+        if indexes['inline'] == indexes['deferred'] and balanced and item['method'] == 'index' \
+                and reloaded['results'] == item['results'] and len(item['results']) >= 2:
+            print("✓ Índices diferidos funcionan correctamente")
+            return True
+        print("✗ Error en los índices diferidos")
+        return False
+    except Exception as e:
+        print(f"✗ Error en índices diferidos: {e}")
+        return False
+
+def test_read_ahead():
+    print("\nProbando lectura anticipada de sectores")
+    try:
+        from engine.database import Database
+        from storage.disk import DiskGeometry
+        from benchmarks.data_generator import DataGenerator, load_schema
+
+        data_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+        schema_path = os.path.join(data_dir, 'struct_table.txt')
+        results = {}
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_path = DataGenerator(load_schema(schema_path), seed=12).write_csv(os.path.join(tmp, 'rows.csv'), 400)
+            for window in (0, 4):
+                # Sectores de 128 bytes: los registros se parten en cadenas de fragmentos
+                db = Database(DiskGeometry(platters=2, tracks=32, sectors=32, sector_size=128),
+                              os.path.join(tmp, f"window_{window}.bin"), record_cache_bytes=0, read_ahead=window)
+                db.load_schema(schema_path)
+                db.load_csv('PRODUCTO', csv_path)
+                db.reset_io_stats()
+                rows = [db.search('PRODUCTO', 'index', key)['results'] for key in range(1, 401)]
+                scanned = [record for _, record in db.scan('PRODUCTO')]
+                counters = db.io_stats()['counters']
+                # Una inserción tiene que invalidar los sectores anticipados que toca
+                last = dict(rows[-1][0]['record'])
+                last['index'] = 401
+                db.insert('PRODUCTO', last)
+                inserted = db.search('PRODUCTO', 'index', 401)['results']
+                results[window] = (rows, scanned, counters, inserted)
+
+        plain, ahead = results[0], results[4]
+        print(f"Lecturas sin anticipar: {plain[2]['read_ops']}, con ventana 4: {ahead[2]['read_ops']} "
+              f"({ahead[2]['readahead_hits']} aciertos)")
+        if plain[0] == ahead[0] and plain[1] == ahead[1] and ahead[3] == plain[3] and len(ahead[3]) == 1 \
+                and ahead[2]['read_ops'] * 4 < plain[2]['read_ops'] and ahead[2]['readahead_hits'] > 0:
+            print("✓ Lectura anticipada funciona correctamente")
+            return True
+        print("✗ Error en la lectura anticipada")
+        return False
+    except Exception as e:
+        print(f"✗ Error en lectura anticipada: {e}")
+        return False
+
+def test_format_migration():
+    print("\nProbando migración al formato de direcciones de 32 bits")
+    try:
+        from engine.database import Database
+        from engine.migration import migrate_database
+        from storage.disk import Disk, DiskGeometry
+        from storage.sector_manager import ExtentSectorManager
+        from benchmarks.data_generator import DataGenerator, load_schema
+
+        data_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+        schema_path = os.path.join(data_dir, 'struct_table.txt')
+        small = DiskGeometry(platters=2, tracks=32, sectors=32, sector_size=128)
+        large = DiskGeometry(platters=1, tracks=1100, sectors=32, sector_size=128)  # 70.400 sectores
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_path = DataGenerator(load_schema(schema_path), seed=13).write_csv(os.path.join(tmp, 'rows.csv'), 300)
+            old = Database(small, os.path.join(tmp, "v1.bin"), format_version=1)
+            old.load_schema(schema_path)
+            old.load_csv('PRODUCTO', csv_path)
+            sql = "SELECT * FROM PRODUCTO WHERE index BETWEEN 20 AND 60"
+            before = old.query(sql).rows
+            report = migrate_database(old, os.path.join(tmp, "v2.bin"), large)
+
+            reopened = Database(large, os.path.join(tmp, "v2.bin"))
+            after = reopened.query(sql).rows
+            item = reopened.search('PRODUCTO', 'item', before[0]['item'])
+
+            # Una cadena de fragmentos más allá del sector 65.535 y el límite del formato 1
+            disk = Disk(large, os.path.join(tmp, "raw.bin"))
+            manager = ExtentSectorManager(disk, [(70000, 16)], lambda: None)
+            record = bytes(range(256)) * 2
+            high = manager.read_record(*manager.write_record(record)) == record
+            try:
+                Disk(large, os.path.join(tmp, "raw_v1.bin"), format_version=1)
+                limited = False
+            except ValueError:
+                limited = True
+
+        print(f"Formato {report['source_format']} -> {report['target_format']}, filas: {report['tables']}, "
+              f"sectores {report['used_sectors_before']} -> {report['used_sectors_after']}")
+        if before == after and len(before) == 41 and reopened.disk.record_format.version == 2 \
+                and report['tables'] == {'PRODUCTO': 300} and item['method'] == 'index' and item['results'] \
+                and high and limited:
+            print("✓ Migración de formato funciona correctamente")
+            return True
+        print("✗ Error en la migración de formato")
+        return False
+    except Exception as e:
+        print(f"✗ Error en migración de formato: {e}")
+        return False
+
+def test_superblock():
+    print("\nProbando reapertura con superbloque")
+    try:
+        from engine.database import Database
+        from storage.disk import Disk, DiskGeometry
+        from storage.superblock import read_superblock
+        from benchmarks.data_generator import DataGenerator, load_schema
+
+        data_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+        schema_path = os.path.join(data_dir, 'struct_table.txt')
+        geometry = DiskGeometry(platters=2, tracks=16, sectors=32, sector_size=256, lba_mapping='cylinder')
+        sql = "SELECT item, cost FROM PRODUCTO WHERE index BETWEEN 10 AND 30"
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "disk.bin")
+            csv_path = DataGenerator(load_schema(schema_path), seed=14).write_csv(os.path.join(tmp, 'rows.csv'), 200)
+            db = Database(geometry, path)
+            db.load_schema(schema_path)
+            db.load_csv('PRODUCTO', csv_path)
+            before = db.query(sql).rows
+            used = db.status()['used_sectors']
+
+            superblock = read_superblock(path)
+            reopened = Database.open(path)
+            opened_reads = reopened.io_stats()['counters']['read_ops']
+            after = reopened.query(sql).rows
+            try:
+                Disk(DiskGeometry(platters=2, tracks=16, sectors=32, sector_size=512), path)
+                checked = False
+            except ValueError:
+                checked = True
+            with open(os.path.join(tmp, "plain.bin"), 'wb') as f:
+                f.write(b'\x00' * 1024)
+            try:
+                Disk.open(os.path.join(tmp, "plain.bin"))
+                missing = False
+            except ValueError:
+                missing = True
+
+        print(f"Superbloque: {superblock}")
+        print(f"Lecturas al reabrir: {opened_reads}, filas antes/después: {len(before)}/{len(after)}")
+        if reopened.disk.geometry == geometry and superblock.format_version == 2 and opened_reads == 0 \
+                and before == after and len(after) == 21 and reopened.status()['used_sectors'] == used \
+                and checked and missing:
+            print("✓ Superbloque funciona correctamente")
+            return True
+        print("✗ Error en el superbloque")
+        return False
+    except Exception as e:
+        print(f"✗ Error en superbloque: {e}")
+        return False
+
+def test_export():
+    print("\nProbando exportación masiva a CSV y a formato columnar")
+    try:
+        from engine.database import Database
+        from engine.export import export_table
+        from storage import record_arrays
+        from storage.columnar_file import ColumnarReader
+        from storage.disk import DiskGeometry
+        from storage.table_scan import Predicate
+        from benchmarks.data_generator import DataGenerator, load_schema
+
+        data_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+        schema_path = os.path.join(data_dir, 'struct_table.txt')
+        predicates = [Predicate('index', 'BETWEEN', 50, 249), Predicate('item', '>=', 'd', ignore_case=True)]
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_path = DataGenerator(load_schema(schema_path), seed=15).write_csv(os.path.join(tmp, 'rows.csv'), 300)
+            db = Database(DiskGeometry(platters=2, tracks=32, sectors=32, sector_size=128), os.path.join(tmp, "disk.bin"))
+            db.load_schema(schema_path)
+            db.load_csv('PRODUCTO', csv_path)
+            with open(schema_path, 'r', encoding='utf-8') as f:
+                sql = f.read().replace('PRODUCTO', 'VARIABLE_PRODUCTO').replace(';', ' ROW_FORMAT=VARIABLE;')
+            db.create_tables(sql)
+            db.load_records('VARIABLE_PRODUCTO', (record for _, record in db.scan('PRODUCTO')))
+            expected = [record for _, record in db.scan('PRODUCTO', predicates)]
+
+            exported = {}
+            for table in ('PRODUCTO', 'VARIABLE_PRODUCTO'):
+                path = os.path.join(tmp, f"{table}.col")
+                info = export_table(db, table, path, 'columnar', predicates, block_rows=32)
+                with ColumnarReader(path) as reader:
+                    first = reader.blocks[0]['columns'][0]
+                    pruned = reader.blocks_overlapping('index', 100, 110)
+                    exported[table] = (info, list(reader.iter_rows()), first, pruned, len(reader.blocks))
+
+            # El CSV completo vuelve a cargarse en otro disco con los mismos registros
+            info_csv = export_table(db, 'PRODUCTO', os.path.join(tmp, "all.csv"))
+            copy = Database(DiskGeometry(platters=2, tracks=32, sectors=32, sector_size=128), os.path.join(tmp, "copy.bin"))
+            copy.load_schema(schema_path)
+            copy.load_csv('PRODUCTO', os.path.join(tmp, "all.csv"))
+            same = [r for _, r in copy.scan('PRODUCTO')] == [r for _, r in db.scan('PRODUCTO')]
+
+        fixed, variable = exported['PRODUCTO'], exported['VARIABLE_PRODUCTO']
+        # Sin NumPy la tabla de formato fijo también se exporta registro por registro
+        fixed_method = 'records' if record_arrays.np is None else 'arrays'
+        print(f"Filas exportadas: {fixed[0]['rows_written']} ({fixed[0]['method']}) / "
+              f"{variable[0]['rows_written']} ({variable[0]['method']}), bloques con index 100-110: {fixed[3]}")
+        if fixed[1] == expected and variable[1] == expected and len(expected) > 0 \
+                and fixed[0]['method'] == fixed_method and variable[0]['method'] == 'records' \
+                and fixed[2]['min'] == expected[0]['index'] and fixed[2]['nulls'] == 0 \
+                and 0 < len(variable[3]) < variable[4] \
+                and info_csv['rows_written'] == 300 and same:
+            print("✓ Exportación funciona correctamente")
+            return True
+        print("✗ Error en la exportación")
+        return False
+    except Exception as e:
+        print(f"✗ Error en exportación: {e}")
+        return False
+
 def main():
     print("=== PRUEBAS DEL SIMULADOR DE DISCO ===\n")
     
@@ -147,7 +1236,31 @@ def main():
         test_disk,
         test_avl,
         test_serialization,
-        test_fragmented_write_read
+        test_fragmented_write_read,
+        test_record_arrays,
+        test_table_scan,
+        test_catalog,
+        test_variable_format,
+        test_compressed_table,
+        test_database_engine,
+        test_sql_query,
+        test_column_statistics,
+        test_io_stats,
+        test_tracing_profiling,
+        test_record_cache,
+        test_query_server,
+        test_lookup_many,
+        test_free_extents,
+        test_striped_volume,
+        test_mirrored_volume,
+        test_lba_mapping,
+        test_clustered_table,
+        test_snapshot_reads,
+        test_deferred_indexes,
+        test_read_ahead,
+        test_format_migration,
+        test_superblock,
+        test_export
     ]
     
     passed = 0